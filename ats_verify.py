@@ -0,0 +1,287 @@
+"""
+ats_verify.py
+
+Check that an ATS PDF's text layer actually carries the resume: every
+heading, contact detail, bullet and skill, in the order the ATS template
+prints them.
+
+Text is extracted from the PDF (pypdf) and both sides are reduced to
+lower-case word tokens, so line wrapping, ligatures, CSS upper-casing and
+punctuation don't count as differences. Each source field is then located in
+the extracted tokens through a token index (anchored on its rarest word, so
+lookups stay cheap), and the longest run of fields appearing in template
+order (a longest increasing subsequence, O(n log n)) is taken as the
+alignment:
+    in order   part of that run
+    reordered  found, but out of order
+    garbled    not found verbatim, but most of its word pairs are there
+    missing    not there
+The parse score is the weighted share of fields found (in order 1, reordered
+0.5, garbled 0.25, missing 0), out of 100.
+
+A batch of PDFs is verified in a process pool, so checking a bulk build adds
+little to it.
+
+Usage:
+    pip install pypdf
+
+    python ats_verify.py                                   # resume_ats.pdf vs resume.yaml
+    python ats_verify.py build/jane/resume_ats.pdf --data people/jane.yaml
+    python ats_verify.py --batch people/ --out build/ --min-score 95
+    python generate_resume.py --verify-ats                 # verify after building
+"""
+
+import argparse
+import json
+import re
+import sys
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from profiling import span
+from resume_loader import find_resume_file, load_resume_file
+import profiling
+
+try:
+    from pypdf import PdfReader
+except ImportError:
+    PdfReader = None
+
+
+ATS_PDF = "resume_ats.pdf"
+
+WEIGHTS = {"in_order": 1.0, "reordered": 0.5, "garbled": 0.25, "missing": 0.0}
+
+# A field with at least this share of its word pairs present counts as garbled, not missing
+GARBLED_MIN = 0.5
+
+DEFAULT_MIN_SCORE = 95.0
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def tokens(text: str) -> list[str]:
+    """Normalise text to lower-case word tokens (ligatures and full-width forms folded)."""
+    return TOKEN_RE.findall(unicodedata.normalize("NFKC", str(text)).casefold())
+
+
+def expected_fields(data: dict) -> list[tuple[str, str]]:
+    """Return (field path, text) for everything the ATS template prints, in its order."""
+    fields = [("name", data.get("name"))]
+    fields.append(("tagline", data.get("tagline")))
+    contact = data.get("contact") or {}
+    for key in ("address", "phone", "email", "linkedin", "github", "website"):
+        fields.append((f"contact.{key}", contact.get(key)))
+
+    def section(heading: str, key: str):
+        if data.get(key):
+            fields.append((f"heading.{key}", heading))
+        return data.get(key) or []
+
+    if section("Professional Summary", "summary"):
+        fields.append(("summary", data["summary"]))
+    for i, skill in enumerate(section("Core Competencies", "soft_skills")):
+        fields.append((f"soft_skills[{i}]", skill))
+    for i, job in enumerate(section("Professional Experience", "experience")):
+        fields.append((f"experience[{i}].role", job.get("role")))
+        fields.append((f"experience[{i}].company", job.get("company")))
+        fields.append((f"experience[{i}].dates", f"{job.get('start')} {job.get('end')}"))
+        fields.append((f"experience[{i}].location", job.get("location")))
+        for j, bullet in enumerate(job.get("bullets") or []):
+            fields.append((f"experience[{i}].bullets[{j}]", bullet))
+    for i, talk in enumerate(section("Speaking Engagements", "speaking_engagements")):
+        fields.append((f"speaking_engagements[{i}].title", talk.get("title")))
+        fields.append((f"speaking_engagements[{i}].event", talk.get("event")))
+    for i, pub in enumerate(section("Publications", "publications")):
+        fields.append((f"publications[{i}].title", pub.get("title")))
+        fields.append((f"publications[{i}].publication", pub.get("publication")))
+        fields.append((f"publications[{i}].description", pub.get("description")))
+    for i, skill in enumerate(section("Technical Skills", "technical_skills")):
+        fields.append((f"technical_skills[{i}]", skill))
+    for i, edu in enumerate(section("Education", "education")):
+        fields.append((f"education[{i}].degree", edu.get("degree")))
+        fields.append((f"education[{i}].school", edu.get("school")))
+        fields.append((f"education[{i}].notes", edu.get("notes")))
+    return [(path, str(text)) for path, text in fields if text]
+
+
+def increasing_subsequence(values: list[int]) -> set[int]:
+    """Return the indexes of one longest strictly increasing subsequence of `values`."""
+    tails, tail_indexes, previous = [], [], [None] * len(values)
+    for index, value in enumerate(values):
+        k = bisect_left(tails, value)
+        if k == len(tails):
+            tails.append(value)
+            tail_indexes.append(index)
+        else:
+            tails[k] = value
+            tail_indexes[k] = index
+        previous[index] = tail_indexes[k - 1] if k else None
+
+    keep = set()
+    index = tail_indexes[-1] if tail_indexes else None
+    while index is not None:
+        keep.add(index)
+        index = previous[index]
+    return keep
+
+
+def align(fields: list[tuple[str, str]], text: str) -> list[dict]:
+    """Locate each field's tokens in `text`; return one result per field, in template order."""
+    extracted = tokens(text)
+    positions = defaultdict(list)
+    for index, token in enumerate(extracted):
+        positions[token].append(index)
+    seen = set(zip(extracted, extracted[1:])) | {(token,) for token in positions}
+
+    def matches(start: int, words: list[str]) -> bool:
+        return start >= 0 and extracted[start:start + len(words)] == words
+
+    results, found = [], []
+    cursor = 0
+    for path, value in fields:
+        words = tokens(value)
+        if not words:
+            continue
+        # Anchor on the rarest word, so common words don't multiply the candidates
+        offset = min(range(len(words)), key=lambda k: len(positions.get(words[k], ())))
+        anchors = positions.get(words[offset], [])
+        first = bisect_left(anchors, cursor + offset)
+        # Prefer the first match after the previous field, else any match
+        start = next((p - offset for p in islice(anchors, first, None) if matches(p - offset, words)), None)
+        if start is None:
+            start = next((p - offset for p in islice(anchors, first) if matches(p - offset, words)), None)
+        if start is not None:
+            cursor = start + len(words)
+            found.append((len(results), start))
+            status = "reordered"
+        else:
+            # Word pairs rather than words, so a missing paragraph of common words isn't "garbled"
+            pairs = list(zip(words, words[1:])) or [(words[0],)]
+            present = sum(1 for pair in pairs if pair in seen) / len(pairs)
+            status = "garbled" if present >= GARBLED_MIN else "missing"
+        results.append({"field": path, "text": value, "status": status})
+
+    for k in increasing_subsequence([start for _, start in found]):
+        results[found[k][0]]["status"] = "in_order"
+    return results
+
+
+def parse_score(results: list[dict]) -> float:
+    """Weighted share of fields found, 0-100."""
+    if not results:
+        return 100.0
+    return round(100 * sum(WEIGHTS[result["status"]] for result in results) / len(results), 1)
+
+
+def extract_text(pdf_path: str | Path) -> str:
+    """Return the text layer of every page of a PDF."""
+    if PdfReader is None:
+        raise RuntimeError("ATS verification needs pypdf (pip install pypdf)")
+    with span("extract_text", pdf=str(pdf_path)):
+        reader = PdfReader(pdf_path)
+        return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
+def verify_pdf(pdf_path: str | Path, data_path: str | Path) -> dict:
+    """Verify one PDF against its resume data file; return a report (with "error" on failure)."""
+    report = {"pdf": str(pdf_path), "data": str(data_path)}
+    try:
+        data = load_resume_file(data_path)
+        text = extract_text(pdf_path)
+        with span("align", pdf=str(pdf_path)):
+            results = align(expected_fields(data), text)
+    except Exception as e:
+        report["error"] = f"{type(e).__name__}: {e}"
+        return report
+    report["score"] = parse_score(results)
+    report["counts"] = {status: 0 for status in WEIGHTS}
+    for result in results:
+        report["counts"][result["status"]] += 1
+    report["problems"] = [result for result in results if result["status"] != "in_order"]
+    return report
+
+
+def verify_many(pairs: list[tuple[str, str]], workers: int | None = None) -> list[dict]:
+    """Verify (pdf, data) pairs with a process pool; return reports in input order."""
+    if len(pairs) <= 1 or profiling.enabled():
+        # Not worth a pool for one PDF; spans in workers would be lost
+        return [verify_pdf(*pair) for pair in pairs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(verify_pdf, *zip(*pairs)))
+
+
+def batch_pairs(source_dir: str | Path, out_dir: str | Path = "build") -> list[tuple[str, str]]:
+    """Pair each resume in `source_dir` with the ATS PDF batch mode rendered for it."""
+    from batch_render import iter_resume_files
+    return [(str(Path(out_dir) / source.stem / ATS_PDF), str(source)) for source in iter_resume_files(source_dir)]
+
+
+def passed(report: dict, min_score: float = DEFAULT_MIN_SCORE) -> bool:
+    """Whether a report has no error and scores at least `min_score`."""
+    return "error" not in report and report["score"] >= min_score
+
+
+def print_report(report: dict, min_score: float = DEFAULT_MIN_SCORE, verbose: bool = True):
+    """Print one PDF's result (and its problem fields when verbose)."""
+    if "error" in report:
+        print(f"✗ {report['pdf']}: {report['error']}")
+        return
+    counts = report["counts"]
+    print(
+        f"{'✓' if passed(report, min_score) else '✗'} {report['pdf']}: parse score {report['score']:.1f} "
+        f"({sum(counts.values())} fields: {counts['in_order']} in order, {counts['reordered']} reordered, "
+        f"{counts['garbled']} garbled, {counts['missing']} missing)"
+    )
+    if verbose:
+        for problem in report["problems"]:
+            text = problem["text"] if len(problem["text"]) <= 60 else problem["text"][:57] + "..."
+            print(f"    {problem['status']:<10} {problem['field']}: {text!r}")
+
+
+def verify(
+    pairs: list[tuple[str, str]],
+    min_score: float = DEFAULT_MIN_SCORE,
+    workers: int | None = None,
+    verbose: bool = True
+) -> list[dict]:
+    """Verify every (pdf, data) pair and print the results; return the reports."""
+    reports = verify_many(pairs, workers)
+    for report in reports:
+        print_report(report, min_score, verbose)
+    if len(reports) > 1:
+        failed = sum(not passed(report, min_score) for report in reports)
+        print(f"\n{'✓' if not failed else '✗'} {len(reports) - failed}/{len(reports)} PDFs passed (min score {min_score:g})")
+    return reports
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify the text layer of ATS PDFs against their resume data")
+    parser.add_argument("pdfs", nargs="*", help=f"PDFs to check (default: {ATS_PDF})")
+    parser.add_argument("--data", help="resume data the PDFs were built from (default: resume.yaml/resume.json)")
+    parser.add_argument("--batch", metavar="DIR", help="check the batch build of every resume in DIR")
+    parser.add_argument("--out", metavar="DIR", default="build", help="batch output directory (default: build)")
+    parser.add_argument("--min-score", type=float, default=DEFAULT_MIN_SCORE, help="fail below this score (default: 95)")
+    parser.add_argument("--workers", type=int, help="parallel processes (default: one per CPU)")
+    parser.add_argument("--json", metavar="FILE", help="also write the reports as JSON")
+    parser.add_argument("--quiet", action="store_true", help="don't list each problem field")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.configure(args)
+
+    if PdfReader is None:
+        print("✗ pypdf is not installed (pip install pypdf)")
+        sys.exit(1)
+    if args.batch:
+        pairs = batch_pairs(args.batch, args.out)
+    else:
+        data_path = args.data or find_resume_file()
+        pairs = [(pdf, str(data_path)) for pdf in args.pdfs or [ATS_PDF]]
+
+    reports = verify(pairs, args.min_score, args.workers, verbose=not args.quiet)
+    if args.json:
+        Path(args.json).write_text(json.dumps(reports, indent=2, ensure_ascii=False), encoding="utf-8")
+    sys.exit(0 if all(passed(report, args.min_score) for report in reports) else 1)
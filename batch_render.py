@@ -0,0 +1,165 @@
+"""
+batch_render.py
+
+Render many resumes (people or tailored variants) in one process.
+
+Every .yaml/.yml/.json file in a source directory is rendered against every
+template in generate_resume.VARIANTS. Files are streamed through a fixed number
+of async workers that share one Chromium instance and its pool of warm pages, so a
+large batch costs one browser launch rather than one process per resume.
+
+Usage:
+    python generate_resume.py --batch people/ --out build/ --workers 4
+
+    # or from Python
+    from batch_render import render_batch
+    render_batch("people/", "build/", workers=4)
+
+Outputs for people/jane.yaml land in build/jane/ (HTML, PDF and a copy of each
+stylesheet, so the folder is self-contained). A per-item status/timing report
+is written to build/report.json. Unchanged items are skipped on re-runs via the
+build cache in build/.resume-cache/, and resumes whose data matches one
+rendered before (in this batch or an earlier run) reuse its HTML and PDF from
+the render cache.
+"""
+
+import asyncio
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import Iterator
+from build_cache import BuildCache
+from generate_resume import VARIANTS, build_variant_async
+from pdf_renderer import AsyncPDFRenderer
+from render_cache import get_render_cache
+from resume_loader import load_resume_file
+from resume_schema import check_resume
+
+
+DATA_SUFFIXES = (".yaml", ".yml", ".json")
+
+
+def iter_resume_files(source_dir: str | Path) -> Iterator[Path]:
+    """Yield resume data files in a directory, in name order."""
+    for path in sorted(Path(source_dir).iterdir()):
+        if path.is_file() and path.suffix in DATA_SUFFIXES:
+            yield path
+
+
+def item_variants(item_dir: Path, variants: list[dict] = VARIANTS) -> list[dict]:
+    """Return copies of `variants` whose HTML/PDF outputs live in `item_dir`."""
+    return [
+        {
+            **variant,
+            "html": str(item_dir / Path(variant["html"]).name),
+            "pdf": str(item_dir / Path(variant["pdf"]).name),
+        }
+        for variant in variants
+    ]
+
+
+async def render_item(
+    source: Path,
+    out_dir: Path,
+    renderer: AsyncPDFRenderer,
+    cache: BuildCache,
+    variants: list[dict] = VARIANTS
+) -> dict:
+    """Render one resume file against every variant; return its report entry."""
+    started = time.perf_counter()
+    item_dir = out_dir / source.stem
+    entry = {"source": str(source), "output": str(item_dir)}
+
+    try:
+        data = await asyncio.to_thread(load_resume_file, source, True)
+        # Malformed data fails here, before any template or browser work
+        check_resume(data, source)
+        item_dir.mkdir(parents=True, exist_ok=True)
+        for variant in variants:
+            # The HTML links its stylesheet relatively, so keep a copy beside it
+            if not variant.get("inline_css"):
+                shutil.copyfile(variant["css"], item_dir / Path(variant["css"]).name)
+
+        timings = await asyncio.gather(
+            *(build_variant_async(data, variant, renderer, cache)
+              for variant in item_variants(item_dir, variants))
+        )
+        entry["status"] = "ok"
+        entry["variants"] = {
+            variant["name"]: round(elapsed, 3) for variant, elapsed in zip(variants, timings)
+        }
+    except Exception as e:
+        entry["status"] = "error"
+        entry["error"] = f"{type(e).__name__}: {e}"
+
+    entry["seconds"] = round(time.perf_counter() - started, 3)
+    return entry
+
+
+def render_batch(
+    source_dir: str | Path,
+    out_dir: str | Path = "build",
+    workers: int = 4,
+    force: bool = False,
+    variants: list[dict] = VARIANTS
+) -> int:
+    """Render every resume in `source_dir` into `out_dir`; return a process exit code."""
+    return asyncio.run(_render_batch(Path(source_dir), Path(out_dir), workers, force, variants))
+
+
+async def _render_batch(
+    source_dir: Path,
+    out_dir: Path,
+    workers: int,
+    force: bool,
+    variants: list[dict]
+) -> int:
+    """Async body of render_batch()."""
+    started = time.perf_counter()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    cache = BuildCache(out_dir / ".resume-cache" / "manifest.json", enabled=not force)
+    render_cache = get_render_cache()
+    render_cache.enabled = render_cache.enabled and not force
+    sources = iter_resume_files(source_dir)
+    report = []
+
+    async def worker():
+        # Workers pull from one shared iterator, so files are streamed, not preloaded
+        for source in sources:
+            entry = await render_item(source, out_dir, renderer, cache, variants)
+            report.append(entry)
+            mark = "✓" if entry["status"] == "ok" else "✗"
+            print(f"{mark} {entry['source']} ({entry['seconds']:.2f}s)")
+
+    # Each worker renders its variants concurrently, so give every one a page per variant
+    async with AsyncPDFRenderer(pool_size=workers * len(variants)) as renderer:
+        await asyncio.gather(*(worker() for _ in range(workers)))
+
+    cache.save()
+    report.sort(key=lambda entry: entry["source"])
+    failed = [entry for entry in report if entry["status"] != "ok"]
+    total = time.perf_counter() - started
+
+    report_path = out_dir / "report.json"
+    report_path.write_text(
+        json.dumps(
+            {
+                "items": report,
+                "succeeded": len(report) - len(failed),
+                "failed": len(failed),
+                "seconds": round(total, 3),
+            },
+            indent=2
+        ),
+        encoding="utf-8"
+    )
+
+    print(f"\n✓ Rendered {len(report) - len(failed)}/{len(report)} resumes in {total:.2f}s")
+    for entry in failed:
+        print(f"  ✗ {entry['source']}: {entry['error']}")
+    print(f"  Report -> {report_path}")
+    cache.report(verbose=False)
+    render_cache.prune()
+    render_cache.report()
+    return 1 if failed else 0
@@ -0,0 +1,166 @@
+"""
+bench/markdown_roundtrip.py
+
+Round-trip corpus check and throughput benchmark for markdown_to_json.py.
+
+For every resume in the corpus (resume.yaml, the resume.yaml.*.backup
+snapshots, synthetic resumes and edge cases) it checks that:
+    - generate_markdown.py output parses back into data that regenerates the
+      same Markdown
+    - json_to_markdown.py output parses back into the same data
+String values are compared with surrounding whitespace stripped. It then
+times parsing of increasingly large documents in both formats.
+
+Usage:
+    python bench/markdown_roundtrip.py
+    python bench/markdown_roundtrip.py --json results.json
+
+Exits non-zero if any round trip fails.
+"""
+
+import argparse
+import copy
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from generate_markdown import generate_markdown  # noqa: E402
+from json_to_markdown import convert_to_markdown  # noqa: E402
+from markdown_to_json import parse_markdown_text  # noqa: E402
+from resume_loader import parse_yaml  # noqa: E402
+from synthetic import make_resume  # noqa: E402
+
+
+# Hand-written cases that tripped up the old split-on-'---' parser
+EDGE_CASES = {
+    "dashes-in-strings": {
+        "name": "Dash --- Person",
+        "summary": "Summary --- with dashes",
+        "publications": [{"title": "A --- B", "publication": "Weekly"}],
+        "experience": [{"role": "Engineer", "company": "Co --- Op", "bullets": ["x --- y"]}],
+    },
+    "minimal": {"name": "Only A Name"},
+    "no-location": {
+        "name": "N",
+        "experience": [{"role": "R", "company": "C", "start": "2020", "end": "2021"}],
+        "education": [{"degree": "D", "school": "S", "notes": "n"}],
+    },
+}
+
+# A bare "---" line is only unambiguous inside YAML frontmatter
+FRONTMATTER_CASES = {
+    "bare-rule-in-yaml-string": {
+        "name": "Rule Person",
+        "publications": [{"title": "T", "description": "before\n---\nafter"}],
+        "summary": "Plain summary",
+    },
+}
+
+SIZES = [10, 100, 1000, 10000]
+
+
+def strip_strings(value):
+    """Recursively strip whitespace from strings and drop empty values."""
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        return {k: strip_strings(v) for k, v in value.items() if v not in ("", None, [], {})}
+    if isinstance(value, list):
+        return [strip_strings(v) for v in value]
+    return value
+
+
+def load_corpus() -> dict:
+    """Return {name: resume data} for every corpus entry."""
+    corpus = {}
+    for path in [ROOT / "resume.yaml", *sorted(ROOT.glob("resume.yaml.*.backup"))]:
+        if path.exists():
+            corpus[path.name] = parse_yaml(path.read_text(encoding="utf-8"))
+    for bullets in (1, 25, 250):
+        corpus[f"synthetic-{bullets}"] = make_resume(bullets=bullets)
+    corpus.update(copy.deepcopy(EDGE_CASES))
+    return corpus
+
+
+def check_roundtrips(corpus: dict) -> list[str]:
+    """Return a list of failure descriptions (empty when everything round-trips)."""
+    failures = []
+    for name, data in corpus.items():
+        expected = generate_markdown(strip_strings(data))
+        reparsed = parse_markdown_text(generate_markdown(data))
+        if generate_markdown(reparsed) != expected:
+            failures.append(f"{name}: generate_markdown round trip differs")
+
+        frontmatter = convert_to_markdown(copy.deepcopy(data))
+        if strip_strings(parse_markdown_text(frontmatter)) != strip_strings(data):
+            failures.append(f"{name}: json_to_markdown round trip differs")
+
+    for name, data in FRONTMATTER_CASES.items():
+        frontmatter = convert_to_markdown(copy.deepcopy(data))
+        if strip_strings(parse_markdown_text(frontmatter)) != strip_strings(data):
+            failures.append(f"{name}: json_to_markdown round trip differs")
+    return failures
+
+
+def time_parse(text: str, repeat: int) -> float:
+    """Best-of-three seconds for one parse of `text`."""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            parse_markdown_text(text)
+        best = min(best, (time.perf_counter() - started) / repeat)
+    return best
+
+
+def benchmark() -> list[dict]:
+    """Parse throughput for both Markdown flavours across document sizes."""
+    results = []
+    for bullets in SIZES:
+        data = make_resume(bullets=bullets)
+        for flavour, text in (
+            ("generate_markdown", generate_markdown(data)),
+            ("frontmatter", convert_to_markdown(copy.deepcopy(data))),
+        ):
+            repeat = max(1, 2000 // bullets)
+            seconds = time_parse(text, repeat)
+            results.append({
+                "flavour": flavour,
+                "bullets": bullets,
+                "bytes": len(text.encode("utf-8")),
+                "seconds": seconds,
+                "mb_per_s": len(text.encode("utf-8")) / seconds / 1e6,
+            })
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--json", metavar="FILE", help="also write results as JSON")
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    failures = check_roundtrips(corpus)
+    total = len(corpus) + len(FRONTMATTER_CASES)
+    print(f"Round trip: {total - len({f.split(':')[0] for f in failures})}/{total} resumes OK")
+    for failure in failures:
+        print(f"  ✗ {failure}")
+
+    results = benchmark()
+    print(f"\n{'flavour':<18} {'bullets':>8} {'bytes':>10} {'ms':>9} {'MB/s':>7}")
+    for row in results:
+        print(
+            f"{row['flavour']:<18} {row['bullets']:>8} {row['bytes']:>10} "
+            f"{row['seconds'] * 1000:>9.2f} {row['mb_per_s']:>7.1f}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps({"failures": failures, "results": results}, indent=2), encoding="utf-8"
+        )
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,289 @@
+"""
+bench/pipeline.py
+
+Benchmark for the full render pipeline (what `make all` does), stage by stage:
+    yaml_load         parse resume YAML
+    template_compile  compile both templates from scratch (no caches)
+    html_render       render both variants' HTML
+    pdf_render        render both variants' PDF
+    markdown          generate_markdown()
+    yaml_to_json, json_to_yaml, yaml_to_md, md_to_json
+                      conversions through resume_convert.py
+
+Each stage runs over synthetic resumes of increasing size (10 to 10,000
+bullets in one resume, then 1 to 1,000 people with 20 bullets each). PDFs go
+through StubPDFRenderer by default, a local stand-in that does the HTML
+handling and PDF writing without Chromium, so the suite runs in CI; pass
+--pdf chromium to time the real renderer.
+
+Results can be written as JSON and compared against a stored baseline
+(bench/baseline.json by default): a stage that got slower by more than
+--threshold is flagged as a regression. The run only exits non-zero for
+regressions when --fail-on-regression is given.
+
+Every run also times a fixed calibration workload (json, zlib and plain
+Python), and the baseline's timings are scaled by how much faster or slower
+this machine runs it. That makes a baseline from another machine a rough
+guide, not a gate: before using --fail-on-regression (e.g. in CI), record the
+baseline with --save-baseline on that same machine.
+
+Usage:
+    python bench/pipeline.py
+    python bench/pipeline.py --quick --json results.json
+    python bench/pipeline.py --save-baseline          # record a new baseline
+    python bench/pipeline.py --fail-on-regression     # exit 1 on regressions
+    python bench/pipeline.py --pdf chromium --stage pdf_render
+"""
+
+import argparse
+import io
+import json
+import platform
+import re
+import sys
+import time
+import zlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import yaml  # noqa: E402
+from jinja2 import Environment, FileSystemLoader  # noqa: E402
+from generate_markdown import generate_markdown  # noqa: E402
+from generate_resume import VARIANTS, load_template  # noqa: E402
+from pdf_renderer import ASSET_ORIGIN, PDFRenderer, read_asset, with_base_href  # noqa: E402
+from resume_convert import convert_stream  # noqa: E402
+from resume_loader import Loader  # noqa: E402
+from synthetic import make_people, make_resume  # noqa: E402
+
+
+BULLET_SIZES = [10, 100, 1000, 10000]
+PEOPLE_SIZES = [1, 10, 100, 1000]
+PEOPLE_BULLETS = 20
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baseline.json"
+
+# Slower than baseline by more than this fraction (and MIN_DELTA seconds) is a regression
+DEFAULT_THRESHOLD = 0.25
+MIN_DELTA = 0.001
+
+# Keep repeating a measurement until it has taken at least this long
+MIN_SECONDS = 0.2
+
+STYLESHEET_RE = re.compile(r'<link[^>]+href="([^"]+\.css)"')
+
+
+class StubPDFRenderer:
+    """Chromium-free stand-in for PDFRenderer with the same render_pdf() API.
+
+    It does the work around the browser (base href, stylesheet lookup through
+    the asset cache, compressing the page content, writing the file) so the
+    benchmark still covers everything but layout.
+    """
+
+    def start(self) -> "StubPDFRenderer":
+        return self
+
+    def close(self):
+        pass
+
+    def render_pdf(self, html: str, options: dict | None = None, base_dir: str | Path = ".") -> bytes:
+        """Return a minimal single-page PDF wrapping the compressed HTML."""
+        html = with_base_href(html, base_dir)
+        base_href = f"{ASSET_ORIGIN}{Path(base_dir).resolve().as_posix()}/"
+        assets = [read_asset(base_href + href) for href in STYLESHEET_RE.findall(html)]
+        stream = zlib.compress(html.encode("utf-8") + b"".join(asset[0] for asset in assets if asset))
+        pdf = b"".join([
+            b"%PDF-1.7\n1 0 obj <</Type /Catalog /Pages 2 0 R>> endobj\n",
+            b"2 0 obj <</Type /Pages /Kids [3 0 R] /Count 1>> endobj\n",
+            b"3 0 obj <</Type /Page /Parent 2 0 R /Contents 4 0 R>> endobj\n",
+            b"4 0 obj <</Length %d /Filter /FlateDecode>> stream\n" % len(stream),
+            stream,
+            b"\nendstream endobj\ntrailer <</Root 1 0 R>>\n%%EOF\n",
+        ])
+        if options and options.get("path"):
+            Path(options["path"]).write_bytes(pdf)
+        return pdf
+
+
+PDF_RENDERERS = {"stub": StubPDFRenderer, "chromium": PDFRenderer}
+
+
+def measure(func) -> float:
+    """Best-of-three seconds per call, repeating each round for at least MIN_SECONDS."""
+    best = float("inf")
+    for _ in range(3):
+        calls = 0
+        started = time.perf_counter()
+        while True:
+            func()
+            calls += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= MIN_SECONDS:
+                break
+        best = min(best, elapsed / calls)
+    return best
+
+
+def calibration_workload():
+    """Fixed CPU-bound work the machine's speed is measured by."""
+    data = [{"title": f"Item {i}", "tags": [str(n) for n in range(20)]} for i in range(500)]
+    text = json.dumps(data)
+    json.loads(text)
+    zlib.compress(text.encode("utf-8"))
+    sum(len(word) for word in text.split(","))
+
+
+def convert(text: str, from_format: str, to_format: str) -> str:
+    """Convert text between formats in memory."""
+    target = io.StringIO()
+    convert_stream(io.StringIO(text), target, from_format, to_format)
+    return target.getvalue()
+
+
+def compile_templates():
+    """Compile every variant's template from scratch."""
+    env = Environment(loader=FileSystemLoader(ROOT), cache_size=0)
+    for variant in VARIANTS:
+        env.get_template(variant["template"])
+
+
+def pipeline_stages(people: list[dict], renderer) -> dict:
+    """Return {stage name: zero-argument callable} covering every pipeline stage for `people`."""
+    templates = [load_template(str(ROOT / variant["template"])) for variant in VARIANTS]
+    yaml_text = yaml.safe_dump_all(people, sort_keys=False, allow_unicode=True)
+    json_text = "".join(json.dumps(person, ensure_ascii=False) + "\n" for person in people)
+    md_text = convert(yaml_text, "yaml", "md") if len(people) == 1 else None
+    html = [template.render(**person) for person in people for template in templates]
+
+    stages = {
+        "yaml_load": lambda: list(yaml.load_all(yaml_text, Loader=Loader)),
+        "template_compile": compile_templates,
+        "html_render": lambda: [template.render(**person) for person in people for template in templates],
+        "pdf_render": lambda: [renderer.render_pdf(page, base_dir=ROOT) for page in html],
+        "markdown": lambda: [generate_markdown(person) for person in people],
+        "yaml_to_json": lambda: convert(yaml_text, "yaml", "jsonl" if len(people) > 1 else "json"),
+        "json_to_yaml": lambda: convert(json_text, "jsonl", "yaml"),
+        "yaml_to_md": lambda: convert(yaml_text, "yaml", "md"),
+    }
+    if md_text is not None:
+        # Markdown holds one resume per document
+        stages["md_to_json"] = lambda: convert(md_text, "md", "json")
+    return stages
+
+
+def run(renderer, quick: bool = False, only: set[str] | None = None) -> list[dict]:
+    """Time every stage at every size; return result rows."""
+    bullet_sizes = BULLET_SIZES[:2] if quick else BULLET_SIZES
+    people_sizes = PEOPLE_SIZES[:2] if quick else PEOPLE_SIZES
+    scales = [("bullets", size, [make_resume(bullets=size)]) for size in bullet_sizes]
+    scales += [("people", size, make_people(size, PEOPLE_BULLETS)) for size in people_sizes]
+
+    results = []
+    for scale, size, people in scales:
+        for stage, func in pipeline_stages(people, renderer).items():
+            if only and stage not in only:
+                continue
+            if stage == "template_compile" and (scale, size) != ("bullets", bullet_sizes[0]):
+                continue  # doesn't depend on the data
+            results.append({"stage": stage, "scale": scale, "size": size, "seconds": measure(func)})
+            print(f"  {stage:<17} {scale:>7}={size:<6} {results[-1]['seconds'] * 1000:>10.2f} ms")
+    return results
+
+
+def result_key(row: dict) -> tuple:
+    """Identify a result row across runs."""
+    return row["stage"], row["scale"], row["size"]
+
+
+def compare(results: list[dict], baseline: list[dict], threshold: float, speed: float = 1.0) -> list[dict]:
+    """Annotate each result with its baseline ratio; return the rows that regressed.
+
+    `speed` is this machine's calibration time over the baseline's; baseline
+    timings are scaled by it before comparing.
+    """
+    previous = {result_key(row): row["seconds"] * speed for row in baseline}
+    regressions = []
+    for row in results:
+        before = previous.get(result_key(row))
+        if before is None:
+            continue
+        row["baseline_seconds"] = before
+        row["ratio"] = row["seconds"] / before if before else float("inf")
+        if row["seconds"] > before * (1 + threshold) and row["seconds"] - before > MIN_DELTA:
+            row["regression"] = True
+            regressions.append(row)
+    return regressions
+
+
+def print_table(results: list[dict]):
+    """Print results, with the change against the baseline when there is one."""
+    print(f"\n{'stage':<17} {'scale':>7} {'size':>6} {'ms':>10} {'baseline':>10} {'change':>8}")
+    for row in results:
+        line = f"{row['stage']:<17} {row['scale']:>7} {row['size']:>6} {row['seconds'] * 1000:>10.2f}"
+        if "baseline_seconds" in row:
+            line += f" {row['baseline_seconds'] * 1000:>10.2f} {(row['ratio'] - 1) * 100:>+7.0f}%"
+            if row.get("regression"):
+                line += "  ✗ regression"
+        print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[1])
+    parser.add_argument("--pdf", choices=sorted(PDF_RENDERERS), default="stub", help="PDF renderer (default: stub)")
+    parser.add_argument("--quick", action="store_true", help="only the two smallest sizes of each scale")
+    parser.add_argument("--stage", action="append", help="only time this stage (repeatable)")
+    parser.add_argument("--json", metavar="FILE", help="also write results as JSON")
+    parser.add_argument("--baseline", metavar="FILE", default=str(BASELINE_PATH), help="baseline to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="exit non-zero on regressions (baseline must come from this machine)"
+    )
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed slowdown (default: 0.25)")
+    args = parser.parse_args()
+
+    calibration = measure(calibration_workload)
+    renderer = PDF_RENDERERS[args.pdf]()
+    try:
+        results = run(renderer, quick=args.quick, only=set(args.stage) if args.stage else None)
+    finally:
+        renderer.close()
+    # Timed before and after the stages, so a slow start (or end) doesn't skew it
+    calibration = min(calibration, measure(calibration_workload))
+    print(f"  {'calibration':<17} {calibration * 1000:>25.2f} ms")
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pdf_renderer": args.pdf,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "calibration_seconds": calibration,
+        "results": results,
+    }
+
+    regressions = []
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\n✓ Saved baseline -> {baseline_path}")
+    elif baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        if baseline.get("pdf_renderer") != args.pdf:
+            # Stub and Chromium timings aren't comparable
+            baseline["results"] = [row for row in baseline["results"] if row["stage"] != "pdf_render"]
+        # Baselines without a calibration are compared unscaled
+        speed = calibration / baseline.get("calibration_seconds", calibration)
+        if abs(speed - 1) > 0.05:
+            print(f"\n  this machine runs the calibration at {speed:.2f}x the baseline's time; scaling the baseline")
+        regressions = compare(results, baseline["results"], args.threshold, speed)
+
+    print_table(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps({**report, "regressions": regressions}, indent=2), encoding="utf-8")
+    if regressions:
+        print(f"\n✗ {len(regressions)} stage(s) slower than baseline by more than {args.threshold:.0%}")
+    sys.exit(1 if regressions and args.fail_on_regression else 0)
@@ -0,0 +1,86 @@
+"""
+bench/synthetic.py
+
+Synthetic resume data of arbitrary size for the benchmarks.
+
+Usage:
+    from synthetic import make_resume, make_people
+
+    data = make_resume(bullets=1000)   # ~1000 experience bullets
+    people = make_people(100)          # 100 small, distinct resumes
+"""
+
+WORDS = (
+    "designed built led scaled migrated deployed optimized automated retrieval "
+    "pipelines kubernetes python vector search platform enterprise customers "
+    "latency throughput reliability governance evaluation agents inference "
+    "architecture revenue onboarding observability streaming analytics"
+).split()
+
+
+def sentence(seed: int, length: int = 14) -> str:
+    """Deterministic pseudo-random sentence."""
+    words = [WORDS[(seed * 7 + i * 13) % len(WORDS)] for i in range(length)]
+    return " ".join(words).capitalize() + "."
+
+
+def make_resume(bullets: int = 20, person: int = 0, bullets_per_job: int = 5) -> dict:
+    """Build a schema-valid resume with roughly `bullets` experience bullets."""
+    jobs = max(1, -(-bullets // bullets_per_job))
+    return {
+        "name": f"Person {person}",
+        "tagline": "Solutions Architect | Enterprise AI",
+        "summary": " ".join(sentence(person + i, 20) for i in range(3)),
+        "contact": {
+            "address": f"{person} Main St, Brooklyn, NY",
+            "phone": "555-555-5555",
+            "email": f"person{person}@example.com",
+            "website": "",
+            "linkedin": f"https://linkedin.com/in/person{person}",
+            "github": f"https://github.com/person{person}",
+        },
+        "technical_skills": [sentence(person + i, 4)[:-1] for i in range(12)],
+        "soft_skills": [sentence(person + i, 3)[:-1] for i in range(5)],
+        "publications": [
+            {
+                "title": f"Field Notes --- Volume {i}",
+                "publication": "Example Weekly",
+                "description": sentence(person + i, 24),
+                "url": f"https://example.com/{person}/{i}",
+            }
+            for i in range(2)
+        ],
+        "speaking_engagements": [
+            {"title": sentence(person + i, 6)[:-1], "event": f"Conference {i} - October 2025"}
+            for i in range(4)
+        ],
+        "experience": [
+            {
+                "role": f"Senior Engineer {job}",
+                "company": f"Company {job}",
+                "location": "Remote",
+                "start": f"Jan {2000 + job % 25}",
+                "end": "Present" if job == 0 else f"Dec {2001 + job % 25}",
+                "bullets": [
+                    sentence(person * 31 + job * bullets_per_job + b)
+                    for b in range(min(bullets_per_job, bullets - job * bullets_per_job))
+                ],
+            }
+            for job in range(jobs)
+        ],
+        "education": [
+            {
+                "degree": "B.S. Computer Science",
+                "school": "Example University",
+                "location": "Boston, MA",
+                "start": "2004",
+                "end": "2008",
+                "notes": "Honors program",
+            }
+        ],
+    }
+
+
+def make_people(count: int, bullets: int = 20) -> list[dict]:
+    """Build `count` distinct resumes."""
+    return [make_resume(bullets=bullets, person=person) for person in range(count)]
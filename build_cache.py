@@ -0,0 +1,152 @@
+"""
+build_cache.py
+
+Content-hash incremental build cache shared by generate_resume.py and
+generate_markdown.py.
+
+Each generated artifact (resume.html, resume.pdf, resume.md, ...) is recorded in
+a manifest together with a key: a SHA-256 digest of everything it was built
+from (resume data, template, CSS, render options). On the next run an artifact
+whose key is unchanged and which still exists on disk is skipped.
+
+Usage:
+    from build_cache import BuildCache, data_digest, digest, file_digest
+
+    cache = BuildCache()
+    key = digest(data_digest(data), file_digest("resume_template.html"))
+    if not cache.is_fresh("resume.html", key):
+        ...  # build resume.html
+        cache.record("resume.html", key)
+    cache.save()
+    cache.report()
+
+The manifest lives in .resume-cache/manifest.json.
+"""
+
+import hashlib
+import json
+import os
+from datetime import date
+from pathlib import Path
+
+
+CACHE_DIR = Path(".resume-cache")
+MANIFEST_PATH = CACHE_DIR / "manifest.json"
+
+# Absolute path -> (mtime_ns, size, digest), so a file is hashed once per change
+_file_digests = {}
+
+
+def digest(*parts) -> str:
+    """Combine strings/bytes (e.g. other digests) into a single SHA-256 hex digest."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        h.update(hashlib.sha256(part).digest())
+    return h.hexdigest()
+
+
+def text_digest(text: str) -> str:
+    """Return the SHA-256 hex digest of a string."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def data_digest(data) -> str:
+    """Return a digest of JSON-like data that ignores key order."""
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return text_digest(canonical)
+
+
+def canonical_data(value):
+    """Normalise resume data so YAML and JSON spellings of the same resume compare equal.
+
+    Dates and non-zero numbers become the text templates would print for them
+    (YAML reads `start: 2019` as an int and `2019-05-01` as a date, JSON as
+    strings). Zero, booleans and None are kept, since templates test them with
+    `{% if %}` and print None as "None".
+    """
+    if isinstance(value, dict):
+        return {str(key): canonical_data(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [canonical_data(item) for item in value]
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and value:
+        return str(value)
+    return value
+
+
+def canonical_digest(data) -> str:
+    """Return a digest of resume data that is the same for equivalent YAML and JSON."""
+    return data_digest(canonical_data(data))
+
+
+def file_digest(path: str | Path) -> str:
+    """Return the SHA-256 hex digest of a file's contents ('missing' if absent)."""
+    path = Path(path).resolve()
+    try:
+        stat = path.stat()
+    except OSError:
+        return "missing"
+
+    cached = _file_digests.get(path)
+    if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+        cached = (stat.st_mtime_ns, stat.st_size, hashlib.sha256(path.read_bytes()).hexdigest())
+        _file_digests[path] = cached
+    return cached[2]
+
+
+class BuildCache:
+    """Manifest of artifact -> input key, with hit/miss bookkeeping for one run."""
+
+    def __init__(self, manifest_path: str | Path = MANIFEST_PATH, enabled: bool = True):
+        self.manifest_path = Path(manifest_path)
+        self.enabled = enabled
+        self.entries = {}
+        self.hits = []
+        self.misses = []
+        self._dirty = False
+
+        if self.manifest_path.exists():
+            try:
+                self.entries = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            except json.JSONDecodeError:
+                # A corrupt manifest just means a full rebuild
+                self.entries = {}
+
+    def is_fresh(self, artifact: str | Path, key: str) -> bool:
+        """Return True (a hit) if `artifact` exists and was last built from `key`."""
+        artifact = str(artifact)
+        fresh = (
+            self.enabled
+            and self.entries.get(artifact) == key
+            and Path(artifact).exists()
+        )
+        (self.hits if fresh else self.misses).append(artifact)
+        return fresh
+
+    def record(self, artifact: str | Path, key: str):
+        """Remember that `artifact` has been built from `key`."""
+        self.entries[str(artifact)] = key
+        self._dirty = True
+
+    def save(self):
+        """Write the manifest atomically if anything was recorded."""
+        if not self._dirty:
+            return
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self.entries, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, self.manifest_path)
+        self._dirty = False
+
+    def report(self, verbose: bool = True):
+        """Print the hits and misses of this run (per artifact when verbose)."""
+        print(f"Build cache: {len(self.hits)} hit(s), {len(self.misses)} miss(es)")
+        if not verbose:
+            return
+        for artifact in self.hits:
+            print(f"  up to date  {artifact}")
+        for artifact in self.misses:
+            print(f"  rebuilt     {artifact}")
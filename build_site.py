@@ -0,0 +1,252 @@
+"""
+build_site.py
+
+Assemble the GitHub Pages tree (_site/) from the generated outputs, so the
+deploy workflow and a local build produce exactly the same site:
+    - index.html, both resume variants (HTML + PDF), resume.md, resume.yaml
+      and resume_data.json are copied in
+    - linked stylesheets get content-hashed names (assets/resume_style.<hash>.css)
+      and the <link> references in index.html and the resume HTML are
+      rewritten, so the CSS can be cached forever
+    - text assets (HTML, CSS, Markdown, YAML, JSON) get precompressed .gz and
+      .br siblings for hosts/CDNs that serve them
+    - _site/manifest.json lists every file with its SHA-256, size and
+      compressed sizes
+
+Only files whose content changed are rewritten and recompressed (tracked in
+.resume-cache/site.json, with the previous _site/manifest.json recording
+which compressed siblings each file had); files left over from an earlier build, such as a
+stylesheet under its old hash, are removed.
+
+Brotli siblings need the optional brotli package; without it only gzip
+siblings are written.
+
+Usage:
+    pip install brotli   # optional
+    python generate_resume.py && python generate_markdown.py
+    python build_site.py
+    python build_site.py --out public --force
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from build_cache import CACHE_DIR, BuildCache, digest
+from generate_resume import VARIANTS
+from profiling import span
+import profiling
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+SITE_DIR = Path("_site")
+SITE_CACHE_PATH = CACHE_DIR / "site.json"
+MANIFEST_NAME = "manifest.json"
+
+# Published as-is, besides each variant's HTML and PDF
+EXTRA_FILES = ["index.html", "resume.md", "resume.yaml", "resume_data.json"]
+OPTIONAL_FILES = {"index.html"}
+
+TEXT_SUFFIXES = {".html", ".css", ".md", ".yaml", ".yml", ".json", ".txt", ".svg", ".js"}
+
+# Below this, compression headers cost more than they save
+MIN_COMPRESS_BYTES = 256
+
+HASH_LENGTH = 10
+
+# Compressed sibling suffix -> its size field in the site manifest
+SIBLING_LABELS = {".gz": "gzip_bytes", ".br": "brotli_bytes"}
+
+LINK_HREF_RE = re.compile(r'(<link[^>]+href=")([^"]+\.css)(")', re.IGNORECASE)
+
+
+def hashed_name(path: str | Path, content: bytes) -> str:
+    """Return the content-hashed site path for an asset: assets/<stem>.<hash>.<ext>."""
+    path = Path(path)
+    return f"assets/{path.stem}.{hashlib.sha256(content).hexdigest()[:HASH_LENGTH]}{path.suffix}"
+
+
+def rewrite_stylesheets(html: str, renamed: dict[str, str]) -> str:
+    """Point stylesheet <link>s at their hashed names."""
+    return LINK_HREF_RE.sub(lambda m: m.group(1) + renamed.get(m.group(2), m.group(2)) + m.group(3), html)
+
+
+def compressed_variants(content: bytes) -> dict[str, bytes]:
+    """Return {".gz": ..., ".br": ...} for `content`, keeping only those that are smaller."""
+    variants = {".gz": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants[".br"] = brotli.compress(content, quality=11)
+    return {suffix: data for suffix, data in variants.items() if len(data) < len(content)}
+
+
+def write_atomic(path: Path, content: bytes):
+    """Write bytes via a temp file, so an interrupted build never leaves a truncated asset."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+
+
+def collect_sources(root: str | Path = ".") -> tuple[dict[str, bytes], dict[str, str], list[str]]:
+    """Read the generated outputs: return ({site path: content}, {stylesheet: hashed path}, missing names)."""
+    root = Path(root)
+    names = [name for variant in VARIANTS for name in (variant["html"], variant["pdf"])] + EXTRA_FILES
+    files, missing = {}, []
+    for name in names:
+        path = root / name
+        if path.exists():
+            files[name] = path.read_bytes()
+        elif name not in OPTIONAL_FILES:
+            missing.append(name)
+
+    # Stylesheets still linked from the HTML (builds without --inline-css)
+    renamed = {}
+    for name, content in list(files.items()):
+        if not name.endswith(".html"):
+            continue
+        for href in LINK_HREF_RE.findall(content.decode("utf-8")):
+            href = href[1]
+            css_path = root / href
+            if href in renamed or "://" in href or not css_path.exists():
+                continue
+            css = css_path.read_bytes()
+            renamed[href] = hashed_name(href, css)
+            files[renamed[href]] = css
+
+    for name, content in list(files.items()):
+        if name.endswith(".html") and renamed:
+            files[name] = rewrite_stylesheets(content.decode("utf-8"), renamed).encode("utf-8")
+    return files, renamed, missing
+
+
+def load_manifest(path: Path) -> dict:
+    """Read the site manifest of the previous build ({} if missing or corrupt)."""
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def publish(
+    site_dir: Path, name: str, content: bytes, cache: BuildCache, previous: dict | None
+) -> tuple[dict, bool]:
+    """Write one file (and its compressed siblings) unless unchanged; return (manifest entry, written).
+
+    `previous` is the file's entry in the last build's manifest; the siblings it
+    lists must still exist for the file to count as unchanged.
+    """
+    path = site_dir / name
+    compress = Path(name).suffix in TEXT_SUFFIXES and len(content) >= MIN_COMPRESS_BYTES
+    sha = hashlib.sha256(content).hexdigest()
+    key = digest(sha, f"compress={compress}", f"brotli={brotli is not None}")
+
+    fresh = (
+        cache.is_fresh(path, key)
+        and previous is not None
+        and all(
+            path.with_name(path.name + suffix).exists()
+            for suffix, label in SIBLING_LABELS.items()
+            if label in previous
+        )
+    )
+    if not fresh:
+        with span("write", file=name):
+            write_atomic(path, content)
+        siblings = compressed_variants(content) if compress else {}
+        with span("compress", file=name):
+            for suffix, data in siblings.items():
+                write_atomic(path.with_name(path.name + suffix), data)
+        for suffix in SIBLING_LABELS.keys() - siblings.keys():
+            path.with_name(path.name + suffix).unlink(missing_ok=True)
+        cache.record(path, key)
+
+    entry = {"sha256": sha, "bytes": len(content)}
+    for suffix, label in SIBLING_LABELS.items():
+        sibling = path.with_name(path.name + suffix)
+        if sibling.exists():
+            entry[label] = sibling.stat().st_size
+    return entry, not fresh
+
+
+def remove_stale(site_dir: Path, keep: set[Path]) -> list[Path]:
+    """Delete files under `site_dir` that this build didn't produce; return them."""
+    removed = []
+    for path in sorted(site_dir.rglob("*")):
+        if path.is_file() and path not in keep:
+            path.unlink()
+            removed.append(path)
+    for directory in sorted((p for p in site_dir.rglob("*") if p.is_dir()), reverse=True):
+        if not any(directory.iterdir()):
+            directory.rmdir()
+    return removed
+
+
+def build_site(site_dir: str | Path = SITE_DIR, root: str | Path = ".", force: bool = False) -> dict:
+    """Build `site_dir` from the generated outputs in `root`; return the manifest."""
+    site_dir = Path(site_dir)
+    with span("collect"):
+        files, renamed, missing = collect_sources(root)
+    if missing:
+        raise FileNotFoundError(f"not generated yet: {', '.join(missing)}")
+
+    cache = BuildCache(SITE_CACHE_PATH, enabled=not force)
+    manifest_path = site_dir / MANIFEST_NAME
+    previous = load_manifest(manifest_path).get("files", {})
+    manifest = {"files": {}, "assets": renamed}
+    written = 0
+    for name, content in sorted(files.items()):
+        manifest["files"][name], changed = publish(site_dir, name, content, cache, previous.get(name))
+        written += changed
+    cache.save()
+
+    write_atomic(manifest_path, json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+
+    keep = {manifest_path}
+    for name in files:
+        path = site_dir / name
+        keep.add(path)
+        keep.update(path.with_name(path.name + suffix) for suffix in SIBLING_LABELS)
+    removed = remove_stale(site_dir, keep)
+
+    print(f"✓ Built {site_dir}/: {len(files)} file(s), {written} written, {len(files) - written} unchanged")
+    for path in removed:
+        print(f"  removed     {path}")
+    return manifest
+
+
+def print_sizes(manifest: dict):
+    """Print each file's size next to its precompressed sizes."""
+    print(f"  {'file':<36} {'bytes':>9} {'gzip':>9} {'brotli':>9}")
+    for name, entry in manifest["files"].items():
+        print(
+            f"  {name:<36} {entry['bytes']:>9} {entry.get('gzip_bytes', '-'):>9} "
+            f"{entry.get('brotli_bytes', '-'):>9}"
+        )
+    if brotli is None:
+        print("  (pip install brotli for .br siblings)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the GitHub Pages tree from the generated resume files")
+    parser.add_argument("--out", default=str(SITE_DIR), help="site directory (default: _site)")
+    parser.add_argument("--force", action="store_true", help="rewrite every file, ignoring the site cache")
+    parser.add_argument("--quiet", action="store_true", help="skip the per-file size table")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.configure(args)
+
+    try:
+        manifest = build_site(args.out, force=args.force)
+    except Exception as e:
+        print(f"✗ Error: {e}")
+        sys.exit(1)
+    if not args.quiet:
+        print_sizes(manifest)
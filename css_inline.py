@@ -0,0 +1,232 @@
+"""
+css_inline.py
+
+Inline a variant's stylesheet into its rendered HTML, so resume.html and
+resume_ats.html are single self-contained files: the PDF renderer makes no
+stylesheet request and the published page needs no second download.
+
+The stylesheet is compiled once per (stylesheet, template) content hash:
+    - comments and redundant whitespace are removed (minified)
+    - rules whose selectors can't match anything in the template are dropped,
+      judged against the template's class names, ids and tag names
+    - @page, @font-face, @keyframes and other at-rules are kept as they are;
+      @media / @supports blocks are filtered like top-level rules
+The compiled CSS is kept in the render cache (render_cache.py), so later runs
+and other processes skip compilation too.
+
+Templates that build class names dynamically ({{ ... }} inside class="")
+keep every class-based rule, since their class set isn't known up front.
+
+Usage:
+    python generate_resume.py --inline-css
+
+    from css_inline import compile_stylesheet, inline_stylesheet
+
+    css = compile_stylesheet("resume_style.css", "resume_template.html")
+    html = inline_stylesheet(html, css)
+
+    python css_inline.py resume_style.css resume_template.html   # size report
+"""
+
+import re
+import sys
+from pathlib import Path
+from build_cache import digest, file_digest
+from render_cache import STYLESHEET_RE, get_render_cache
+
+
+# At-rules whose blocks contain ordinary style rules that can be filtered
+GROUPING_AT_RULES = ("@media", "@supports", "@layer", "@container")
+
+# Selectors that always match a rendered document
+ALWAYS_USED_TAGS = {"html", "body", "*"}
+
+COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+CLASS_ATTR_RE = re.compile(r'class\s*=\s*"([^"]*)"')
+ID_ATTR_RE = re.compile(r'id\s*=\s*"([^"]*)"')
+TAG_RE = re.compile(r"<([a-zA-Z][a-zA-Z0-9-]*)")
+STRING_RE = re.compile(r""""(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*'""")
+
+# Parts of a compound selector
+SELECTOR_CLASS_RE = re.compile(r"\.(-?[_a-zA-Z][\w-]*)")
+SELECTOR_ID_RE = re.compile(r"#(-?[_a-zA-Z][\w-]*)")
+SELECTOR_TAG_RE = re.compile(r"(?:^|[\s>+~(])([a-zA-Z][\w-]*)")
+PSEUDO_RE = re.compile(r"::?[\w-]+(\([^)]*\))?")
+ATTRIBUTE_RE = re.compile(r"\[[^\]]*\]")
+
+
+def template_names(template_text: str) -> dict[str, set[str] | None]:
+    """Return the class names, ids and tag names a template can produce.
+
+    "classes" is None when a class attribute is built with {{ ... }}, since
+    the class set is then unknown.
+    """
+    classes = set()
+    dynamic = False
+    for attribute in CLASS_ATTR_RE.findall(template_text):
+        if "{{" in attribute:
+            dynamic = True
+        # {% if %} blocks inside class="" just add or remove names
+        static = re.sub(r"\{[{%].*?[}%]\}", " ", attribute)
+        classes.update(static.split())
+    return {
+        "classes": None if dynamic else classes,
+        "ids": {value for value in ID_ATTR_RE.findall(template_text) if "{" not in value},
+        "tags": {tag.lower() for tag in TAG_RE.findall(template_text)} | ALWAYS_USED_TAGS,
+    }
+
+
+def selector_used(selector: str, names: dict) -> bool:
+    """Whether a single selector (no commas) could match the template's markup."""
+    # :not(.x) and friends only narrow a match; judge the selector without them
+    plain = ATTRIBUTE_RE.sub("", PSEUDO_RE.sub("", selector))
+    if names["classes"] is not None and not set(SELECTOR_CLASS_RE.findall(plain)) <= names["classes"]:
+        return False
+    if not set(SELECTOR_ID_RE.findall(plain)) <= names["ids"]:
+        return False
+    bare = SELECTOR_ID_RE.sub("", SELECTOR_CLASS_RE.sub("", plain))
+    return {tag.lower() for tag in SELECTOR_TAG_RE.findall(bare)} <= names["tags"]
+
+
+def split_top_level(text: str, separator: str) -> list[str]:
+    """Split on `separator` outside strings and parentheses."""
+    parts, depth, start, index = [], 0, 0, 0
+    while index < len(text):
+        char = text[index]
+        if char in "\"'":
+            index = STRING_RE.match(text, index).end()
+            continue
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append(text[start:index])
+            start = index + 1
+        index += 1
+    parts.append(text[start:])
+    return parts
+
+
+def collapse(text: str, punctuation: str = ",{};>~+") -> str:
+    """Collapse whitespace outside strings and drop it around `punctuation`."""
+    tighten = re.compile(rf"\s*([{re.escape(punctuation)}])\s*")
+    out = []
+    position = 0
+    for match in STRING_RE.finditer(text):
+        out.append(tighten.sub(r"\1", re.sub(r"\s+", " ", text[position:match.start()])))
+        out.append(match.group())
+        position = match.end()
+    out.append(tighten.sub(r"\1", re.sub(r"\s+", " ", text[position:])))
+    return "".join(out).strip()
+
+
+def minify_declarations(body: str) -> str:
+    """Minify a declaration block body: 'color: red; margin: 0 auto;' -> 'color:red;margin:0 auto'."""
+    declarations = []
+    for declaration in split_top_level(body, ";"):
+        name, colon, value = declaration.partition(":")
+        if colon and name.strip():
+            # Only commas: calc() needs the spaces around + and -
+            declarations.append(f"{name.strip()}:{collapse(value, ',')}")
+    return ";".join(declarations)
+
+
+def parse_blocks(css: str) -> list[tuple[str, str | None]]:
+    """Split CSS into top-level (prelude, body) pairs; statements like @import have body None."""
+    blocks = []
+    index, start, length = 0, 0, len(css)
+    while index < length:
+        char = css[index]
+        if char in "\"'":
+            index = STRING_RE.match(css, index).end()
+            continue
+        if char == ";" and css[start:index].strip().startswith("@"):
+            blocks.append((css[start:index].strip(), None))
+            start = index + 1
+        elif char == "{":
+            depth, body_start = 1, index + 1
+            index += 1
+            while index < length and depth:
+                if css[index] in "\"'":
+                    index = STRING_RE.match(css, index).end()
+                    continue
+                depth += {"{": 1, "}": -1}.get(css[index], 0)
+                index += 1
+            blocks.append((css[start:body_start - 1].strip(), css[body_start:index - 1]))
+            start = index
+            continue
+        index += 1
+    return blocks
+
+
+def compile_css(css: str, names: dict | None = None) -> str:
+    """Minify CSS, dropping rules that can't match `names` (see template_names()) when given."""
+    out = []
+    for prelude, body in parse_blocks(COMMENT_RE.sub("", css)):
+        if body is None:
+            out.append(collapse(prelude) + ";")
+        elif prelude.lower().startswith(GROUPING_AT_RULES):
+            inner = compile_css(body, names)
+            if inner:
+                out.append(f"{collapse(prelude)}{{{inner}}}")
+        elif prelude.startswith("@"):
+            # @page, @font-face, @keyframes, ...: keep, just minified
+            inner = collapse(body) if "{" in body else minify_declarations(body)
+            out.append(f"{collapse(prelude)}{{{inner}}}")
+        else:
+            selectors = [collapse(s) for s in split_top_level(prelude, ",")]
+            if names is not None:
+                selectors = [s for s in selectors if selector_used(s, names)]
+            declarations = minify_declarations(body)
+            if selectors and declarations:
+                out.append(f"{','.join(selectors)}{{{declarations}}}")
+    return "".join(out)
+
+
+def compile_stylesheet(css_path: str | Path, template_path: str | Path | None = None) -> str:
+    """Return the minified (and, given a template, unused-rule-stripped) stylesheet, cached by content hash."""
+    key = digest("css-inline", file_digest(css_path), file_digest(template_path) if template_path else "")
+    render_cache = get_render_cache()
+    cached = render_cache.get(key)
+    if cached is not None:
+        return cached.decode("utf-8")
+
+    names = template_names(Path(template_path).read_text(encoding="utf-8")) if template_path else None
+    css = compile_css(Path(css_path).read_text(encoding="utf-8"), names)
+    render_cache.put(key, css.encode("utf-8"))
+    return css
+
+
+def inline_stylesheet(html: str, css: str) -> str:
+    """Replace the stylesheet <link> in `html` with a <style> element holding `css`."""
+    # A function replacement, so backslashes in the CSS aren't treated as escapes
+    return re.sub(
+        r'<link[^>]+href="[^"]+\.css"[^>]*>',
+        lambda _: f"<style>{css}</style>",
+        html,
+        count=1,
+        flags=re.IGNORECASE
+    )
+
+
+def inline_variant_css(html: str, variant: dict) -> str:
+    """Inline a variant's compiled stylesheet into its rendered HTML."""
+    if not STYLESHEET_RE.search(html):
+        return html
+    return inline_stylesheet(html, compile_stylesheet(variant["css"], variant["template"]))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python css_inline.py STYLESHEET [TEMPLATE]")
+        sys.exit(1)
+    css_path = sys.argv[1]
+    template_path = sys.argv[2] if len(sys.argv) > 2 else None
+    original = Path(css_path).read_text(encoding="utf-8")
+    minified = compile_css(original)
+    compiled = compile_stylesheet(css_path, template_path)
+    print(f"✓ {css_path}: {len(original.encode())} bytes")
+    print(f"  minified:         {len(minified.encode())} bytes")
+    if template_path:
+        print(f"  unused stripped:  {len(compiled.encode())} bytes (against {template_path})")
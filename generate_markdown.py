@@ -7,38 +7,43 @@ Usage:
     pip install pyyaml
 
     python generate_markdown.py
-
-This will read resume.yaml (or resume.json if YAML not found) and produce resume.md
+    python generate_markdown.py --force   # ignore the build cache
+    python generate_markdown.py --profile # per-stage timings (see profiling.py)
+
+This will read resume.yaml (or resume.json if YAML not found) and produce resume.md.
+
+The document is built by a pipeline of per-section renderers (SECTION_RENDERERS)
+that yield lines; iter_markdown() yields one chunk per section and
+write_markdown() streams those chunks straight into a file or socket, so memory
+stays flat however many resumes are generated. A SectionCache re-renders only
+the sections whose data changed; the CLI keeps it in
+.resume-cache/markdown_sections.json, so an edit to one job re-renders only
+the experience section.
+resume.md is skipped when neither the resume data nor this generator changed
+since the last run (see build_cache.py).
 """
 
+import argparse
 import json
-import yaml
+import profiling
 from pathlib import Path
+from typing import Iterator, TextIO
+from build_cache import CACHE_DIR, BuildCache, canonical_data, canonical_digest, digest, file_digest
+from resume_loader import find_resume_file, load_resume_file
+from resume_diff import changed_keys
+from resume_schema import check_resume
+from profiling import span
 
 
-def load_resume_data():
-    """Load resume data from YAML or JSON file."""
-    yaml_path = Path("resume.yaml")
-    json_path = Path("resume.json")
-
-    if yaml_path.exists():
-        content = yaml_path.read_text(encoding='utf-8')
-        return yaml.safe_load(content)
-    elif json_path.exists():
-        with open(json_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    else:
-        raise FileNotFoundError("Neither resume.yaml nor resume.json found")
-
+# Section chunks kept between runs (see SectionCache)
+SECTIONS_PATH = CACHE_DIR / "markdown_sections.json"
 
-def generate_markdown(data: dict) -> str:
-    """Generate beautifully formatted markdown from resume data."""
-    md = []
 
-    # Header
-    md.append(f"# {data.get('name', 'Resume')}")
+def render_header(data: dict) -> Iterator[str]:
+    """Name, tagline, contact details and links."""
+    yield f"# {data.get('name', 'Resume')}"
     if data.get('tagline'):
-        md.append(f"**{data['tagline']}**\n")
+        yield f"**{data['tagline']}**\n"
 
     # Contact Info
     contact = data.get('contact', {})
@@ -51,11 +56,10 @@ def generate_markdown(data: dict) -> str:
         contact_parts.append(f"📍 {contact['address']}")
 
     if contact_parts:
-        md.append(" | ".join(contact_parts))
+        yield " | ".join(contact_parts)
 
     link_parts = []
     if contact.get('linkedin'):
-        md_link = contact['linkedin'].replace('https://', '').replace('http://', '')
         link_parts.append(f"[LinkedIn]({contact['linkedin']})")
     if contact.get('github'):
         link_parts.append(f"[GitHub]({contact['github']})")
@@ -63,140 +67,289 @@ def generate_markdown(data: dict) -> str:
         link_parts.append(f"[Website]({contact['website']})")
 
     if link_parts:
-        md.append(" | ".join(link_parts))
+        yield " | ".join(link_parts)
 
-    md.append("\n---\n")
+    yield "\n---\n"
 
-    # Summary
+
+def render_summary(data: dict) -> Iterator[str]:
+    """Summary paragraph."""
     if data.get('summary'):
-        md.append("## Summary\n")
-        md.append(f"{data['summary']}\n")
-        md.append("---\n")
+        yield "## Summary\n"
+        yield f"{data['summary']}\n"
+        yield "---\n"
+
 
-    # Core Competencies (Soft Skills)
+def render_soft_skills(data: dict) -> Iterator[str]:
+    """Core Competencies (soft skills)."""
     if data.get('soft_skills'):
-        md.append("## Core Competencies\n")
+        yield "## Core Competencies\n"
         for skill in data['soft_skills']:
-            md.append(f"- {skill}")
-        md.append("\n---\n")
+            yield f"- {skill}"
+        yield "\n---\n"
 
-    # Technical Skills
+
+def render_technical_skills(data: dict) -> Iterator[str]:
+    """Technical Skills."""
     if data.get('technical_skills'):
-        md.append("## Technical Skills\n")
+        yield "## Technical Skills\n"
         for skill in data['technical_skills']:
-            md.append(f"- {skill}")
-        md.append("\n---\n")
-
-    # Experience
-    if data.get('experience'):
-        md.append("## Experience\n")
-        for job in data['experience']:
-            md.append(f"### {job.get('role', 'Role')}")
-
-            job_meta = []
-            if job.get('company'):
-                job_meta.append(f"**{job['company']}**")
-            if job.get('location'):
-                job_meta.append(job['location'])
-
-            date_range = []
-            if job.get('start'):
-                date_range.append(job['start'])
-            if job.get('end'):
-                date_range.append(job['end'])
-            if date_range:
-                job_meta.append(" - ".join(date_range))
-
-            if job_meta:
-                md.append(" | ".join(job_meta) + "\n")
-
-            if job.get('bullets'):
-                for bullet in job['bullets']:
-                    md.append(f"- {bullet}")
-
-            md.append("")  # Empty line between jobs
-
-        md.append("---\n")
-
-    # Speaking Engagements
-    if data.get('speaking_engagements'):
-        md.append("## Speaking Engagements\n")
-        for talk in data['speaking_engagements']:
-            title = talk.get('title', 'Talk')
-            event = talk.get('event', '')
-            if event:
-                md.append(f"- **{title}** — {event}")
-            else:
-                md.append(f"- **{title}**")
-        md.append("\n---\n")
-
-    # Publications
-    if data.get('publications'):
-        md.append("## Publications\n")
-        for pub in data['publications']:
-            title = pub.get('title', 'Publication')
-            publication = pub.get('publication', '')
-            description = pub.get('description', '')
-            url = pub.get('url', '')
-
-            if url:
-                md.append(f"### [{title}]({url})")
-            else:
-                md.append(f"### {title}")
-
-            if publication:
-                md.append(f"**{publication}**\n")
-
-            if description:
-                md.append(f"{description}\n")
-
-            md.append("")  # Empty line between publications
-
-        md.append("---\n")
-
-    # Education
-    if data.get('education'):
-        md.append("## Education\n")
-        for edu in data['education']:
-            degree = edu.get('degree', 'Degree')
-            school = edu.get('school', '')
-            location = edu.get('location', '')
-
-            md.append(f"### {degree}")
-
-            edu_meta = []
-            if school:
-                edu_meta.append(f"**{school}**")
-            if location:
-                edu_meta.append(location)
-
-            date_range = []
-            if edu.get('start'):
-                date_range.append(edu['start'])
-            if edu.get('end'):
-                date_range.append(edu['end'])
-            if date_range:
-                edu_meta.append(" - ".join(date_range))
-
-            if edu_meta:
-                md.append(" | ".join(edu_meta) + "\n")
-
-            if edu.get('notes'):
-                md.append(f"_{edu['notes']}_\n")
-
-    return "\n".join(md)
+            yield f"- {skill}"
+        yield "\n---\n"
+
+
+def render_experience(data: dict) -> Iterator[str]:
+    """Experience, one subsection per job."""
+    if not data.get('experience'):
+        return
+    yield "## Experience\n"
+    for job in data['experience']:
+        yield f"### {job.get('role', 'Role')}"
+
+        job_meta = []
+        if job.get('company'):
+            job_meta.append(f"**{job['company']}**")
+        if job.get('location'):
+            job_meta.append(job['location'])
+
+        date_range = []
+        if job.get('start'):
+            date_range.append(job['start'])
+        if job.get('end'):
+            date_range.append(job['end'])
+        if date_range:
+            job_meta.append(" - ".join(date_range))
+
+        if job_meta:
+            yield " | ".join(job_meta) + "\n"
+
+        if job.get('bullets'):
+            for bullet in job['bullets']:
+                yield f"- {bullet}"
+
+        yield ""  # Empty line between jobs
+
+    yield "---\n"
+
+
+def render_speaking(data: dict) -> Iterator[str]:
+    """Speaking Engagements."""
+    if not data.get('speaking_engagements'):
+        return
+    yield "## Speaking Engagements\n"
+    for talk in data['speaking_engagements']:
+        title = talk.get('title', 'Talk')
+        event = talk.get('event', '')
+        if event:
+            yield f"- **{title}** — {event}"
+        else:
+            yield f"- **{title}**"
+    yield "\n---\n"
+
+
+def render_publications(data: dict) -> Iterator[str]:
+    """Publications."""
+    if not data.get('publications'):
+        return
+    yield "## Publications\n"
+    for pub in data['publications']:
+        title = pub.get('title', 'Publication')
+        publication = pub.get('publication', '')
+        description = pub.get('description', '')
+        url = pub.get('url', '')
+
+        if url:
+            yield f"### [{title}]({url})"
+        else:
+            yield f"### {title}"
+
+        if publication:
+            yield f"**{publication}**\n"
+
+        if description:
+            yield f"{description}\n"
+
+        yield ""  # Empty line between publications
+
+    yield "---\n"
+
+
+def render_education(data: dict) -> Iterator[str]:
+    """Education."""
+    if not data.get('education'):
+        return
+    yield "## Education\n"
+    for edu in data['education']:
+        degree = edu.get('degree', 'Degree')
+        school = edu.get('school', '')
+        location = edu.get('location', '')
+
+        yield f"### {degree}"
+
+        edu_meta = []
+        if school:
+            edu_meta.append(f"**{school}**")
+        if location:
+            edu_meta.append(location)
+
+        date_range = []
+        if edu.get('start'):
+            date_range.append(edu['start'])
+        if edu.get('end'):
+            date_range.append(edu['end'])
+        if date_range:
+            edu_meta.append(" - ".join(date_range))
+
+        if edu_meta:
+            yield " | ".join(edu_meta) + "\n"
+
+        if edu.get('notes'):
+            yield f"_{edu['notes']}_\n"
+
+
+# Document order: (section name, top-level keys it reads, renderer yielding lines).
+# Insert/replace entries (or pass your own list) to plug in new sections.
+SECTION_RENDERERS = [
+    ("header", ("name", "tagline", "contact"), render_header),
+    ("summary", ("summary",), render_summary),
+    ("soft_skills", ("soft_skills",), render_soft_skills),
+    ("technical_skills", ("technical_skills",), render_technical_skills),
+    ("experience", ("experience",), render_experience),
+    ("speaking_engagements", ("speaking_engagements",), render_speaking),
+    ("publications", ("publications",), render_publications),
+    ("education", ("education",), render_education),
+]
+
+
+class SectionCache:
+    """Rendered section chunks plus the (canonical) data they were rendered from.
+
+    Passing the same SectionCache to successive iter_markdown() calls re-renders
+    only the sections whose top-level keys changed (resume_diff.changed_keys).
+    save()/load() carry it across runs, so the CLI rewrites only the sections
+    an edit touched.
+    """
+
+    def __init__(self):
+        self.data = None
+        self.chunks = {}
+        self.rendered = []
+
+    def changed(self, data: dict) -> set[str] | None:
+        """Top-level keys that differ from the cached data (None: nothing cached yet)."""
+        return None if self.data is None else changed_keys(self.data, data)
+
+    def get(self, name: str, keys: tuple, changed: set[str] | None) -> str | None:
+        """Return the cached chunk for a section if none of its keys changed."""
+        if changed is None or changed.intersection(keys):
+            return None
+        return self.chunks.get(name)
+
+    def put(self, name: str, chunk: str):
+        """Store a freshly rendered chunk."""
+        self.chunks[name] = chunk
+        self.rendered.append(name)
+
+    @classmethod
+    def load(cls, path: str | Path = SECTIONS_PATH) -> "SectionCache":
+        """Load a saved cache (empty if missing, unreadable or from another generator version)."""
+        cache = cls()
+        try:
+            saved = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return cache
+        if saved.get("generator") == file_digest(__file__):
+            cache.data, cache.chunks = saved["data"], saved["chunks"]
+        return cache
+
+    def save(self, path: str | Path = SECTIONS_PATH):
+        """Write the cache for the next run."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        saved = {"generator": file_digest(__file__), "data": self.data, "chunks": self.chunks}
+        path.write_text(json.dumps(saved, ensure_ascii=False), encoding="utf-8")
+
+
+def iter_markdown(
+    data: dict,
+    renderers: list[tuple] = SECTION_RENDERERS,
+    cache: SectionCache | None = None
+) -> Iterator[str]:
+    """Yield the Markdown document one section chunk at a time.
+
+    Concatenating the chunks gives exactly generate_markdown(data).
+    """
+    if cache is not None:
+        canonical = canonical_data(data)
+        changed = cache.changed(canonical)
+        cache.rendered = []
+    first = True
+    for name, keys, renderer in renderers:
+        chunk = cache.get(name, keys, changed) if cache is not None else None
+        if chunk is None:
+            chunk = "\n".join(renderer(data))
+            if cache is not None:
+                cache.put(name, chunk)
+        # Sections with no lines contribute nothing (not even a separator)
+        if chunk:
+            yield chunk if first else "\n" + chunk
+            first = False
+    if cache is not None:
+        # Only once every chunk is current
+        cache.data = canonical
+
+
+def generate_markdown(data: dict) -> str:
+    """Generate beautifully formatted markdown from resume data."""
+    return "".join(iter_markdown(data))
+
+
+def write_markdown(data: dict, stream: TextIO, cache: SectionCache | None = None):
+    """Stream the Markdown document into a text file/socket, section by section."""
+    # Rendering and writing are interleaved, so they are timed as one span
+    with span("render_markdown"):
+        for chunk in iter_markdown(data, cache=cache):
+            stream.write(chunk)
 
 
 def save_markdown(content: str, output_path: str = "resume.md"):
     """Save markdown content to file."""
-    Path(output_path).write_text(content, encoding='utf-8')
+    with span("write", path=output_path):
+        Path(output_path).write_text(content, encoding='utf-8')
     print(f"✓ Generated beautiful markdown -> {output_path}")
 
 
+def markdown_cache_key(data: dict) -> str:
+    """Build-cache key for resume.md: resume data + this generator's source."""
+    return digest(canonical_digest(data), file_digest(__file__))
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a Markdown resume.")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="ignore the build cache and regenerate resume.md"
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.configure(args)
+
     try:
-        data = load_resume_data()
-        markdown = generate_markdown(data)
-        save_markdown(markdown)
+        resume_path = find_resume_file()
+        data = load_resume_file(resume_path)
+        check_resume(data, resume_path)
+        cache = BuildCache(enabled=not args.force)
+        key = markdown_cache_key(data)
+        if not cache.is_fresh("resume.md", key):
+            sections = SectionCache() if args.force else SectionCache.load()
+            with open("resume.md", "w", encoding="utf-8") as f:
+                write_markdown(data, f, sections)
+            sections.save()
+            rendered = ", ".join(sections.rendered) or "none"
+            print(f"✓ Generated beautiful markdown -> resume.md (sections re-rendered: {rendered})")
+            cache.record("resume.md", key)
+            cache.save()
+        cache.report()
     except Exception as e:
         print(f"Error: {e}")
@@ -9,108 +9,480 @@ Usage:
     pip install jinja2 playwright pyyaml
     playwright install chromium
 
-    python generate_resume.py
+    python generate_resume.py               # render all variants concurrently
+    python generate_resume.py --sequential  # render one variant at a time
+    python generate_resume.py --batch people/ --out build/ --workers 4
+    python generate_resume.py --profile     # per-stage timings (see profiling.py)
+    python generate_resume.py --inline-css  # self-contained HTML (see css_inline.py)
+    python generate_resume.py --fit-pages 1 # shrink spacing/fonts to fit (see page_fit.py)
+    python generate_resume.py --optimize-pdf  # smaller, linearized PDFs (see pdf_optimize.py)
+    python generate_resume.py --verify-ats  # check the ATS PDF's text layer (see ats_verify.py)
+    python generate_resume.py --no-history  # don't record a version (see resume_history.py)
 
 This will read resume.yaml (or resume.json) and produce:
     - resume.html / resume.pdf (visually appealing version)
     - resume_ats.html / resume_ats.pdf (ATS-optimized version)
+
+--batch renders every resume file in a directory against every variant in one
+process (see batch_render.py).
+
+Add an entry to VARIANTS to build another template alongside these two.
+Outputs whose inputs are unchanged since the last run are skipped (see
+build_cache.py); pass --force to regenerate everything. HTML and PDFs rendered
+before from the same inputs, by any run, are reused from the render cache (see
+render_cache.py) instead of being rendered again.
 """
 
-import json
-import yaml
+import argparse
+import asyncio
+import profiling
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from jinja2 import Template
-from playwright.sync_api import sync_playwright
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
+from build_cache import CACHE_DIR, BuildCache, canonical_digest, data_digest, digest, file_digest, text_digest
+from resume_loader import find_resume_file, load_resume_file
+from resume_schema import ResumeValidationError, check_resume
+from pdf_renderer import PDF_OPTIONS, AsyncPDFRenderer, PDFRenderer, get_renderer, shutdown_renderer
+from css_inline import inline_variant_css
+from page_fit import describe_fit, fit_pdf, fit_pdf_async
+from pdf_optimize import describe_savings, optimize_pdf_cached
+import pdf_optimize
+from profiling import span
+from render_cache import get_render_cache, linked_stylesheet
+from resume_history import history_enabled, record_build
 
 
-def load_resume_data() -> dict:
-    """Load resume data from YAML or JSON file."""
-    yaml_path = Path("resume.yaml")
-    json_path = Path("resume.json")
+# Every resume variant produced by a build: template -> HTML + PDF outputs
+VARIANTS = [
+    {
+        "name": "visual",
+        "template": "resume_template.html",
+        "css": "resume_style.css",
+        "html": "resume.html",
+        "pdf": "resume.pdf",
+    },
+    {
+        "name": "ats",
+        "template": "resume_template_ats.html",
+        "css": "resume_style_ats.css",
+        "html": "resume_ats.html",
+        "pdf": "resume_ats.pdf",
+    },
+]
 
-    if yaml_path.exists():
-        content = yaml_path.read_text(encoding='utf-8')
-        return yaml.safe_load(content)
-    elif json_path.exists():
-        with open(json_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    else:
-        raise FileNotFoundError("Neither resume.yaml nor resume.json found")
+
+# Compiled templates are also kept on disk so a fresh process skips compilation
+BYTECODE_CACHE_DIR = CACHE_DIR / "jinja"
+
+# Template directory -> shared Jinja2 Environment
+_environments = {}
+
+
+def get_environment(template_dir: str | Path = ".") -> Environment:
+    """Return the shared Jinja2 Environment for a template directory.
+
+    Templates are compiled once and kept in the Environment's in-process cache;
+    auto_reload recompiles a template only when its file's mtime changes, and
+    the bytecode cache lets new processes reuse the compiled code.
+    """
+    template_dir = Path(template_dir).resolve()
+    env = _environments.get(template_dir)
+    if env is None:
+        BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        env = Environment(
+            loader=FileSystemLoader(template_dir),
+            # Resume data is text, not markup (render_server.py renders untrusted data)
+            autoescape=select_autoescape(["html", "htm"]),
+            # Compiled code depends on autoescape, which the bytecode cache doesn't key on
+            bytecode_cache=FileSystemBytecodeCache(str(BYTECODE_CACHE_DIR), "autoescape-%s.cache"),
+            auto_reload=True,
+            cache_size=100
+        )
+        _environments[template_dir] = env
+    return env
 
 
 def load_template(template_path: str = "resume_template.html") -> Template:
-    """Load and return the Jinja2 template."""
-    template_content = Path(template_path).read_text(encoding='utf-8')
-    return Template(template_content)
+    """Load and return the (cached, compiled) Jinja2 template."""
+    template_path = Path(template_path)
+    return get_environment(template_path.parent).get_template(template_path.name)
+
+
+def write_output(path: str | Path, content: str | bytes):
+    """Write one rendered output file."""
+    with span("write", path=str(path)):
+        if isinstance(content, bytes):
+            Path(path).write_bytes(content)
+        else:
+            Path(path).write_text(content, encoding="utf-8")
 
 
 def save_html_and_pdf(
     data: dict,
     template: Template,
     html_path: str = "resume.html",
-    pdf_path: str = "resume.pdf"
+    pdf_path: str = "resume.pdf",
+    renderer: PDFRenderer | None = None
 ):
-    """Generate and save both HTML and PDF versions of the resume using Playwright."""
+    """Generate and save both HTML and PDF versions of the resume using Playwright.
+
+    PDFs are rendered through `renderer` (the shared process-wide renderer by
+    default), so Chromium is launched once per process rather than per PDF.
+    The PDF is rendered from the in-memory HTML while the HTML file is written
+    in a background thread.
+    """
+    variant = {
+        "name": Path(html_path).stem,
+        "template": template.filename,
+        "html": html_path,
+        "pdf": pdf_path,
+    }
+
     # Generate HTML
-    html_content = template.render(**data)
-    Path(html_path).write_text(html_content, encoding="utf-8")
-    print(f"Saved HTML -> {html_path}")
+    html_content = render_variant_html(data, variant, template)
+    writer = threading.Thread(target=write_output, args=(html_path, html_content))
+    writer.start()
 
     # Generate PDF using Playwright (Chromium browser engine)
-    with sync_playwright() as p:
-        browser = p.chromium.launch()
-        page = browser.new_page()
-
-        # Load the HTML file
-        page.goto(f'file://{Path(html_path).absolute()}')
-
-        # Wait for page to be fully loaded
-        page.wait_for_load_state('networkidle')
-
-        # Generate PDF with proper settings
-        page.pdf(
-            path=pdf_path,
-            format='A4',
-            margin={
-                'top': '10mm',
-                'right': '10mm',
-                'bottom': '10mm',
-                'left': '10mm'
-            },
-            print_background=True  # Include background colors/images
+    variant["css"] = linked_stylesheet(html_content, Path(html_path).parent)
+    write_output(pdf_path, render_variant_pdf(html_content, variant, renderer))
+
+    writer.join()
+    print(f"Saved HTML -> {html_path}")
+    print(f"Saved PDF  -> {pdf_path}")
+
+
+def html_cache_key(data: dict, variant: dict) -> str:
+    """Build-cache key for a variant's HTML: resume data (canonical) + template (+ inlined stylesheet)."""
+    # "autoescape" keeps HTML cached before templates escaped their data from being reused
+    key = digest(canonical_digest(data), file_digest(variant["template"]), "autoescape")
+    if variant.get("inline_css"):
+        key = digest(key, "inline-css", file_digest(variant["css"]))
+    return key
+
+
+def pdf_cache_key(html_content: str, variant: dict) -> str:
+    """Build-cache key for a variant's PDF: rendered HTML + stylesheet + PDF options (+ fit, optimization)."""
+    stylesheet = file_digest(variant["css"]) if variant.get("css") else "none"
+    key = digest(text_digest(html_content), stylesheet, data_digest(PDF_OPTIONS))
+    if variant.get("fit_pages"):
+        key = digest(key, f"fit-pages={variant['fit_pages']}")
+    if variant.get("optimize_pdf"):
+        key = digest(key, "optimize", pdf_optimize.OPTIMIZE_VERSION)
+    return key
+
+
+def render_variant_html(data: dict, variant: dict, template: Template | None = None) -> str:
+    """Render a variant's HTML, reusing the render cache's copy when there is one."""
+    template = template or load_template(variant["template"])
+    if template.filename is None:
+        # A template built from a string has nothing to key the cache on
+        with span("render_html", variant=variant["name"]):
+            return template.render(**data)
+
+    render_cache = get_render_cache()
+    key = html_cache_key(data, variant)
+    cached = render_cache.get(key)
+    if cached is not None:
+        return cached.decode("utf-8")
+    with span("render_html", variant=variant["name"]):
+        html_content = template.render(**data)
+    if variant.get("inline_css"):
+        with span("inline_css", variant=variant["name"]):
+            html_content = inline_variant_css(html_content, variant)
+    render_cache.put(key, html_content.encode("utf-8"))
+    return html_content
+
+
+def render_variant_pdf(html_content: str, variant: dict, renderer: PDFRenderer | None = None) -> bytes:
+    """Render a variant's PDF bytes, reusing the render cache's copy when there is one."""
+    render_cache = get_render_cache()
+    key = pdf_cache_key(html_content, variant)
+    pdf = render_cache.get(key)
+    if pdf is None and variant.get("optimize_pdf"):
+        # The unoptimized PDF has its own cache entry
+        original = render_variant_pdf(html_content, {**variant, "optimize_pdf": False}, renderer)
+        pdf = optimize_pdf_cached(original)
+        print(f"  [{variant['name']}] optimized PDF: {describe_savings(len(original), len(pdf))}")
+        render_cache.put(key, pdf)
+    elif pdf is None:
+        renderer = renderer or get_renderer()
+        base_dir = Path(variant["html"]).parent
+        if variant.get("fit_pages"):
+            pdf, result = fit_pdf(renderer, html_content, variant.get("css"), variant["fit_pages"], base_dir=base_dir)
+            print(f"  [{variant['name']}] {describe_fit(result, variant['fit_pages'])}")
+        else:
+            pdf = renderer.render_pdf(html_content, base_dir=base_dir)
+        render_cache.put(key, pdf)
+    return pdf
+
+
+async def render_variant_pdf_async(html_content: str, variant: dict, renderer: AsyncPDFRenderer) -> bytes:
+    """Async render_variant_pdf()."""
+    render_cache = get_render_cache()
+    key = pdf_cache_key(html_content, variant)
+    pdf = render_cache.get(key)
+    if pdf is None and variant.get("optimize_pdf"):
+        original = await render_variant_pdf_async(html_content, {**variant, "optimize_pdf": False}, renderer)
+        pdf = await asyncio.to_thread(optimize_pdf_cached, original)
+        print(f"  [{variant['name']}] optimized PDF: {describe_savings(len(original), len(pdf))}")
+        render_cache.put(key, pdf)
+    elif pdf is None:
+        base_dir = Path(variant["html"]).parent
+        if variant.get("fit_pages"):
+            pdf, result = await fit_pdf_async(
+                renderer, html_content, variant.get("css"), variant["fit_pages"], base_dir=base_dir
+            )
+            print(f"  [{variant['name']}] {describe_fit(result, variant['fit_pages'])}")
+        else:
+            pdf = await renderer.render_pdf(html_content, base_dir=base_dir)
+        render_cache.put(key, pdf)
+    return pdf
+
+
+async def save_variant_pdf_async(html_content: str, variant: dict, renderer: AsyncPDFRenderer):
+    """Render (or fetch from the render cache) a variant's PDF and write it to disk."""
+    pdf = await render_variant_pdf_async(html_content, variant, renderer)
+    await asyncio.to_thread(write_output, variant["pdf"], pdf)
+
+
+def prepare_variant_html(data: dict, variant: dict, cache: BuildCache) -> tuple[str, str | None, str | None]:
+    """Return (html_content, html_key, pdf_key) for a variant.
+
+    Up-to-date HTML is read back from disk instead of being re-rendered, and
+    the PDF counts as up to date only if that HTML and the stylesheet are unchanged.
+    A key is None when its output is up to date; otherwise the caller records
+    it in the cache once that output has been written.
+    """
+    html_path = Path(variant["html"])
+    html_key = html_cache_key(data, variant)
+    if cache.is_fresh(html_path, html_key):
+        html_content = html_path.read_text(encoding="utf-8")
+        html_key = None
+    else:
+        html_content = render_variant_html(data, variant)
+
+    pdf_key = pdf_cache_key(html_content, variant)
+    if cache.is_fresh(variant["pdf"], pdf_key):
+        pdf_key = None
+
+    return html_content, html_key, pdf_key
+
+
+def build_variant(
+    data: dict,
+    variant: dict,
+    renderer: PDFRenderer | None = None,
+    cache: BuildCache | None = None
+) -> float:
+    """Build one variant's HTML and PDF, skipping outputs the cache says are current.
+
+    Returns the elapsed seconds.
+    """
+    started = time.perf_counter()
+    cache = cache or BuildCache(enabled=False)
+    html_path = Path(variant["html"])
+    html_content, html_key, pdf_key = prepare_variant_html(data, variant, cache)
+
+    with ThreadPoolExecutor(max_workers=1) as writer:
+        html_written = writer.submit(write_output, html_path, html_content) if html_key else None
+        if pdf_key:
+            write_output(variant["pdf"], render_variant_pdf(html_content, variant, renderer))
+            cache.record(variant["pdf"], pdf_key)
+        if html_written is not None:
+            html_written.result()
+            cache.record(html_path, html_key)
+
+    elapsed = time.perf_counter() - started
+    print(f"  [{variant['name']}] {variant['html']} + {variant['pdf']} in {elapsed:.2f}s")
+    return elapsed
+
+
+async def build_variant_async(
+    data: dict,
+    variant: dict,
+    renderer: AsyncPDFRenderer,
+    cache: BuildCache | None = None
+) -> float:
+    """Async build_variant() rendering through an AsyncPDFRenderer; return elapsed seconds."""
+    started = time.perf_counter()
+    cache = cache or BuildCache(enabled=False)
+    html_path = Path(variant["html"])
+    html_content, html_key, pdf_key = prepare_variant_html(data, variant, cache)
+
+    async def save_html():
+        await asyncio.to_thread(write_output, html_path, html_content)
+        cache.record(html_path, html_key)
+
+    async def save_pdf():
+        await save_variant_pdf_async(html_content, variant, renderer)
+        cache.record(variant["pdf"], pdf_key)
+
+    jobs = []
+    if html_key:
+        jobs.append(save_html())
+    if pdf_key:
+        jobs.append(save_pdf())
+    await asyncio.gather(*jobs)
+
+    elapsed = time.perf_counter() - started
+    print(f"  [{variant['name']}] {variant['html']} + {variant['pdf']} in {elapsed:.2f}s")
+    return elapsed
+
+
+async def build_variants_async(
+    data: dict,
+    variants: list[dict] = VARIANTS,
+    cache: BuildCache | None = None
+) -> dict:
+    """Render all variants concurrently from one browser; return {name: seconds}.
+
+    Chromium is only launched if at least one PDF actually needs rendering.
+    """
+    async with AsyncPDFRenderer(pool_size=len(variants)) as renderer:
+        timings = await asyncio.gather(
+            *(build_variant_async(data, variant, renderer, cache) for variant in variants)
         )
+    return {variant["name"]: elapsed for variant, elapsed in zip(variants, timings)}
 
-        browser.close()
 
-    print(f"Saved PDF  -> {pdf_path}")
+def build_variants(
+    data: dict,
+    variants: list[dict] = VARIANTS,
+    cache: BuildCache | None = None
+) -> dict:
+    """Render all variants one after another; return {name: seconds}."""
+    timings = {}
+    for variant in variants:
+        print(f"Generating {variant['name']} version...")
+        timings[variant["name"]] = build_variant(data, variant, cache=cache)
+    # All variants shared one browser; close it now that we're done
+    shutdown_renderer()
+    return timings
 
 
 if __name__ == "__main__":
-    # Load resume data
-    resume_data = load_resume_data()
-
-    print("Generating visually appealing version...")
-    # Load visual template
-    template_visual = load_template("resume_template.html")
-    # Generate visual output files
-    save_html_and_pdf(
-        resume_data,
-        template_visual,
-        "resume.html",
-        "resume.pdf"
+    parser = argparse.ArgumentParser(description="Generate HTML and PDF resumes.")
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="render variants one at a time instead of concurrently"
     )
-
-    print("\nGenerating ATS-optimized version...")
-    # Load ATS template
-    template_ats = load_template("resume_template_ats.html")
-    # Generate ATS output files
-    save_html_and_pdf(
-        resume_data,
-        template_ats,
-        "resume_ats.html",
-        "resume_ats.pdf"
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="ignore the build cache and regenerate every output"
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="DIR",
+        help="render every .yaml/.yml/.json resume in DIR instead of resume.yaml"
+    )
+    parser.add_argument(
+        "--out",
+        metavar="DIR",
+        default="build",
+        help="output directory for --batch (default: build)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="resumes rendered concurrently in --batch mode (default: 4)"
+    )
+    parser.add_argument(
+        "--inline-css",
+        action="store_true",
+        help="inline each variant's minified stylesheet into its HTML"
+    )
+    parser.add_argument(
+        "--fit-pages",
+        type=int,
+        metavar="N",
+        help="shrink spacing, line height and font size until each PDF fits on N pages"
+    )
+    parser.add_argument(
+        "--optimize-pdf",
+        action="store_true",
+        help="recompress, strip metadata from and linearize each PDF (needs pikepdf)"
+    )
+    parser.add_argument(
+        "--verify-ats",
+        action="store_true",
+        help="after building, check the ATS PDF's text against the data and fail below --min-score (needs pypdf)"
     )
+    parser.add_argument(
+        "--min-score",
+        type=float,
+        default=95.0,
+        help="lowest ATS parse score --verify-ats accepts (default: 95)"
+    )
+    parser.add_argument(
+        "--no-history",
+        action="store_true",
+        help="don't record this resume in the version history (also RESUME_HISTORY=0)"
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.configure(args)
+    variants = [{**variant, "inline_css": True} for variant in VARIANTS] if args.inline_css else VARIANTS
+    if args.fit_pages:
+        variants = [{**variant, "fit_pages": args.fit_pages} for variant in variants]
+    if args.optimize_pdf:
+        if not pdf_optimize.available():
+            print("✗ --optimize-pdf needs pikepdf (pip install pikepdf)")
+            raise SystemExit(1)
+        variants = [{**variant, "optimize_pdf": True} for variant in variants]
+
+    if args.verify_ats:
+        import ats_verify
+        if ats_verify.PdfReader is None:
+            print("✗ --verify-ats needs pypdf (pip install pypdf)")
+            raise SystemExit(1)
+
+    if args.batch:
+        from batch_render import render_batch
+        status = render_batch(args.batch, args.out, workers=args.workers, force=args.force, variants=variants)
+        if args.verify_ats:
+            print("\nVerifying ATS PDFs...")
+            reports = ats_verify.verify(ats_verify.batch_pairs(args.batch, args.out), args.min_score, args.workers)
+            status = status or int(not all(ats_verify.passed(report, args.min_score) for report in reports))
+        raise SystemExit(status)
+
+    # Load and validate resume data before paying for any rendering
+    resume_path = find_resume_file()
+    resume_data = load_resume_file(resume_path)
+    try:
+        check_resume(resume_data, resume_path)
+    except ResumeValidationError as e:
+        print(f"✗ {e}")
+        raise SystemExit(1)
+    if history_enabled() and not args.no_history:
+        record_build(resume_data, resume_path)
+    cache = BuildCache(enabled=not args.force)
+    render_cache = get_render_cache()
+    render_cache.enabled = render_cache.enabled and not args.force
+
+    started = time.perf_counter()
+    if args.sequential:
+        timings = build_variants(resume_data, variants, cache=cache)
+    else:
+        print(f"Generating {len(variants)} resume versions concurrently...")
+        timings = asyncio.run(build_variants_async(resume_data, variants, cache=cache))
+    total = time.perf_counter() - started
+    cache.save()
+
+    print(f"\n✓ {len(timings)} resume versions generated in {total:.2f}s")
+    for name, elapsed in timings.items():
+        print(f"  {name:<10} {elapsed:.2f}s")
+    cache.report()
+    render_cache.prune()
+    render_cache.report()
 
-    print("\n✓ Both resume versions generated successfully!")
-    print("  Visual version uses modern CSS Grid layout")
-    print("  ATS version uses simple single-column layout")
+    if args.verify_ats:
+        print("\nVerifying ATS PDF...")
+        ats_pdf = next(variant["pdf"] for variant in variants if variant["name"] == "ats")
+        report = ats_verify.verify([(ats_pdf, str(resume_path))], args.min_score)[0]
+        raise SystemExit(0 if ats_verify.passed(report, args.min_score) else 1)
@@ -9,17 +9,20 @@ Usage:
     python json_to_markdown.py
 
 This will read resume_data.json and produce resume.md
+
+Set RESUME_PROFILE=1 to print per-stage timings (see profiling.py).
 """
 
-import json
+import profiling
 import yaml
 from pathlib import Path
+from profiling import span
+from resume_loader import load_resume_file
 
 
 def load_json(json_path: str = "resume_data.json") -> dict:
     """Load resume data from JSON file."""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_resume_file(json_path)
 
 
 def convert_to_markdown(data: dict) -> str:
@@ -48,11 +51,13 @@ def convert_to_markdown(data: dict) -> str:
 
 def save_markdown(markdown: str, md_path: str = "resume.md"):
     """Save markdown content to file."""
-    Path(md_path).write_text(markdown, encoding='utf-8')
+    with span("write", path=md_path):
+        Path(md_path).write_text(markdown, encoding='utf-8')
     print(f"✓ Converted to Markdown -> {md_path}")
 
 
 if __name__ == "__main__":
+    profiling.configure()
     try:
         resume_data = load_json()
         markdown_content = convert_to_markdown(resume_data)
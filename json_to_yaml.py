@@ -9,38 +9,44 @@ Usage:
     python json_to_yaml.py
 
 This will read resume.json and produce resume.yaml
+
+Set RESUME_PROFILE=1 to print per-stage timings (see profiling.py).
 """
 
-import json
+import profiling
 import yaml
 from pathlib import Path
+from profiling import span
+from resume_loader import load_resume_file
 
 
 def load_json(json_path: str = "resume.json") -> dict:
     """Load resume data from JSON file."""
-    with open(json_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return load_resume_file(json_path)
 
 
 def convert_to_yaml(data: dict) -> str:
     """Convert resume data to YAML format."""
-    yaml_content = yaml.dump(
-        data,
-        default_flow_style=False,
-        allow_unicode=True,
-        sort_keys=False,
-        indent=2
-    )
+    with span("render_yaml"):
+        yaml_content = yaml.dump(
+            data,
+            default_flow_style=False,
+            allow_unicode=True,
+            sort_keys=False,
+            indent=2
+        )
     return yaml_content
 
 
 def save_yaml(yaml_content: str, yaml_path: str = "resume.yaml"):
     """Save YAML content to file."""
-    Path(yaml_path).write_text(yaml_content, encoding='utf-8')
+    with span("write", path=yaml_path):
+        Path(yaml_path).write_text(yaml_content, encoding='utf-8')
     print(f"✓ Converted to YAML -> {yaml_path}")
 
 
 if __name__ == "__main__":
+    profiling.configure()
     try:
         resume_data = load_json()
         yaml_content = convert_to_yaml(resume_data)
@@ -1,7 +1,24 @@
 """
 markdown_to_json.py
 
-Convert a YAML frontmatter markdown file to JSON format.
+Convert a Markdown resume back to structured data / JSON format.
+
+Two Markdown flavours are understood, and told apart by the first line:
+    - YAML frontmatter files written by json_to_markdown.py
+      (---, YAML, ---, then a "## Summary" section)
+    - formatted resumes written by generate_markdown.py
+      (# Name, contact lines, then "## Experience", "## Education", ...)
+
+The parser is a single pass over the lines: each line is classified into a
+token (heading, bullet, rule, text or blank) and fed to a small state machine
+that fills in every section. Files are read line by line, so large files are
+streamed rather than loaded whole. The frontmatter ends at
+the first line that is exactly "---", so "---" inside a YAML string no longer
+breaks parsing.
+
+Round trip: regenerating Markdown from the parsed data reproduces the input
+(string values come back with surrounding whitespace stripped). See
+bench/markdown_roundtrip.py for the round-trip corpus and throughput benchmark.
 
 Usage:
     pip install pyyaml
@@ -9,63 +26,276 @@ Usage:
     python markdown_to_json.py
 
 This will read resume.md and produce resume_data.json
+
+Set RESUME_PROFILE=1 to print per-stage timings (see profiling.py).
 """
 
 import json
-import yaml
-from pathlib import Path
+import profiling
+import re
+from typing import Iterable
+from profiling import span
+from resume_loader import parse_yaml
 
 
-def parse_markdown_resume(md_path: str = "resume.md") -> dict:
-    """Parse a markdown file with YAML frontmatter and extract resume data."""
-    content = Path(md_path).read_text(encoding='utf-8')
+# "## Heading" -> data key, as written by generate_markdown.py
+SECTION_KEYS = {
+    "Summary": "summary",
+    "Core Competencies": "soft_skills",
+    "Technical Skills": "technical_skills",
+    "Experience": "experience",
+    "Speaking Engagements": "speaking_engagements",
+    "Publications": "publications",
+    "Education": "education",
+}
+
+CONTACT_PREFIXES = {"📧 ": "email", "📱 ": "phone", "📍 ": "address"}
+LINK_LABELS = {"LinkedIn": "linkedin", "GitHub": "github", "Website": "website"}
+
+BOLD_RE = re.compile(r"^\*\*(.+)\*\*$")
+ITALIC_RE = re.compile(r"^_(.+)_$")
+LINK_RE = re.compile(r"^\[(.+)\]\((.+)\)$")
+TALK_RE = re.compile(r"^\*\*(.+?)\*\*(?: — (.*))?$")
+
+# Token kinds ("---" is a RULE; on the first line it opens the frontmatter)
+RULE, BLANK, H1, H2, H3, BULLET, TEXT = (
+    "rule", "blank", "h1", "h2", "h3", "bullet", "text"
+)
+
+
+def tokenize_line(line: str) -> tuple[str, str]:
+    """Classify one line of Markdown as (token kind, payload)."""
+    line = line.rstrip("\r\n")
+    stripped = line.strip()
+    if stripped == "---":
+        return RULE, ""
+    if not stripped:
+        return BLANK, ""
+    if line.startswith("### "):
+        return H3, line[4:].strip()
+    if line.startswith("## "):
+        return H2, line[3:].strip()
+    if line.startswith("# "):
+        return H1, line[2:].strip()
+    if line.startswith("- "):
+        return BULLET, line[2:].strip()
+    return TEXT, stripped
+
+
+def split_meta(line: str) -> dict:
+    """Parse a '**Company** | Location | Start - End' line into fields.
+
+    The bold part is the organisation; of the plain parts, one containing
+    ' - ' is the date range and any other is the location.
+    """
+    fields = {}
+    plain = []
+    for part in line.split(" | "):
+        bold = BOLD_RE.match(part)
+        if bold and "name" not in fields:
+            fields["name"] = bold.group(1)
+        else:
+            plain.append(part)
+
+    if len(plain) >= 2:
+        fields["location"] = " | ".join(plain[:-1])
+        dates = plain[-1]
+    elif plain and " - " in plain[0]:
+        dates = plain[0]
+    else:
+        fields["location"] = plain[0] if plain else None
+        dates = None
+
+    if dates:
+        start, _, end = dates.partition(" - ")
+        fields["start"] = start
+        if end:
+            fields["end"] = end
+    return {key: value for key, value in fields.items() if value}
 
-    # Split the frontmatter from the markdown content
-    if not content.startswith('---'):
-        raise ValueError("Markdown file must start with YAML frontmatter (---)")
 
-    # Find the second --- that closes the frontmatter
-    parts = content.split('---', 2)
-    if len(parts) < 3:
-        raise ValueError("Invalid frontmatter format. Expected '---' to close frontmatter.")
+class MarkdownResumeParser:
+    """Single-pass state machine turning Markdown lines into resume data."""
 
-    # Parse the YAML frontmatter
-    frontmatter = parts[1].strip()
-    markdown_content = parts[2].strip()
+    def __init__(self):
+        self.data = {}
+        self.section = None
+        self.item = None          # current job/publication/degree dict
+        self.item_meta = False    # whether the current item's meta line was seen
+        self.text = []            # pending paragraph lines
+        self.frontmatter = None   # YAML lines while inside frontmatter
+        self.first_line = True
 
-    resume_data = yaml.safe_load(frontmatter)
+    def feed(self, line: str):
+        """Consume one line."""
+        kind, value = tokenize_line(line)
 
-    # Extract summary from markdown if present
-    if markdown_content:
-        # Look for a "## Summary" section
-        lines = markdown_content.split('\n')
-        summary_lines = []
-        in_summary = False
+        if self.first_line:
+            self.first_line = False
+            if kind == RULE:
+                self.frontmatter = []
+                return
 
-        for line in lines:
-            if line.strip().startswith('## Summary'):
-                in_summary = True
-                continue
-            elif line.strip().startswith('##') and in_summary:
-                # Hit another section, stop collecting summary
-                break
-            elif in_summary and line.strip():
-                summary_lines.append(line.strip())
+        if self.frontmatter is not None:
+            # Only an unindented "---" closes it; indented ones belong to YAML strings
+            if line.rstrip("\r\n") == "---":
+                self.data.update(parse_yaml("\n".join(self.frontmatter)) or {})
+                self.frontmatter = None
+            else:
+                self.frontmatter.append(line.rstrip("\r\n"))
+            return
 
-        if summary_lines:
-            resume_data['summary'] = ' '.join(summary_lines)
+        if kind in (H1, H2, RULE):
+            self._flush()
 
-    return resume_data
+        if kind == H1:
+            self.data["name"] = value
+            self.section = "header"
+        elif kind == H2:
+            self.section = SECTION_KEYS.get(value, "unknown")
+            self.item = None
+        elif kind == RULE:
+            self.section = None if self.section != "header" else "header_done"
+        elif self.section == "header":
+            self._feed_header(kind, value)
+        elif self.section == "summary":
+            self.text.append(value)
+        elif self.section in ("soft_skills", "technical_skills"):
+            if kind == BULLET:
+                self.data.setdefault(self.section, []).append(value)
+        elif self.section == "speaking_engagements":
+            self._feed_talk(kind, value)
+        elif self.section in ("experience", "publications", "education"):
+            self._feed_item(kind, value)
+
+    def _feed_header(self, kind: str, value: str):
+        """Tagline, contact line and links line under the H1."""
+        if kind != TEXT:
+            return
+        parts = value.split(" | ")
+        bold = BOLD_RE.match(value)
+        if all(LINK_RE.match(part) for part in parts):
+            contact = self.data.setdefault("contact", {})
+            for part in parts:
+                label, url = LINK_RE.match(part).groups()
+                contact[LINK_LABELS.get(label, label.lower())] = url
+        elif any(part.startswith(prefix) for part in parts for prefix in CONTACT_PREFIXES):
+            contact = self.data.setdefault("contact", {})
+            for part in parts:
+                for prefix, key in CONTACT_PREFIXES.items():
+                    if part.startswith(prefix):
+                        contact[key] = part[len(prefix):]
+        elif bold and "tagline" not in self.data:
+            self.data["tagline"] = bold.group(1)
+
+    def _feed_talk(self, kind: str, value: str):
+        """'- **Title** — Event' bullets."""
+        if kind != BULLET:
+            return
+        match = TALK_RE.match(value)
+        talk = {"title": match.group(1)} if match else {"title": value}
+        if match and match.group(2):
+            talk["event"] = match.group(2)
+        self.data.setdefault("speaking_engagements", []).append(talk)
+
+    def _feed_item(self, kind: str, value: str):
+        """Jobs, publications and degrees: an H3 followed by details."""
+        if kind == H3:
+            self._flush()
+            self.item = self._new_item(value)
+            self.item_meta = False
+            self.data.setdefault(self.section, []).append(self.item)
+            return
+        if self.item is None:
+            return
+
+        if self.section == "experience":
+            if kind == BULLET:
+                self.item.setdefault("bullets", []).append(value)
+            elif kind == TEXT and not self.item_meta:
+                self.item_meta = True
+                meta = split_meta(value)
+                if "name" in meta:
+                    self.item["company"] = meta.pop("name")
+                self.item.update(meta)
+        elif self.section == "publications":
+            bold = BOLD_RE.match(value)
+            if kind == TEXT and bold and not self.item_meta and not self.text:
+                self.item_meta = True
+                self.item["publication"] = bold.group(1)
+            elif kind in (TEXT, BULLET):
+                self.text.append(value if kind == TEXT else f"- {value}")
+            elif kind == BLANK and self.text:
+                self.text.append("")
+        elif self.section == "education":
+            italic = ITALIC_RE.match(value)
+            if kind == TEXT and italic:
+                self.item["notes"] = italic.group(1)
+            elif kind == TEXT and not self.item_meta:
+                self.item_meta = True
+                meta = split_meta(value)
+                if "name" in meta:
+                    self.item["school"] = meta.pop("name")
+                self.item.update(meta)
+
+    def _new_item(self, heading: str) -> dict:
+        """Start a job/publication/degree from its H3 text."""
+        if self.section == "experience":
+            return {"role": heading}
+        if self.section == "education":
+            return {"degree": heading}
+        link = LINK_RE.match(heading)
+        if link:
+            return {"title": link.group(1), "url": link.group(2)}
+        return {"title": heading}
+
+    def _flush(self):
+        """Store any pending paragraph text (summary / publication description)."""
+        text = "\n".join(self.text).strip()
+        self.text = []
+        if not text:
+            return
+        if self.section == "summary":
+            self.data["summary"] = text
+        elif self.section == "publications" and self.item is not None:
+            self.item["description"] = text
+
+    def close(self) -> dict:
+        """Finish parsing and return the resume data."""
+        if self.frontmatter is not None:
+            raise ValueError("Invalid frontmatter format. Expected '---' to close frontmatter.")
+        self._flush()
+        return self.data
+
+
+def parse_markdown_lines(lines: Iterable[str]) -> dict:
+    """Parse an iterable of Markdown lines (e.g. an open file) into resume data."""
+    parser = MarkdownResumeParser()
+    for line in lines:
+        parser.feed(line)
+    return parser.close()
+
+
+def parse_markdown_text(content: str) -> dict:
+    """Parse a Markdown string into resume data."""
+    return parse_markdown_lines(content.splitlines())
+
+
+def parse_markdown_resume(md_path: str = "resume.md") -> dict:
+    """Parse a markdown resume file (streamed line by line) and extract resume data."""
+    with span("load", path=md_path), open(md_path, 'r', encoding='utf-8') as f:
+        return parse_markdown_lines(f)
 
 
 def save_json(data: dict, json_path: str = "resume_data.json"):
     """Save resume data as JSON."""
-    with open(json_path, 'w', encoding='utf-8') as f:
+    with span("write", path=json_path), open(json_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=4, ensure_ascii=False)
     print(f"✓ Converted to JSON -> {json_path}")
 
 
 if __name__ == "__main__":
+    profiling.configure()
     try:
         resume_data = parse_markdown_resume()
         save_json(resume_data)
@@ -0,0 +1,342 @@
+"""
+page_fit.py
+
+Fit a resume onto a page budget (one page, two pages, ...) without hand-editing
+the stylesheet.
+
+The variant's stylesheet is turned into an override sheet in which every
+font-size, line-height and margin/padding/gap is multiplied by one of three CSS
+variables:
+    --fit-space   margins, padding and gaps   (shrunk first, down to 0.5)
+    --fit-line    line heights                (then, down to 0.85)
+    --fit-font    font sizes                  (last, down to 0.8)
+The HTML is loaded once into a warm page from the PDF renderer's pool, laid out
+as print media at the printable page size, and a script inside the page
+binary-searches the variables, one at a time in that order, re-measuring the
+content height after each change. Only the final layout is printed to PDF; if
+Chromium's page breaks still spill onto an extra page, the search is repeated
+against a slightly smaller budget.
+
+Usage:
+    python generate_resume.py --fit-pages 1
+
+    from page_fit import fit_pdf
+
+    with PDFRenderer() as renderer:
+        pdf, result = fit_pdf(renderer, html, "resume_style.css", pages=1)
+    print(describe_fit(result, pages=1))
+
+    python page_fit.py --check   # a short resume must fit one page unscaled
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+from css_inline import COMMENT_RE, GROUPING_AT_RULES, collapse, parse_blocks, split_top_level
+from pdf_renderer import PDF_OPTIONS, with_base_href
+from profiling import span
+
+
+# Searched in this order, each from 1.0 down to its floor
+FIT_VARIABLES = [("--fit-space", 0.5), ("--fit-line", 0.85), ("--fit-font", 0.8)]
+
+SCALED_PROPERTIES = {
+    "font-size": "--fit-font",
+    "line-height": "--fit-line",
+}
+SPACING_PROPERTIES = ("margin", "padding", "gap", "row-gap", "column-gap")
+
+# Stop bisecting once a variable is known to within this much
+PRECISION = 0.01
+
+# Data for --check: far shorter than a page, so it must fit without scaling
+SHORT_RESUME = {
+    "name": "Jane Doe",
+    "tagline": "Engineer",
+    "contact": {"email": "jane@example.com"},
+    "summary": "Builds things.",
+    "experience": [{"role": "Engineer", "company": "Acme", "start": "2020", "end": "Present", "bullets": ["Shipped it."]}],
+}
+
+# Page breaks can add space the measured height doesn't show: each retry
+# shrinks the budget by this fraction
+BREAK_SLACK = 0.02
+MAX_ATTEMPTS = 3
+
+PAGE_SIZES_MM = {"a4": (210, 297), "letter": (215.9, 279.4), "legal": (215.9, 355.6), "a5": (148, 210)}
+MM_PER_UNIT = {"mm": 1, "cm": 10, "in": 25.4, "pt": 25.4 / 72, "px": 25.4 / 96}
+PX_PER_MM = 96 / 25.4
+
+LENGTH_RE = re.compile(r"(?<![\w.#-])(\d*\.?\d+)(px|pt|mm|cm|in|em|rem|%)?(?![\w%(])")
+
+FIT_SCRIPT = """
+async ({variables, budget, precision}) => {
+    const style = document.documentElement.style;
+    const values = {};
+    let passes = 0;
+    // Content height, not scrollHeight: that is never less than the viewport
+    const measure = () => {
+        passes++;
+        const body = document.body;
+        return body.getBoundingClientRect().bottom + window.scrollY
+            + parseFloat(getComputedStyle(body).marginBottom);
+    };
+    const set = (name, value) => { values[name] = value; style.setProperty(name, String(value)); };
+
+    await document.fonts.ready;
+    for (const [name] of variables) set(name, 1);
+    if (measure() <= budget) return {values, passes, height: measure(), fits: true};
+
+    for (const [name, floor] of variables) {
+        set(name, floor);
+        if (measure() > budget) continue;
+        // floor fits, 1.0 doesn't: find the largest value that still fits
+        let low = floor, high = 1;
+        while (high - low > precision) {
+            const middle = (low + high) / 2;
+            set(name, middle);
+            if (measure() <= budget) low = middle; else high = middle;
+        }
+        set(name, Math.round(low * 1000) / 1000);
+        return {values, passes, height: measure(), fits: true};
+    }
+    return {values, passes, height: measure(), fits: false};
+}
+"""
+
+
+def scale_value(value: str, variable: str, unitless: bool = False) -> str | None:
+    """Multiply each non-zero length in a CSS value by var(`variable`); None if nothing to scale."""
+    value, important, _ = value.partition("!")
+
+    def scale(match):
+        number, unit = match.groups()
+        if float(number) == 0 or (unit is None and not unitless):
+            return match.group()
+        return f"calc({match.group()} * var({variable}, 1))"
+
+    scaled = LENGTH_RE.sub(scale, value.strip())
+    if scaled == value.strip():
+        return None
+    return scaled + (" !important" if important else "")
+
+
+def scale_declarations(body: str) -> str:
+    """Return the scaled copies of a rule's font-size, line-height and spacing declarations."""
+    declarations = []
+    for declaration in split_top_level(body, ";"):
+        name, colon, value = declaration.partition(":")
+        name = name.strip().lower()
+        if not colon:
+            continue
+        if name in SCALED_PROPERTIES:
+            scaled = scale_value(value, SCALED_PROPERTIES[name], unitless=name == "line-height")
+        elif name.startswith(SPACING_PROPERTIES):
+            scaled = scale_value(value, "--fit-space")
+        else:
+            continue
+        if scaled is not None:
+            declarations.append(f"{name}:{scaled}")
+    return ";".join(declarations)
+
+
+def fit_overrides(css: str) -> str:
+    """Build the override stylesheet that ties `css`'s sizes to the --fit-* variables."""
+    out = []
+    for prelude, body in parse_blocks(COMMENT_RE.sub("", css)):
+        if body is None:
+            continue
+        if prelude.lower().startswith(GROUPING_AT_RULES):
+            inner = fit_overrides(body)
+            if inner:
+                out.append(f"{collapse(prelude)}{{{inner}}}")
+        elif not prelude.startswith("@"):
+            # @page margins stay fixed: they define the page budget
+            declarations = scale_declarations(body)
+            if declarations:
+                out.append(f"{collapse(prelude)}{{{declarations}}}")
+    return "".join(out)
+
+
+def with_fit_overrides(html: str, overrides: str) -> str:
+    """Append the override stylesheet at the end of <head>, after the variant's own styles."""
+    style = f'<style id="page-fit">{overrides}</style>'
+    head_end = re.search(r"</head>", html, re.IGNORECASE)
+    if head_end is None:
+        return style + html
+    return html[:head_end.start()] + style + html[head_end.start():]
+
+
+def to_mm(length: str) -> float:
+    """Convert a CSS length such as '10mm' or '0.5in' to millimetres."""
+    match = re.fullmatch(r"\s*(\d*\.?\d+)\s*([a-z]*)\s*", length)
+    if match is None:
+        raise ValueError(f"unsupported length: {length!r}")
+    number, unit = match.groups()
+    return float(number) * MM_PER_UNIT.get(unit or "px", MM_PER_UNIT["px"])
+
+
+def expand_sides(values: list[float]) -> tuple[float, float, float, float]:
+    """Expand a 1-4 value CSS shorthand (margin: 10mm 5mm) to (top, right, bottom, left)."""
+    top = values[0]
+    right = values[1] if len(values) > 1 else top
+    bottom = values[2] if len(values) > 2 else top
+    left = values[3] if len(values) > 3 else right
+    return top, right, bottom, left
+
+
+def page_geometry(css: str, options: dict = PDF_OPTIONS) -> tuple[float, float]:
+    """Return the printable (width, height) of one page in CSS pixels.
+
+    The page size comes from the PDF options' format; margins from the
+    stylesheet's @page rule, which Chromium prefers, else the PDF options.
+    """
+    width, height = PAGE_SIZES_MM[options.get("format", "A4").lower()]
+    margin = options.get("margin", {})
+    top, right, bottom, left = (to_mm(margin.get(side, "0")) for side in ("top", "right", "bottom", "left"))
+
+    for prelude, body in parse_blocks(COMMENT_RE.sub("", css)):
+        if prelude.lower() == "@page" and body:
+            for declaration in split_top_level(body, ";"):
+                name, _, value = declaration.partition(":")
+                if name.strip().lower() == "margin":
+                    top, right, bottom, left = expand_sides([to_mm(part) for part in value.split()])
+    return (width - left - right) * PX_PER_MM, (height - top - bottom) * PX_PER_MM
+
+
+def count_pdf_pages(pdf: bytes) -> int | None:
+    """Count the page objects in a PDF (None if they're hidden in compressed object streams)."""
+    return len(re.findall(rb"/Type\s*/Page(?![a-zA-Z])", pdf)) or None
+
+
+def fit_arguments(pages: int, page_height: float, attempt: int) -> dict:
+    """Arguments for FIT_SCRIPT on the given retry."""
+    return {
+        "variables": FIT_VARIABLES,
+        "budget": pages * page_height * (1 - BREAK_SLACK * attempt),
+        "precision": PRECISION,
+    }
+
+
+def spills(result: dict, pdf: bytes, pages: int) -> bool:
+    """Record the printed page count in `result`; return whether it's over the budget."""
+    result["pdf_pages"] = count_pdf_pages(pdf)
+    spilled = result["pdf_pages"] is not None and result["pdf_pages"] > pages
+    result["fits"] = result["fits"] and not spilled
+    return spilled
+
+
+def prepare(html: str, css_path: str | Path | None, options: dict | None) -> tuple[str, dict, tuple]:
+    """Return (html with overrides, PDF options, printable page size) for a fit."""
+    css = Path(css_path).read_text(encoding="utf-8") if css_path else ""
+    pdf_options = {**PDF_OPTIONS, **(options or {})}
+    return with_fit_overrides(html, fit_overrides(css)), pdf_options, page_geometry(css, pdf_options)
+
+
+def fit_pdf(
+    renderer,
+    html: str,
+    css_path: str | Path | None,
+    pages: int = 1,
+    options: dict | None = None,
+    base_dir: str | Path = "."
+) -> tuple[bytes, dict]:
+    """Render `html` to a PDF of at most `pages` pages; return (pdf bytes, fit result).
+
+    The result holds the chosen variable values, the number of layout passes,
+    the measured height, the printed page count and whether it fits.
+    """
+    html, pdf_options, (width, height) = prepare(html, css_path, options)
+    with span("page_fit", pages=pages), renderer.borrowed_page() as page:
+        viewport = page.viewport_size
+        page.set_viewport_size({"width": round(width), "height": round(height)})
+        page.emulate_media(media="print")
+        try:
+            with span("set_content"):
+                page.set_content(with_base_href(html, base_dir), wait_until="load")
+            for attempt in range(MAX_ATTEMPTS):
+                with span("fit_search"):
+                    result = page.evaluate(FIT_SCRIPT, fit_arguments(pages, height, attempt))
+                with span("print_pdf"):
+                    pdf = page.pdf(**pdf_options)
+                # Retrying only helps if the search found room to shrink
+                searched_fit = result["fits"]
+                if not spills(result, pdf, pages) or not searched_fit:
+                    break
+        finally:
+            page.emulate_media(media="null")
+            if viewport:
+                page.set_viewport_size(viewport)
+    return pdf, result
+
+
+async def fit_pdf_async(
+    renderer,
+    html: str,
+    css_path: str | Path | None,
+    pages: int = 1,
+    options: dict | None = None,
+    base_dir: str | Path = "."
+) -> tuple[bytes, dict]:
+    """Async fit_pdf() for an AsyncPDFRenderer."""
+    html, pdf_options, (width, height) = prepare(html, css_path, options)
+    with span("page_fit", pages=pages):
+        async with renderer.borrowed_page() as page:
+            viewport = page.viewport_size
+            await page.set_viewport_size({"width": round(width), "height": round(height)})
+            await page.emulate_media(media="print")
+            try:
+                with span("set_content"):
+                    await page.set_content(with_base_href(html, base_dir), wait_until="load")
+                for attempt in range(MAX_ATTEMPTS):
+                    with span("fit_search"):
+                        result = await page.evaluate(FIT_SCRIPT, fit_arguments(pages, height, attempt))
+                    with span("print_pdf"):
+                        pdf = await page.pdf(**pdf_options)
+                    searched_fit = result["fits"]
+                    if not spills(result, pdf, pages) or not searched_fit:
+                        break
+            finally:
+                await page.emulate_media(media="null")
+                if viewport:
+                    await page.set_viewport_size(viewport)
+    return pdf, result
+
+
+def describe_fit(result: dict, pages: int) -> str:
+    """One-line summary of a fit: the chosen values and the passes it took."""
+    values = ", ".join(f"{name.removeprefix('--fit-')} {value:.2f}" for name, value in result["values"].items())
+    status = f"fit to {pages} page(s)" if result["fits"] else f"✗ does not fit {pages} page(s) even at"
+    return f"{status}: {values} ({result['passes']} layout passes)"
+
+
+def check_short_resume(renderer, variants: list[dict] | None = None) -> list[str]:
+    """Fit SHORT_RESUME to one page with each variant; return the variants it didn't fit unscaled."""
+    from generate_resume import VARIANTS, load_template
+
+    failures = []
+    for variant in variants or VARIANTS:
+        html = load_template(variant["template"]).render(**SHORT_RESUME)
+        _, result = fit_pdf(renderer, html, variant["css"], pages=1)
+        if not result["fits"] or any(value != 1 for value in result["values"].values()):
+            failures.append(f"{variant['name']}: {describe_fit(result, pages=1)}")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Page-fit self-check")
+    parser.add_argument("--check", action="store_true", help="check that a short resume fits one page unscaled")
+    args = parser.parse_args()
+    if not args.check:
+        parser.print_help()
+        sys.exit(0)
+
+    from pdf_renderer import PDFRenderer
+    with PDFRenderer() as renderer:
+        failures = check_short_resume(renderer)
+    for failure in failures:
+        print(f"✗ {failure}")
+    if failures:
+        sys.exit(1)
+    print("✓ A short resume fits one page at scale 1.0 with every variant")
@@ -0,0 +1,138 @@
+"""
+pdf_optimize.py
+
+Shrink generated PDFs for email and upload portals with size limits:
+    - streams are recompressed (Flate at the highest level) and small objects
+      packed into object streams
+    - resources no page uses are dropped
+    - document metadata other than the title (producer, creator, dates, XMP)
+      is stripped
+    - the file is linearized ("fast web view"), so the first page shows
+      before the whole file has downloaded
+
+Chromium already embeds only the glyphs a PDF uses (subset fonts), so fonts
+are not re-subset here.
+
+Optimized PDFs are kept in the render cache (render_cache.py) keyed by the
+input PDF's hash, so an unchanged PDF is only processed once.
+
+Needs the optional pikepdf package.
+
+Usage:
+    pip install pikepdf
+
+    python generate_resume.py --optimize-pdf
+    python pdf_optimize.py resume.pdf resume_ats.pdf     # in place, with a size report
+
+    from pdf_optimize import optimize_pdf_cached
+    smaller = optimize_pdf_cached(pdf_bytes)
+"""
+
+import io
+import sys
+from pathlib import Path
+from build_cache import digest
+from profiling import span
+from render_cache import get_render_cache
+
+try:
+    import pikepdf
+except ImportError:
+    pikepdf = None
+
+
+# Bump when the optimization settings change, so cached results are redone
+OPTIMIZE_VERSION = "1"
+
+# Document info entries worth keeping (viewers show the title in the tab/window)
+KEEP_DOCINFO = {"/Title"}
+
+
+def available() -> bool:
+    """Whether pikepdf is installed."""
+    return pikepdf is not None
+
+
+def optimize_pdf(pdf: bytes) -> bytes:
+    """Return an optimized copy of `pdf`, or `pdf` itself if that isn't smaller."""
+    if pikepdf is None:
+        raise RuntimeError("PDF optimization needs pikepdf (pip install pikepdf)")
+    with span("optimize_pdf"):
+        with pikepdf.open(io.BytesIO(pdf)) as document:
+            for key in list(document.docinfo.keys()):
+                if str(key) not in KEEP_DOCINFO:
+                    del document.docinfo[key]
+            if "/Metadata" in document.Root:
+                del document.Root["/Metadata"]
+            document.remove_unreferenced_resources()
+
+            out = io.BytesIO()
+            document.save(
+                out,
+                compress_streams=True,
+                recompress_flate=True,
+                stream_decode_level=pikepdf.StreamDecodeLevel.generalized,
+                object_stream_mode=pikepdf.ObjectStreamMode.generate,
+                linearize=True,
+                deterministic_id=True
+            )
+    optimized = out.getvalue()
+    return optimized if len(optimized) < len(pdf) else pdf
+
+
+def optimize_pdf_cached(pdf: bytes) -> bytes:
+    """optimize_pdf() through the render cache."""
+    render_cache = get_render_cache()
+    key = digest("pdf-optimize", OPTIMIZE_VERSION, pdf)
+    optimized = render_cache.get(key)
+    if optimized is None:
+        optimized = optimize_pdf(pdf)
+        render_cache.put(key, optimized)
+    return optimized
+
+
+def format_size(size: int) -> str:
+    """Human-readable byte count."""
+    return f"{size / 1024:.1f} KB" if size >= 1024 else f"{size} B"
+
+
+def describe_savings(before: int, after: int) -> str:
+    """'85.2 KB -> 61.0 KB (-28%)'."""
+    change = (after - before) / before * 100 if before else 0
+    return f"{format_size(before)} -> {format_size(after)} ({change:+.0f}%)"
+
+
+def optimize_file(path: str | Path, out_path: str | Path | None = None) -> tuple[int, int]:
+    """Optimize a PDF file (in place unless `out_path` is given); return (bytes before, bytes after)."""
+    path = Path(path)
+    pdf = path.read_bytes()
+    optimized = optimize_pdf_cached(pdf)
+    if out_path is not None or optimized != pdf:
+        Path(out_path or path).write_bytes(optimized)
+    return len(pdf), len(optimized)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python pdf_optimize.py FILE.pdf [FILE.pdf ...]")
+        sys.exit(1)
+    if not available():
+        print("✗ pikepdf is not installed (pip install pikepdf)")
+        sys.exit(1)
+
+    total_before = total_after = 0
+    failed = False
+    for pdf_path in sys.argv[1:]:
+        try:
+            before, after = optimize_file(pdf_path)
+        except Exception as e:
+            print(f"✗ {pdf_path}: {e}")
+            failed = True
+            continue
+        total_before += before
+        total_after += after
+        print(f"✓ {pdf_path}: {describe_savings(before, after)}")
+    if len(sys.argv) > 2 and total_before:
+        print(f"  total: {describe_savings(total_before, total_after)}")
+    get_render_cache().report()
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,416 @@
+"""
+pdf_renderer.py
+
+Reusable Playwright renderer that keeps one Chromium instance warm for PDF output.
+A single renderer owns the Playwright driver, the browser, and a small pool of
+browser contexts/pages, so every PDF in a run (and every regeneration in a
+long-lived process such as watch.py) reuses the same browser instead of
+cold-starting Chromium each time.
+
+AsyncPDFRenderer is the asyncio counterpart: its pages are driven concurrently,
+so several variants can be rendered in parallel from one browser.
+
+Usage:
+    pip install playwright
+    playwright install chromium
+
+    from pdf_renderer import PDFRenderer
+
+    with PDFRenderer(pool_size=2) as renderer:
+        renderer.render_pdf(html_content, {"path": "resume.pdf"})
+
+    from pdf_renderer import AsyncPDFRenderer
+
+    async with AsyncPDFRenderer(pool_size=2) as renderer:
+        await asyncio.gather(
+            renderer.render_pdf(visual_html, {"path": "resume.pdf"}),
+            renderer.render_pdf(ats_html, {"path": "resume_ats.pdf"}),
+        )
+
+HTML is rendered from memory with page.set_content(). Relative stylesheet links
+are resolved against `base_dir` through route interception and served from an
+in-memory asset cache, so no HTML file or file:// navigation is needed and the
+render only waits for the load event and document.fonts.ready.
+
+The pool size defaults to RESUME_PDF_POOL_SIZE (or 1) when not given.
+"""
+
+import asyncio
+import atexit
+import mimetypes
+import os
+import queue
+import re
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from urllib.parse import quote, unquote, urlsplit
+from playwright.async_api import async_playwright
+from playwright.sync_api import sync_playwright
+from profiling import span
+
+
+# Default page.pdf() settings shared by every resume variant
+PDF_OPTIONS = {
+    'format': 'A4',
+    'margin': {
+        'top': '10mm',
+        'right': '10mm',
+        'bottom': '10mm',
+        'left': '10mm'
+    },
+    'print_background': True  # Include background colors/images
+}
+
+
+# Fake origin that relative asset URLs resolve against; requests to it are
+# intercepted and answered from disk (via _asset_cache), never the network
+ASSET_ORIGIN = "http://resume.local"
+
+# Only these file types are served, and only from a directory some HTML was
+# rendered against (see with_base_href), so rendered data can't pull other
+# local files (resume.yaml, /etc/passwd, ...) into a PDF
+ASSET_SUFFIXES = {
+    ".css", ".woff", ".woff2", ".ttf", ".otf",
+    ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp",
+}
+
+# Absolute asset path -> (mtime_ns, size, bytes)
+_asset_cache = {}
+
+# Resolved base directories assets may be served from
+_asset_roots = set()
+
+
+def with_base_href(html: str, base_dir: str | Path = ".") -> str:
+    """Insert a <base> tag so relative links in `html` resolve under ASSET_ORIGIN."""
+    root = Path(base_dir).resolve()
+    _asset_roots.add(root)
+    base_href = ASSET_ORIGIN + quote(root.as_posix().rstrip("/")) + "/"
+    base_tag = f'<base href="{base_href}">'
+    head = re.search(r"<head(\s[^>]*)?>", html, re.IGNORECASE)
+    if head is None:
+        return base_tag + html
+    return html[:head.end()] + base_tag + html[head.end():]
+
+
+def read_asset(url: str) -> tuple[bytes, str] | None:
+    """Return (body, content type) for an ASSET_ORIGIN URL, reading disk only when the file changed.
+
+    Returns None for missing files and for anything outside the allowed roots
+    and file types.
+    """
+    try:
+        path = Path(unquote(urlsplit(url).path)).resolve()
+    except (OSError, RuntimeError):
+        return None
+    if path.suffix.lower() not in ASSET_SUFFIXES or not any(path.is_relative_to(root) for root in _asset_roots):
+        return None
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+
+    cached = _asset_cache.get(path)
+    if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+        cached = (stat.st_mtime_ns, stat.st_size, path.read_bytes())
+        _asset_cache[path] = cached
+
+    content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    return cached[2], content_type
+
+
+def _serve_asset(route):
+    """Sync route handler answering ASSET_ORIGIN requests from the asset cache."""
+    asset = read_asset(route.request.url)
+    if asset is None:
+        route.fulfill(status=404)
+    else:
+        route.fulfill(status=200, body=asset[0], content_type=asset[1])
+
+
+async def _serve_asset_async(route):
+    """Async route handler answering ASSET_ORIGIN requests from the asset cache."""
+    asset = read_asset(route.request.url)
+    if asset is None:
+        await route.fulfill(status=404)
+    else:
+        await route.fulfill(status=200, body=asset[0], content_type=asset[1])
+
+
+def default_pool_size() -> int:
+    """Return the pool size configured through RESUME_PDF_POOL_SIZE."""
+    return max(1, int(os.environ.get("RESUME_PDF_POOL_SIZE", "1")))
+
+
+class PDFRenderer:
+    """Own one Playwright instance and a pool of warm pages for PDF rendering."""
+
+    def __init__(self, pool_size: int | None = None, launch_options: dict | None = None):
+        self.pool_size = pool_size or default_pool_size()
+        self.launch_options = launch_options or {}
+        self._playwright = None
+        self._browser = None
+        self._pages = queue.Queue()
+        self._created = 0
+
+    @property
+    def started(self) -> bool:
+        """Whether the browser has been launched."""
+        return self._browser is not None
+
+    def start(self) -> "PDFRenderer":
+        """Launch Playwright and Chromium (no-op if already running)."""
+        if self._browser is None:
+            with span("launch_browser"):
+                self._playwright = sync_playwright().start()
+                self._browser = self._playwright.chromium.launch(**self.launch_options)
+        return self
+
+    def _acquire_page(self):
+        """Take a warm page from the pool, creating one if the pool isn't full yet."""
+        self.start()
+        while True:
+            try:
+                page = self._pages.get_nowait()
+            except queue.Empty:
+                if self._created < self.pool_size:
+                    return self._new_page()
+                page = self._pages.get()
+            # None marks a freed slot (see _free_slot): loop round and fill it
+            if page is not None:
+                return page
+
+    def _new_page(self):
+        """Create a pooled page, giving its slot back if creation fails."""
+        self._created += 1
+        context = None
+        try:
+            context = self._browser.new_context()
+            context.route(f"{ASSET_ORIGIN}/**", _serve_asset)
+            return context.new_page()
+        except BaseException:
+            if context is not None:
+                context.close()
+            self._free_slot()
+            raise
+
+    def _free_slot(self):
+        """Give up a page's pool slot, waking a caller waiting for a page."""
+        self._created -= 1
+        self._pages.put(None)
+
+    def _release_page(self, page):
+        """Return a page to the pool, replacing it if it crashed or was closed."""
+        if page.is_closed():
+            self._free_slot()
+            page.context.close()
+            return
+        self._pages.put(page)
+
+    @contextmanager
+    def borrowed_page(self):
+        """Lend out a warm pooled page (with the asset route installed) for custom work."""
+        page = self._acquire_page()
+        try:
+            yield page
+        finally:
+            self._release_page(page)
+
+    def render_pdf(
+        self,
+        html: str,
+        options: dict | None = None,
+        base_dir: str | Path = "."
+    ) -> bytes:
+        """Render an HTML string to PDF and return the PDF bytes.
+
+        `options` are merged over PDF_OPTIONS and passed to page.pdf(), so
+        {"path": "resume.pdf"} also writes the file. Relative links in `html`
+        (the stylesheet) are resolved against `base_dir`.
+        """
+        pdf_options = {**PDF_OPTIONS, **(options or {})}
+        with span("render_pdf", path=pdf_options.get("path")):
+            page = self._acquire_page()
+            try:
+                # Load the HTML straight from memory; the stylesheet comes from the asset route
+                with span("set_content"):
+                    page.set_content(with_base_href(html, base_dir), wait_until='load')
+
+                # Web fonts can still be loading after the load event
+                with span("fonts_ready"):
+                    page.evaluate('document.fonts.ready.then(() => true)')
+
+                with span("print_pdf"):
+                    return page.pdf(**pdf_options)
+            finally:
+                self._release_page(page)
+
+    def close(self):
+        """Close all pooled pages, the browser and the Playwright driver."""
+        while not self._pages.empty():
+            page = self._pages.get_nowait()
+            if page is not None:
+                page.context.close()
+        self._created = 0
+
+        if self._browser is not None:
+            self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+    def __enter__(self) -> "PDFRenderer":
+        # The browser is launched lazily by the first render_pdf() call
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AsyncPDFRenderer:
+    """Async version of PDFRenderer whose pooled pages render concurrently."""
+
+    def __init__(self, pool_size: int | None = None, launch_options: dict | None = None):
+        self.pool_size = pool_size or default_pool_size()
+        self.launch_options = launch_options or {}
+        self._playwright = None
+        self._browser = None
+        self._pages = asyncio.Queue()
+        self._created = 0
+        self._start_lock = asyncio.Lock()
+
+    async def start(self) -> "AsyncPDFRenderer":
+        """Launch Playwright and Chromium (no-op if already running)."""
+        async with self._start_lock:
+            if self._browser is None:
+                with span("launch_browser"):
+                    self._playwright = await async_playwright().start()
+                    self._browser = await self._playwright.chromium.launch(**self.launch_options)
+        return self
+
+    async def _acquire_page(self):
+        """Take a warm page from the pool, waiting if every page is busy."""
+        await self.start()
+        while True:
+            if self._pages.empty() and self._created < self.pool_size:
+                return await self._new_page()
+            page = await self._pages.get()
+            # None marks a freed slot (see _free_slot): loop round and fill it
+            if page is not None:
+                return page
+
+    async def _new_page(self):
+        """Create a pooled page, giving its slot back if creation fails or is cancelled."""
+        self._created += 1
+        context = None
+        try:
+            context = await self._browser.new_context()
+            await context.route(f"{ASSET_ORIGIN}/**", _serve_asset_async)
+            return await context.new_page()
+        except BaseException:
+            self._free_slot()
+            if context is not None:
+                await asyncio.shield(context.close())
+            raise
+
+    def _free_slot(self):
+        """Give up a page's pool slot, waking a caller waiting for a page."""
+        self._created -= 1
+        self._pages.put_nowait(None)
+
+    async def _release_page(self, page):
+        """Return a page to the pool, replacing it if it crashed or was closed."""
+        if page.is_closed():
+            self._free_slot()
+            await page.context.close()
+            return
+        self._pages.put_nowait(page)
+
+    @asynccontextmanager
+    async def borrowed_page(self):
+        """Lend out a warm pooled page (see PDFRenderer.borrowed_page)."""
+        page = await self._acquire_page()
+        try:
+            yield page
+        except asyncio.CancelledError:
+            await self._discard_page(page)
+            raise
+        finally:
+            await self._release_page(page)
+
+    async def render_pdf(
+        self,
+        html: str,
+        options: dict | None = None,
+        base_dir: str | Path = "."
+    ) -> bytes:
+        """Render an HTML string to PDF and return the PDF bytes (see PDFRenderer.render_pdf)."""
+        pdf_options = {**PDF_OPTIONS, **(options or {})}
+        with span("render_pdf", path=pdf_options.get("path")):
+            page = await self._acquire_page()
+            try:
+                with span("set_content"):
+                    await page.set_content(with_base_href(html, base_dir), wait_until='load')
+                with span("fonts_ready"):
+                    await page.evaluate('document.fonts.ready.then(() => true)')
+                with span("print_pdf"):
+                    return await page.pdf(**pdf_options)
+            except asyncio.CancelledError:
+                await self._discard_page(page)
+                raise
+            finally:
+                await self._release_page(page)
+
+    async def _discard_page(self, page):
+        """Close a page abandoned mid-render (e.g. timed out), so _release_page() replaces it."""
+        if not page.is_closed():
+            await asyncio.shield(page.close())
+
+    async def close(self):
+        """Close all pooled pages, the browser and the Playwright driver."""
+        while not self._pages.empty():
+            page = self._pages.get_nowait()
+            if page is not None:
+                await page.context.close()
+        self._created = 0
+
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def __aenter__(self) -> "AsyncPDFRenderer":
+        # The browser is launched lazily by the first render_pdf() call
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+_shared_renderer = None
+
+
+def get_renderer(pool_size: int | None = None) -> PDFRenderer:
+    """Return the process-wide renderer, creating it on first use.
+
+    The browser itself is launched lazily on the first render_pdf() call.
+    """
+    global _shared_renderer
+    if _shared_renderer is None:
+        _shared_renderer = PDFRenderer(pool_size=pool_size)
+    return _shared_renderer
+
+
+def shutdown_renderer():
+    """Close the process-wide renderer if one was created."""
+    global _shared_renderer
+    if _shared_renderer is not None:
+        _shared_renderer.close()
+        _shared_renderer = None
+
+
+# Make sure Chromium never outlives the interpreter
+atexit.register(shutdown_renderer)
@@ -0,0 +1,219 @@
+"""
+profiling.py
+
+Lightweight timing instrumentation shared by every script.
+
+Code is wrapped in named spans (load, validate, render_html, render_pdf,
+write, ...). Spans cost next to nothing until profiling is turned on with
+--profile (or RESUME_PROFILE=1). When it is on, the process prints a
+per-stage summary table at exit and writes a Chrome trace-event file
+(open it in chrome://tracing or https://ui.perfetto.dev) to
+.resume-cache/profile/trace.json.
+
+With --cprofile (or RESUME_PROFILE=cprofile) each stage is also run under
+cProfile and dumped to .resume-cache/profile/<stage>.prof, for
+`python -m pstats` or snakeviz. Only one cProfile profiler can be active at a
+time, so a span that starts while another one is being profiled is timed
+but not profiled.
+
+Usage:
+    from profiling import span
+
+    with span("render_pdf", variant="ats"):
+        ...
+
+    # scripts with argparse
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.configure(args)
+
+    # scripts without argparse (RESUME_PROFILE only)
+    profiling.configure()
+"""
+
+import atexit
+import cProfile
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from build_cache import CACHE_DIR
+
+
+PROFILE_DIR = CACHE_DIR / "profile"
+TRACE_PATH = PROFILE_DIR / "trace.json"
+
+_enabled = False
+_cprofile = False
+_started_ns = 0
+_events = []                  # (name, start_ns, duration_ns, thread id, args)
+_profiles = {}                # stage name -> cProfile.Profile
+_profile_lock = threading.Lock()
+_profiling_active = False
+
+
+class _Span:
+    """Context manager recording one named span."""
+
+    __slots__ = ("name", "args", "start", "profile")
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+        self.profile = None
+
+    def __enter__(self) -> "_Span":
+        global _profiling_active
+        if _cprofile:
+            with _profile_lock:
+                if not _profiling_active:
+                    _profiling_active = True
+                    self.profile = _profiles.setdefault(self.name, cProfile.Profile())
+            if self.profile is not None:
+                try:
+                    self.profile.enable()
+                except ValueError:
+                    # Another profiler (e.g. a debugger) owns the hook
+                    self.profile = None
+                    _profiling_active = False
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        global _profiling_active
+        duration = time.perf_counter_ns() - self.start
+        if self.profile is not None:
+            self.profile.disable()
+            _profiling_active = False
+        # list.append is atomic, so spans from worker threads need no lock
+        _events.append((self.name, self.start, duration, threading.get_ident(), self.args))
+
+
+class _NullSpan:
+    """Shared no-op span used while profiling is off."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **args):
+    """Return a context manager timing `name` (a no-op unless profiling is on)."""
+    if not _enabled:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def enabled() -> bool:
+    """Whether spans are being recorded."""
+    return _enabled
+
+
+def enable(cprofile: bool = False):
+    """Start recording spans; the report is written when the process exits."""
+    global _enabled, _cprofile, _started_ns
+    if not _enabled:
+        _started_ns = time.perf_counter_ns()
+        atexit.register(finish)
+    _enabled = True
+    _cprofile = _cprofile or cprofile
+
+
+def add_arguments(parser):
+    """Add --profile / --cprofile to an argparse parser."""
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="print per-stage timings and write a Chrome trace (also RESUME_PROFILE=1)"
+    )
+    parser.add_argument(
+        "--cprofile",
+        action="store_true",
+        help="like --profile, plus a cProfile dump per stage (also RESUME_PROFILE=cprofile)"
+    )
+
+
+def configure(args=None):
+    """Turn profiling on from parsed --profile/--cprofile flags and/or RESUME_PROFILE."""
+    setting = os.environ.get("RESUME_PROFILE", "").lower()
+    cprofile = setting == "cprofile" or bool(getattr(args, "cprofile", False))
+    if cprofile or setting not in ("", "0") or getattr(args, "profile", False):
+        enable(cprofile=cprofile)
+
+
+def summary() -> list[dict]:
+    """Aggregate recorded spans per name: calls, total, mean and max milliseconds."""
+    stages = {}
+    for name, _, duration, _, _ in list(_events):
+        stage = stages.setdefault(name, {"stage": name, "calls": 0, "total_ms": 0.0, "max_ms": 0.0})
+        stage["calls"] += 1
+        stage["total_ms"] += duration / 1e6
+        stage["max_ms"] = max(stage["max_ms"], duration / 1e6)
+    for stage in stages.values():
+        stage["mean_ms"] = stage["total_ms"] / stage["calls"]
+    return sorted(stages.values(), key=lambda stage: -stage["total_ms"])
+
+
+def print_summary():
+    """Print the per-stage summary table."""
+    wall_ms = (time.perf_counter_ns() - _started_ns) / 1e6
+    print(f"\n⏱ Profile ({wall_ms:.1f}ms wall)")
+    print(f"  {'stage':<18} {'calls':>6} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'% wall':>7}")
+    for stage in summary():
+        print(
+            f"  {stage['stage']:<18} {stage['calls']:>6} {stage['total_ms']:>10.1f} "
+            f"{stage['mean_ms']:>9.1f} {stage['max_ms']:>9.1f} {stage['total_ms'] / wall_ms * 100:>6.1f}%"
+        )
+
+
+def write_trace(path: str | Path = TRACE_PATH) -> Path:
+    """Write recorded spans as Chrome trace-event JSON and return the path."""
+    pid = os.getpid()
+    trace = {
+        "displayTimeUnit": "ms",
+        "traceEvents": [
+            {
+                "name": name,
+                "cat": "resume",
+                "ph": "X",
+                "ts": (start - _started_ns) / 1000,
+                "dur": duration / 1000,
+                "pid": pid,
+                "tid": tid,
+                "args": {key: str(value) for key, value in args.items()},
+            }
+            for name, start, duration, tid, args in list(_events)
+        ],
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(trace), encoding="utf-8")
+    return path
+
+
+def dump_profiles(directory: str | Path = PROFILE_DIR) -> list[Path]:
+    """Write one cProfile .prof file per profiled stage."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name, profile in _profiles.items():
+        path = directory / f"{name}.prof"
+        profile.dump_stats(path)
+        paths.append(path)
+    return paths
+
+
+def finish():
+    """Print the summary and write the trace (and cProfile dumps); runs at exit."""
+    if not _enabled or not _events:
+        return
+    print_summary()
+    print(f"✓ Saved trace -> {write_trace()}")
+    for path in dump_profiles() if _cprofile else []:
+        print(f"✓ Saved cProfile -> {path}")
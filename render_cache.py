@@ -0,0 +1,241 @@
+"""
+render_cache.py
+
+Two-tier cache of rendered outputs (HTML, PDF, Markdown bytes), so the same
+resume + template + stylesheet is rendered once and then served from cache by
+generate_resume.py, batch mode and render_server.py.
+
+    memory  an LRU bounded by total bytes (not entry count), so a few large
+            PDFs can't crowd out the process
+    disk    a content-addressed store in .resume-cache/renders/, keyed by the
+            same digests as the build cache, shared by every process
+
+Keys come from the build-cache digests (generate_resume.html_cache_key /
+pdf_cache_key), whose data digest is canonical: key order, and YAML vs JSON
+spellings of dates and numbers, don't matter. A memory miss that hits disk
+promotes the entry into memory. Disk entries are touched on every hit, so
+prune() drops the least recently used ones first.
+
+Usage:
+    from render_cache import get_render_cache
+
+    cache = get_render_cache()
+    pdf = cache.get(key)
+    if pdf is None:
+        pdf = render()
+        cache.put(key, pdf)
+    cache.report()
+
+Sizes are configured with RESUME_RENDER_CACHE_MB (memory, default 64) and
+RESUME_RENDER_CACHE_DISK_MB (default 512); RESUME_RENDER_CACHE=0 turns the
+cache off.
+"""
+
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from build_cache import CACHE_DIR
+
+
+STORE_DIR = CACHE_DIR / "renders"
+
+DEFAULT_MEMORY_MB = 64
+DEFAULT_DISK_MB = 512
+
+STYLESHEET_RE = re.compile(r'<link[^>]+href="([^"]+\.css)"', re.IGNORECASE)
+
+
+def linked_stylesheet(html: str, base_dir: str | Path = ".") -> str | None:
+    """Return the path of the first stylesheet `html` links to, resolved against `base_dir`."""
+    match = STYLESHEET_RE.search(html)
+    return str(Path(base_dir) / match.group(1)) if match else None
+
+
+class LRUCache:
+    """In-memory LRU of key -> bytes, evicting least recently used entries past `max_bytes`."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> bytes | None:
+        """Return the cached value (marking it most recently used), or None."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: bytes):
+        """Store a value, evicting old entries until the cache fits in max_bytes."""
+        if len(value) > self.max_bytes:
+            # Would evict everything else and still not fit
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= len(previous)
+            self._entries[key] = value
+            self.bytes += len(value)
+            while self.bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.bytes -= len(evicted)
+                self.evictions += 1
+
+
+class ContentStore:
+    """On-disk content-addressed store: one file per key under `root`/<2 chars>/<key>."""
+
+    def __init__(self, root: str | Path = STORE_DIR):
+        self.root = Path(root)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def get(self, key: str) -> bytes | None:
+        """Return the stored bytes for `key`, or None."""
+        path = self._path(key)
+        try:
+            value = path.read_bytes()
+        except OSError:
+            self.misses += 1
+            return None
+        try:
+            # Touch it so prune() treats it as recently used
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: bytes):
+        """Store bytes atomically (best effort; a full disk just means a cache miss later)."""
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f"{key}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(value)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
+
+    def prune(self, max_bytes: int) -> int:
+        """Delete least recently used entries until the store fits in `max_bytes`; return bytes freed."""
+        entries = []
+        for path in self.root.glob("*/*"):
+            if path.name.endswith(".tmp"):
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                # Removed (or replaced) by another process since the glob
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        freed = 0
+        for _, size, path in sorted(entries):
+            if total - freed <= max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            freed += size
+            self.evictions += 1
+        return freed
+
+
+class RenderCache:
+    """Memory LRU in front of a disk content store."""
+
+    def __init__(
+        self,
+        memory_bytes: int = DEFAULT_MEMORY_MB * 1024 * 1024,
+        disk_bytes: int = DEFAULT_DISK_MB * 1024 * 1024,
+        store_dir: str | Path = STORE_DIR,
+        enabled: bool = True
+    ):
+        self.enabled = enabled
+        self.disk_bytes = disk_bytes
+        self.memory = LRUCache(memory_bytes)
+        self.disk = ContentStore(store_dir)
+
+    def get(self, key: str) -> bytes | None:
+        """Return cached bytes from memory, else disk (promoting them into memory), else None."""
+        if not self.enabled:
+            return None
+        value = self.memory.get(key)
+        if value is None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.put(key, value)
+        return value
+
+    def put(self, key: str, value: bytes):
+        """Store bytes in both tiers."""
+        if not self.enabled:
+            return
+        self.memory.put(key, value)
+        self.disk.put(key, value)
+
+    def prune(self) -> int:
+        """Trim the disk store to its size limit; return bytes freed."""
+        return self.disk.prune(self.disk_bytes) if self.enabled else 0
+
+    def stats(self) -> dict:
+        """Hit/miss/eviction counts per tier."""
+        return {
+            "memory_hits": self.memory.hits,
+            "disk_hits": self.disk.hits,
+            "misses": self.disk.misses,
+            "memory_evictions": self.memory.evictions,
+            "disk_evictions": self.disk.evictions,
+            "memory_entries": len(self.memory),
+            "memory_bytes": self.memory.bytes,
+        }
+
+    def report(self):
+        """Print this process's cache statistics."""
+        if not self.enabled:
+            return
+        stats = self.stats()
+        print(
+            f"Render cache: {stats['memory_hits']} memory hit(s), {stats['disk_hits']} disk hit(s), "
+            f"{stats['misses']} miss(es), {stats['memory_evictions'] + stats['disk_evictions']} eviction(s)"
+        )
+
+
+def cache_enabled() -> bool:
+    """Whether the render cache is on (RESUME_RENDER_CACHE, default on)."""
+    return os.environ.get("RESUME_RENDER_CACHE", "1") not in ("", "0")
+
+
+_shared_cache = None
+
+
+def get_render_cache() -> RenderCache:
+    """Return the process-wide render cache, configured from the environment."""
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = RenderCache(
+            memory_bytes=int(float(os.environ.get("RESUME_RENDER_CACHE_MB", DEFAULT_MEMORY_MB)) * 1024 * 1024),
+            disk_bytes=int(float(os.environ.get("RESUME_RENDER_CACHE_DISK_MB", DEFAULT_DISK_MB)) * 1024 * 1024),
+            enabled=cache_enabled()
+        )
+    return _shared_cache
@@ -0,0 +1,413 @@
+"""
+render_server.py
+
+Resident render service: an HTTP API that turns resume data into HTML, PDF or
+Markdown without shelling out to generate_resume.py per request.
+
+The server keeps everything warm between requests: Chromium and a pool of
+pages (AsyncPDFRenderer, launched at startup), compiled templates
+(generate_resume.load_template) and rendered outputs (render_cache.py), so a
+repeated resume + template + format is answered without rendering. The disk
+render cache is trimmed to its size limit every PRUNE_INTERVAL seconds. Requests
+go through a bounded queue served by a fixed number of render workers:
+    - at most --concurrency renders run at once (one browser page each)
+    - at most --queue-size requests wait; beyond that the server answers
+      503 with Retry-After instead of piling up work (backpressure)
+
+Endpoints:
+    POST /render    JSON body {"data": {...}, "template": "visual", "format": "pdf"}
+                    template: a VARIANTS name (visual, ats) - default visual
+                    format:   html, pdf or markdown - default pdf
+                    -> the rendered bytes; 400 bad request, 404 unknown
+                       template, 422 schema problems (JSON list of issues),
+                       503 queue full, 504 render timed out
+    GET  /metrics   Prometheus text format: request latency and queue-wait
+                    histograms, request counters, queue depth, renders in flight
+    GET  /healthz   "ok" once the browser is up
+
+HTML responses (and the HTML behind PDFs) have the stylesheet inlined
+(css_inline.py), so they are self-contained.
+
+Built on asyncio streams only, so it needs no web framework.
+
+Usage:
+    pip install jinja2 playwright pyyaml
+    playwright install chromium
+
+    python render_server.py --port 8080 --concurrency 4 --queue-size 32
+
+    curl -X POST localhost:8080/render \\
+         -d '{"data": {"name": "Jane"}, "format": "pdf"}' -o jane.pdf
+"""
+
+import argparse
+import asyncio
+import json
+import profiling
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from generate_markdown import generate_markdown, markdown_cache_key
+from generate_resume import VARIANTS, load_template, render_variant_html, render_variant_pdf_async
+from pdf_renderer import AsyncPDFRenderer
+from profiling import span
+from render_cache import get_render_cache
+from resume_schema import format_path, validate
+
+
+DEFAULT_PORT = 8080
+DEFAULT_CONCURRENCY = 4
+DEFAULT_QUEUE_SIZE = 32
+
+# Largest accepted request body (resume JSON)
+MAX_BODY_BYTES = 2 * 1024 * 1024
+
+# A request not answered within this many seconds gets a 504; a render running
+# this long is cancelled in its worker (its browser page is closed and replaced)
+RENDER_TIMEOUT = 30.0
+
+# Seconds between trims of the on-disk render cache to its size limit
+PRUNE_INTERVAL = 60.0
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPES = {
+    "html": "text/html; charset=utf-8",
+    "pdf": "application/pdf",
+    "markdown": "text/markdown; charset=utf-8",
+}
+
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    413: "Payload Too Large", 422: "Unprocessable Entity", 500: "Internal Server Error",
+    503: "Service Unavailable", 504: "Gateway Timeout",
+}
+
+
+class HTTPError(Exception):
+    """An error answered with `status` and a JSON body."""
+
+    def __init__(self, status: int, message: str, detail=None, headers: dict | None = None):
+        super().__init__(message)
+        self.status = status
+        self.detail = detail
+        self.headers = headers or {}
+
+
+class Histogram:
+    """Cumulative Prometheus-style histogram with fixed buckets, one series per label set."""
+
+    def __init__(self, name: str, help_text: str, buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self.series = {}  # labels tuple -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, **labels):
+        """Record one observation."""
+        key = tuple(sorted(labels.items()))
+        counts = self.series.setdefault(key, [0] * (len(self.buckets) + 1) + [0.0])
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def render(self) -> list[str]:
+        """Return the histogram in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, counts in sorted(self.series.items()):
+            labels = ",".join(f'{k}="{v}"' for k, v in key)
+            prefix = f"{labels}," if labels else ""
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_sum{{{labels}}} {counts[-1]:.6f}")
+            lines.append(f"{self.name}_count{{{labels}}} {cumulative}")
+        return lines
+
+
+class Metrics:
+    """Counters, gauges and histograms served on /metrics."""
+
+    def __init__(self):
+        self.latency = Histogram(
+            "resume_render_request_seconds", "Time from request received to response ready."
+        )
+        self.queue_wait = Histogram(
+            "resume_render_queue_wait_seconds", "Time a render request waited for a worker."
+        )
+        self.requests = defaultdict(int)  # (format, status) -> count
+        self.rejected = 0
+
+    def render(self, queue_depth: int, in_flight: int, cache_stats: dict) -> str:
+        """Return every metric in Prometheus text format."""
+        lines = self.latency.render() + self.queue_wait.render()
+        lines += ["# HELP resume_render_requests_total Render requests by format and status.",
+                  "# TYPE resume_render_requests_total counter"]
+        for (fmt, status), count in sorted(self.requests.items()):
+            lines.append(f'resume_render_requests_total{{format="{fmt}",status="{status}"}} {count}')
+        lines += [
+            "# HELP resume_render_rejected_total Requests turned away because the queue was full.",
+            "# TYPE resume_render_rejected_total counter",
+            f"resume_render_rejected_total {self.rejected}",
+            "# HELP resume_render_queue_depth Render requests waiting for a worker.",
+            "# TYPE resume_render_queue_depth gauge",
+            f"resume_render_queue_depth {queue_depth}",
+            "# HELP resume_render_in_flight Renders currently running.",
+            "# TYPE resume_render_in_flight gauge",
+            f"resume_render_in_flight {in_flight}",
+            "# HELP resume_render_cache_events_total Render cache hits, misses and evictions by tier.",
+            "# TYPE resume_render_cache_events_total counter",
+            f'resume_render_cache_events_total{{event="hit",tier="memory"}} {cache_stats["memory_hits"]}',
+            f'resume_render_cache_events_total{{event="hit",tier="disk"}} {cache_stats["disk_hits"]}',
+            f'resume_render_cache_events_total{{event="miss",tier="disk"}} {cache_stats["misses"]}',
+            f'resume_render_cache_events_total{{event="eviction",tier="memory"}} {cache_stats["memory_evictions"]}',
+            f'resume_render_cache_events_total{{event="eviction",tier="disk"}} {cache_stats["disk_evictions"]}',
+            "# HELP resume_render_cache_bytes Bytes held by the in-memory render cache.",
+            "# TYPE resume_render_cache_bytes gauge",
+            f"resume_render_cache_bytes {cache_stats['memory_bytes']}",
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class RenderServer:
+    """Warm renderer behind a bounded queue and a fixed pool of render workers."""
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        variants: list[dict] = VARIANTS
+    ):
+        self.concurrency = concurrency
+        # Inlined stylesheets make HTML responses self-contained
+        self.variants = {variant["name"]: {**variant, "inline_css": True} for variant in variants}
+        self.renderer = AsyncPDFRenderer(pool_size=concurrency)
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.metrics = Metrics()
+        self.cache = get_render_cache()
+        self.in_flight = 0
+        self.ready = False
+        self._workers = []
+
+    async def start(self):
+        """Launch the browser, compile the templates and start the render workers."""
+        await self.renderer.start()
+        for variant in self.variants.values():
+            load_template(variant["template"])
+        self._workers = [asyncio.create_task(self._worker()) for _ in range(self.concurrency)]
+        self._workers.append(asyncio.create_task(self._pruner()))
+        self.ready = True
+
+    async def close(self):
+        """Stop the workers and the cache pruner, and close the browser."""
+        self.ready = False
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        await self.renderer.close()
+
+    async def render(self, data: dict, template: str, fmt: str) -> bytes:
+        """Queue one render and wait for its bytes; raises HTTPError(503) when the queue is full."""
+        variant = self.variants.get(template)
+        if variant is None:
+            raise HTTPError(404, f"unknown template '{template}'", sorted(self.variants))
+        issues = validate(data)
+        if issues:
+            raise HTTPError(422, "resume data does not match the schema", [
+                {"path": format_path(issue["path"]), "message": issue["message"]} for issue in issues
+            ])
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((data, variant, fmt, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.metrics.rejected += 1
+            raise HTTPError(503, "render queue is full", headers={"Retry-After": "1"})
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), RENDER_TIMEOUT)
+        except asyncio.TimeoutError:
+            future.cancel()
+            raise HTTPError(504, "render timed out")
+
+    async def _worker(self):
+        """Take queued renders one at a time."""
+        while True:
+            data, variant, fmt, future, queued = await self.queue.get()
+            self.metrics.queue_wait.observe(time.perf_counter() - queued, format=fmt)
+            if future.cancelled():
+                continue
+            self.in_flight += 1
+            try:
+                with span("request", format=fmt, template=variant["name"]):
+                    # A hung render would otherwise hold this worker forever
+                    result = await asyncio.wait_for(self._render(data, variant, fmt), RENDER_TIMEOUT)
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self.in_flight -= 1
+
+    async def _pruner(self):
+        """Keep the disk render cache within its size limit while the server runs."""
+        while True:
+            await asyncio.sleep(PRUNE_INTERVAL)
+            try:
+                await asyncio.to_thread(self.cache.prune)
+            except Exception as e:
+                print(f"✗ Could not prune the render cache: {e}")
+
+    async def _render(self, data: dict, variant: dict, fmt: str) -> bytes:
+        """Render one resume with the warm templates and browser, through the render cache."""
+        if fmt == "markdown":
+            key = markdown_cache_key(data)
+            markdown = self.cache.get(key)
+            if markdown is None:
+                markdown = generate_markdown(data).encode("utf-8")
+                self.cache.put(key, markdown)
+            return markdown
+        html_content = render_variant_html(data, variant)
+        if fmt == "html":
+            return html_content.encode("utf-8")
+        return await render_variant_pdf_async(html_content, variant, self.renderer)
+
+    async def handle(self, method: str, path: str, body: bytes) -> tuple[int, str, bytes, dict]:
+        """Route one request; return (status, content type, body, extra headers)."""
+        route = path.split("?", 1)[0]
+        if route == "/metrics" and method == "GET":
+            text = self.metrics.render(self.queue.qsize(), self.in_flight, self.cache.stats())
+            return 200, "text/plain; version=0.0.4", text.encode("utf-8"), {}
+        if route == "/healthz" and method == "GET":
+            status = 200 if self.ready else 503
+            return status, "text/plain", b"ok" if self.ready else b"starting", {}
+        if route != "/render":
+            raise HTTPError(404, f"no route for {route}")
+        if method != "POST":
+            raise HTTPError(405, "use POST /render")
+
+        try:
+            request = json.loads(body)
+        except ValueError as e:
+            raise HTTPError(400, f"invalid JSON: {e}")
+        if not isinstance(request, dict) or not isinstance(request.get("data"), dict):
+            raise HTTPError(400, 'expected {"data": {...}, "template": ..., "format": ...}')
+        fmt = request.get("format", "pdf")
+        if fmt not in CONTENT_TYPES:
+            raise HTTPError(400, f"format must be one of {', '.join(CONTENT_TYPES)}")
+
+        started = time.perf_counter()
+        status = 500
+        try:
+            content = await self.render(request["data"], request.get("template", "visual"), fmt)
+            status = 200
+            return 200, CONTENT_TYPES[fmt], content, {}
+        except HTTPError as e:
+            status = e.status
+            raise
+        finally:
+            self.metrics.requests[(fmt, status)] += 1
+            self.metrics.latency.observe(time.perf_counter() - started, format=fmt, status=status)
+
+    async def serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Answer HTTP/1.1 requests on one connection until it closes."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                keep_alive = (
+                    headers.get("connection", "").lower() != "close"
+                    and version == "HTTP/1.1"
+                )
+                body_read = False
+                try:
+                    try:
+                        length = int(headers.get("content-length", 0))
+                    except ValueError:
+                        length = -1
+                    if length < 0:
+                        raise HTTPError(400, "invalid Content-Length")
+                    if length > MAX_BODY_BYTES:
+                        raise HTTPError(413, f"body larger than {MAX_BODY_BYTES} bytes")
+                    body = await reader.readexactly(length) if length else b""
+                    body_read = True
+                    status, content_type, content, extra = await self.handle(method, path, body)
+                except HTTPError as e:
+                    status, content_type, extra = e.status, "application/json", e.headers
+                    content = json.dumps({"error": str(e), "detail": e.detail}).encode("utf-8")
+                except Exception as e:
+                    status, content_type, extra = 500, "application/json", {}
+                    content = json.dumps({"error": f"{type(e).__name__}: {e}"}).encode("utf-8")
+                # An unread body would be parsed as the next request: close instead
+                keep_alive = keep_alive and body_read
+
+                head = [
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                    f"Content-Type: {content_type}",
+                    f"Content-Length: {len(content)}",
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}",
+                    *(f"{name}: {value}" for name, value in extra.items()),
+                ]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + content)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str, port: int, concurrency: int, queue_size: int):
+    """Run the render server until cancelled."""
+    server = RenderServer(concurrency=concurrency, queue_size=queue_size)
+    await server.start()
+    listener = await asyncio.start_server(server.serve_connection, host, port)
+    print(f"🚀 Render server on http://{host}:{port}  (POST /render, GET /metrics)")
+    print(f"   {concurrency} concurrent render(s), up to {queue_size} queued")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resident resume render server.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"port (default: {DEFAULT_PORT})")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"renders at once, one browser page each (default: {DEFAULT_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help=f"requests allowed to wait before answering 503 (default: {DEFAULT_QUEUE_SIZE})"
+    )
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.configure(args)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.concurrency, args.queue_size))
+    except KeyboardInterrupt:
+        print("\n✓ Render server stopped")
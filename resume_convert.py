@@ -0,0 +1,253 @@
+"""
+resume_convert.py
+
+One converter for every resume format, replacing per-format scripts
+(yaml_to_json.py, json_to_yaml.py, json_to_markdown.py, markdown_to_json.py,
+which remain as shortcuts for the default file names).
+
+Formats are looked up in a registry of readers and writers:
+    yaml         YAML, one or more documents (--- separated)
+    json         a single JSON document
+    jsonl        one JSON document per line
+    md           formatted Markdown (generate_markdown.py)
+    frontmatter  YAML frontmatter Markdown (json_to_markdown.py)
+Both Markdown flavours are read by the same parser. Empty (null) documents,
+such as a "null" JSON Lines line or an empty YAML document, are skipped in
+every format.
+
+Usage:
+    pip install pyyaml
+
+    # stdin -> stdout, streaming multi-document YAML / JSONL
+    python resume_convert.py --from yaml --to jsonl < people.yaml > people.jsonl
+
+    # files, globs and directories, converted by a worker pool
+    python resume_convert.py --to json resume.yaml
+    python resume_convert.py --from yaml --to md 'people/*.yaml' --out build/md --workers 8
+
+--from defaults to each input's file extension. Bulk outputs are written as
+<out>/<input stem>.<extension> (--out defaults to each input's directory).
+
+With --profile (see profiling.py) files are converted in this process rather
+than the worker pool, so every span is recorded.
+"""
+
+import argparse
+import copy
+import glob
+import json
+import os
+import profiling
+import sys
+import yaml
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, TextIO
+from generate_markdown import write_markdown
+from json_to_markdown import convert_to_markdown
+from json_to_yaml import convert_to_yaml
+from markdown_to_json import parse_markdown_lines
+from profiling import span
+from resume_loader import Loader
+
+
+def read_yaml(stream: TextIO) -> Iterator[dict]:
+    """Yield every document of a (multi-document) YAML stream."""
+    yield from yaml.load_all(stream, Loader=Loader)
+
+
+def read_json(stream: TextIO) -> Iterator[dict]:
+    """Yield the single document of a JSON stream."""
+    yield json.load(stream)
+
+
+def read_jsonl(stream: TextIO) -> Iterator[dict]:
+    """Yield one document per non-empty JSON Lines line."""
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def read_markdown(stream: TextIO) -> Iterator[dict]:
+    """Yield the resume parsed from either Markdown flavour."""
+    yield parse_markdown_lines(stream)
+
+
+def write_yaml(data: dict, stream: TextIO, index: int):
+    """Write one YAML document, separating documents with ---."""
+    if index:
+        stream.write("---\n")
+    stream.write(convert_to_yaml(data))
+
+
+def write_json(data: dict, stream: TextIO, index: int):
+    """Write the single JSON document."""
+    if index:
+        raise ValueError("json holds a single resume; use --to jsonl for several")
+    json.dump(data, stream, indent=4, ensure_ascii=False)
+    stream.write("\n")
+
+
+def write_jsonl(data: dict, stream: TextIO, index: int):
+    """Write one JSON Lines record."""
+    stream.write(json.dumps(data, ensure_ascii=False))
+    stream.write("\n")
+
+
+def write_md(data: dict, stream: TextIO, index: int):
+    """Write a formatted Markdown resume."""
+    if index:
+        stream.write("\n\n")
+    write_markdown(data, stream)
+
+
+def write_frontmatter(data: dict, stream: TextIO, index: int):
+    """Write a YAML frontmatter Markdown resume."""
+    if index:
+        raise ValueError("frontmatter holds a single resume")
+    # convert_to_markdown pops the summary out of the dict it is given
+    stream.write(convert_to_markdown(copy.deepcopy(data)))
+
+
+# Format name -> reader(stream) yielding documents
+READERS = {
+    "yaml": read_yaml,
+    "json": read_json,
+    "jsonl": read_jsonl,
+    "md": read_markdown,
+    "frontmatter": read_markdown,
+}
+
+# Format name -> (writer(data, stream, index), file extension)
+WRITERS = {
+    "yaml": (write_yaml, ".yaml"),
+    "json": (write_json, ".json"),
+    "jsonl": (write_jsonl, ".jsonl"),
+    "md": (write_md, ".md"),
+    "frontmatter": (write_frontmatter, ".md"),
+}
+
+# File extension -> format name, for inputs given without --from
+EXTENSIONS = {".yaml": "yaml", ".yml": "yaml", ".json": "json", ".jsonl": "jsonl", ".md": "md"}
+
+# End-of-stream marker for convert_stream() (a document itself may be null)
+_END = object()
+
+
+def convert_stream(source: TextIO, target: TextIO, from_format: str, to_format: str) -> int:
+    """Convert every document from `source` to `target`; return the document count (nulls skipped)."""
+    writer, _ = WRITERS[to_format]
+    documents = READERS[from_format](source)
+    count = 0
+    while True:
+        # Reading is lazy, so each document is timed as it is parsed
+        with span("load", format=from_format):
+            document = next(documents, _END)
+        if document is _END:
+            return count
+        if document is None:
+            continue
+        with span("write", format=to_format):
+            writer(document, target, count)
+        count += 1
+
+
+def convert_file(source: str, target: str, from_format: str, to_format: str) -> tuple[str, str, str | None]:
+    """Convert one file (worker-pool task); return (source, target, error or None)."""
+    # Written beside the target and renamed over it only once complete, so a
+    # failed conversion never leaves a truncated (or emptied) target behind
+    tmp_path = Path(target).with_name(Path(target).name + ".tmp")
+    try:
+        with open(source, encoding='utf-8') as src, open(tmp_path, 'w', encoding='utf-8') as dst:
+            convert_stream(src, dst, from_format, to_format)
+        os.replace(tmp_path, target)
+        return source, target, None
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        return source, target, f"{type(e).__name__}: {e}"
+
+
+def expand_inputs(patterns: list[str], from_format: str | None) -> list[Path]:
+    """Expand files, globs and directories into a sorted list of input files."""
+    suffixes = [ext for ext, name in EXTENSIONS.items() if from_format in (None, name)]
+    if from_format == "frontmatter":
+        suffixes = [".md"]
+
+    paths = set()
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            paths.update(p for p in path.iterdir() if p.is_file() and p.suffix in suffixes)
+        elif path.is_file():
+            paths.add(path)
+        else:
+            paths.update(Path(p) for p in glob.glob(pattern, recursive=True) if Path(p).is_file())
+    return sorted(paths)
+
+
+def convert_files(
+    inputs: list[Path],
+    to_format: str,
+    from_format: str | None = None,
+    out_dir: str | Path | None = None,
+    workers: int | None = None
+) -> int:
+    """Convert many files with a process pool; return the number of failures."""
+    _, extension = WRITERS[to_format]
+    jobs = []
+    for path in inputs:
+        source_format = from_format or EXTENSIONS.get(path.suffix)
+        if source_format is None:
+            print(f"✗ {path}: unknown format (pass --from)")
+            continue
+        target_dir = Path(out_dir) if out_dir else path.parent
+        target_dir.mkdir(parents=True, exist_ok=True)
+        target = target_dir / (path.stem + extension)
+        if target.resolve() == path.resolve():
+            print(f"✗ {path}: refusing to overwrite the input")
+            continue
+        jobs.append((str(path), str(target), source_format, to_format))
+
+    failures = len(inputs) - len(jobs)
+    if len(jobs) == 1 or profiling.enabled():
+        # Not worth spinning up a pool for a single file; spans in workers would be lost
+        results = [convert_file(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(convert_file, *zip(*jobs)) if jobs else []
+
+    for source, target, error in results:
+        if error:
+            failures += 1
+            print(f"✗ {source}: {error}")
+        else:
+            print(f"✓ {source} -> {target}")
+    return failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert resumes between formats.")
+    parser.add_argument("inputs", nargs="*", help="files, globs or directories (default: stdin)")
+    parser.add_argument("--from", dest="from_format", choices=sorted(READERS), help="input format")
+    parser.add_argument("--to", dest="to_format", choices=sorted(WRITERS), required=True, help="output format")
+    parser.add_argument("--out", metavar="DIR", help="output directory for file inputs")
+    parser.add_argument("--workers", type=int, help="worker processes for bulk conversion")
+    profiling.add_arguments(parser)
+    args = parser.parse_args()
+    profiling.configure(args)
+
+    if not args.inputs or args.inputs == ["-"]:
+        if not args.from_format:
+            parser.error("--from is required when reading stdin")
+        try:
+            convert_stream(sys.stdin, sys.stdout, args.from_format, args.to_format)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        files = expand_inputs(args.inputs, args.from_format)
+        if not files:
+            parser.error("no input files matched")
+        failed = convert_files(files, args.to_format, args.from_format, args.out, args.workers)
+        print(f"\n{'✓' if not failed else '✗'} Converted {len(files) - failed}/{len(files)} file(s)")
+        sys.exit(1 if failed else 0)
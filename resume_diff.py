@@ -0,0 +1,192 @@
+"""
+resume_diff.py
+
+Structural deltas between two versions of resume data.
+
+Lists are matched by item identity rather than position: a job is identified
+by its company and role, a talk by its title, a bullet or skill by its text.
+Moving, inserting or deleting one job therefore doesn't turn every job after
+it into a change, and an edited job is stored as a patch of its changed
+fields instead of a full copy.
+
+A delta is plain JSON:
+    {"set": value}                                 replace the value
+    {"dict": {key: delta, ...}, "remove": [key]}   patch a mapping ("order": [key]
+                                                   when its keys were reordered)
+    {"list": [op, ...]}                            rebuild a list from
+        ["keep", old_index, count]                 a run of unchanged old items
+        ["patch", old_index, delta]                an old item, patched
+        ["new", value]                             a new item
+Equal values have no delta (None).
+
+changes() lists what a delta does as (kind, path, old, new) tuples, e.g.
+("changed", "experience[0].bullets[2]", "Led ...", "Led and grew ...");
+diff() is the same straight from two versions. changed_keys() is the cheap
+top-level form (which sections to redo), used by generate_markdown.py's section
+cache; watch.py maps diff() paths to the page fragments it patches.
+
+Usage:
+    from resume_diff import apply_delta, changed_keys, changes, delta, diff
+
+    d = delta(old_data, new_data)
+    assert apply_delta(old_data, d) == new_data
+    for kind, path, before, after in changes(old_data, d):
+        print(kind, path)
+
+    diff(old_data, new_data)           # the same list of changes
+    changed_keys(old_data, new_data)   # {"experience"}
+"""
+
+import copy
+import json
+import re
+from collections import defaultdict, deque
+from typing import Iterator
+
+
+# "experience[2].bullets[0]" -> ("experience", "2", ".bullets[0]")
+PATH_RE = re.compile(r"([^.\[]*)(?:\[(\d+)\])?(.*)", re.DOTALL)
+
+# Fields that name a list item (job, school, talk, ...), in order of preference
+IDENTITY_KEYS = ("company", "role", "school", "degree", "title", "event", "publication", "name")
+
+
+def identity(item) -> str:
+    """Return the key a list item is matched on across versions."""
+    if isinstance(item, dict):
+        named = [(key, item[key]) for key in IDENTITY_KEYS if key in item]
+        if named:
+            return json.dumps(named, ensure_ascii=False, default=str)
+    return json.dumps(item, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def match_items(old: list, new: list) -> list[int | None]:
+    """For each item of `new`, the index of the old item with the same identity (or None)."""
+    unused = defaultdict(deque)
+    for index, item in enumerate(old):
+        unused[identity(item)].append(index)
+    matches = []
+    for item in new:
+        candidates = unused.get(identity(item))
+        matches.append(candidates.popleft() if candidates else None)
+    return matches
+
+
+def delta(old, new) -> dict | None:
+    """Return the delta turning `old` into `new`, or None if they're equal."""
+    if old == new:
+        return None
+    if isinstance(old, dict) and isinstance(new, dict):
+        patched = {key: delta(old[key], value) if key in old else {"set": value} for key, value in new.items()}
+        result = {"dict": {key: change for key, change in patched.items() if change is not None}}
+        removed = [key for key in old if key not in new]
+        if removed:
+            result["remove"] = removed
+        # apply_delta() keeps old keys in place and appends new ones
+        if [key for key in old if key in new] + [key for key in new if key not in old] != list(new):
+            result["order"] = list(new)
+        return result
+    if isinstance(old, list) and isinstance(new, list):
+        ops = []
+        for item, index in zip(new, match_items(old, new)):
+            if index is None:
+                ops.append(["new", item])
+                continue
+            change = delta(old[index], item)
+            if change is not None:
+                ops.append(["patch", index, change])
+            elif ops and ops[-1][0] == "keep" and ops[-1][1] + ops[-1][2] == index:
+                ops[-1][2] += 1
+            else:
+                ops.append(["keep", index, 1])
+        return {"list": ops}
+    return {"set": new}
+
+
+def apply_delta(old, change: dict | None):
+    """Return `old` with a delta applied (a new value; `old` is left untouched)."""
+    if change is None:
+        return copy.deepcopy(old)
+    if "set" in change:
+        return copy.deepcopy(change["set"])
+    if "dict" in change:
+        result = {key: copy.deepcopy(value) for key, value in old.items() if key not in change.get("remove", ())}
+        for key, item_change in change["dict"].items():
+            result[key] = apply_delta(old.get(key), item_change)
+        if "order" in change:
+            result = {key: result[key] for key in change["order"]}
+        return result
+    result = []
+    for op in change["list"]:
+        if op[0] == "keep":
+            result.extend(copy.deepcopy(old[op[1]:op[1] + op[2]]))
+        elif op[0] == "patch":
+            result.append(apply_delta(old[op[1]], op[2]))
+        else:
+            result.append(copy.deepcopy(op[1]))
+    return result
+
+
+def join_path(path: str, key) -> str:
+    """Extend a field path: ("experience", 0) -> "experience[0]", ("", "name") -> "name"."""
+    if isinstance(key, int):
+        return f"{path}[{key}]"
+    return f"{path}.{key}" if path else str(key)
+
+
+def changes(old, change: dict | None, path: str = "") -> Iterator[tuple[str, str, object, object]]:
+    """Yield (kind, path, old value, new value) for each change a delta makes to `old`.
+
+    kind is "added", "removed", "changed" or "moved" (a list item kept but
+    reordered; old/new are then its old and new index). List paths use the
+    item's index in the new list, or the old list for removed items.
+    """
+    if change is None:
+        return
+    if "set" in change:
+        yield "changed", path, old, change["set"]
+    elif "dict" in change:
+        for key in change.get("remove", ()):
+            yield "removed", join_path(path, key), old[key], None
+        for key, item_change in change["dict"].items():
+            if key not in old:
+                yield "added", join_path(path, key), None, item_change["set"]
+            else:
+                yield from changes(old[key], item_change, join_path(path, key))
+    else:
+        used = set()
+        new_index = 0
+        last_old = -1
+        for op in change["list"]:
+            if op[0] == "new":
+                yield "added", join_path(path, new_index), None, op[1]
+                new_index += 1
+                continue
+            indexes = range(op[1], op[1] + op[2]) if op[0] == "keep" else [op[1]]
+            for old_index in indexes:
+                used.add(old_index)
+                if old_index < last_old:
+                    yield "moved", join_path(path, new_index), old_index, new_index
+                last_old = max(last_old, old_index)
+                if op[0] == "patch":
+                    yield from changes(old[old_index], op[2], join_path(path, new_index))
+                new_index += 1
+        for old_index, item in enumerate(old):
+            if old_index not in used:
+                yield "removed", join_path(path, old_index), item, None
+
+
+def diff(old, new) -> list[tuple[str, str, object, object]]:
+    """Return the changes (see changes()) that turn `old` into `new`."""
+    return list(changes(old, delta(old, new)))
+
+
+def changed_keys(old: dict, new: dict) -> set[str]:
+    """Return the top-level keys whose values differ between two versions."""
+    return {key for key in old.keys() | new.keys() if key not in old or key not in new or old[key] != new[key]}
+
+
+def split_path(path: str) -> tuple[str, int | None, str]:
+    """Split a change path into (top-level key, item index or None, rest of the path)."""
+    key, index, rest = PATH_RE.fullmatch(path).groups()
+    return key, None if index is None else int(index), rest
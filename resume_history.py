@@ -0,0 +1,244 @@
+"""
+resume_history.py
+
+Version history of the resume data, replacing hand-made copies such as
+resume.yaml.2026-02-08.backup.
+
+Every build (generate_resume.py) records the resume as a new version when its
+content changed. Versions are stored in .resume-history/versions.jsonl, one
+line each, as structural deltas against the previous version (see
+resume_diff.py: jobs, talks, bullets and skills are matched by identity, so
+editing one bullet stores just that bullet). Every SNAPSHOT_EVERY versions a
+full copy is stored, so checking out any version applies only a handful of
+deltas.
+
+The history directory is meant to be committed alongside resume.yaml.
+
+Usage:
+    python resume_history.py snapshot [FILE] [-m MESSAGE]   # record FILE (default resume.yaml)
+    python resume_history.py log
+    python resume_history.py checkout 3 [-o old.yaml]       # print or write version 3
+    python resume_history.py diff 3 [7]                     # version 3 vs 7 (default: latest)
+    python resume_history.py render 3 [--out DIR]           # HTML + PDFs of version 3
+
+    # import existing backups, oldest first
+    python resume_history.py snapshot resume.yaml.2026-02-08.backup
+
+Set RESUME_HISTORY=0 (or pass --no-history to generate_resume.py) to stop
+builds from recording versions.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from build_cache import BuildCache, data_digest
+from json_to_yaml import convert_to_yaml
+from resume_diff import apply_delta, delta, diff as diff_data
+from resume_loader import find_resume_file, parse_resume_text
+
+
+HISTORY_DIR = Path(".resume-history")
+HISTORY_PATH = HISTORY_DIR / "versions.jsonl"
+
+# Store a full copy every this many versions
+SNAPSHOT_EVERY = 20
+
+
+def history_enabled() -> bool:
+    """Whether builds record history (RESUME_HISTORY, default on)."""
+    return os.environ.get("RESUME_HISTORY", "1") not in ("", "0")
+
+
+def normalize(data: dict) -> dict:
+    """Return data as it will read back from the JSON store (dates become strings)."""
+    return json.loads(json.dumps(data, ensure_ascii=False, default=str))
+
+
+class ResumeHistory:
+    """Append-only store of resume versions (numbered from 1)."""
+
+    def __init__(self, path: str | Path = HISTORY_PATH):
+        self.path = Path(path)
+        self.versions = []
+        # version number -> data, for versions already rebuilt in this process
+        self._checkouts = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.versions = [json.loads(line) for line in f if line.strip()]
+
+    def __len__(self) -> int:
+        return len(self.versions)
+
+    def entry(self, number: int) -> dict:
+        """Return the stored record of a version."""
+        if not 1 <= number <= len(self.versions):
+            raise ValueError(f"no version {number} (history has {len(self.versions)})")
+        return self.versions[number - 1]
+
+    def checkout(self, number: int | None = None) -> dict:
+        """Return the data of a version (default: the latest)."""
+        if number is None:
+            number = len(self.versions)
+        if number not in self._checkouts:
+            entry = self.entry(number)
+            if "snapshot" in entry:
+                data = entry["snapshot"]
+            else:
+                data = apply_delta(self.checkout(number - 1), entry["delta"])
+            self._checkouts[number] = data
+        return json.loads(json.dumps(self._checkouts[number], ensure_ascii=False))
+
+    def record(self, data: dict, source: str = "", message: str | None = None) -> int | None:
+        """Store `data` as a new version and return its number (None if it matches the latest)."""
+        data = normalize(data)
+        digest = data_digest(data)
+        if self.versions and self.versions[-1]["digest"] == digest:
+            return None
+
+        number = len(self.versions) + 1
+        entry = {
+            "version": number,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "source": str(source),
+            "digest": digest,
+        }
+        if message:
+            entry["message"] = message
+        if number % SNAPSHOT_EVERY == 1:
+            entry["snapshot"] = data
+        else:
+            entry["delta"] = delta(self.checkout(number - 1), data)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.versions.append(entry)
+        self._checkouts[number] = data
+        return number
+
+    def diff(self, old: int, new: int | None = None) -> list[tuple[str, str, object, object]]:
+        """Return the changes (see resume_diff.changes) from version `old` to `new` (default: latest)."""
+        return diff_data(self.checkout(old), self.checkout(new))
+
+
+def read_source(path: str | Path) -> dict:
+    """Load a resume file, including backups such as resume.yaml.2026-02-08.backup."""
+    path = Path(path)
+    suffix = next((s for s in reversed(path.suffixes) if s in (".yaml", ".yml", ".json")), path.suffix)
+    return parse_resume_text(path.read_text(encoding="utf-8"), suffix)
+
+
+def record_build(data: dict, source: str | Path):
+    """Record the data a build used, printing the new version number if there is one."""
+    number = ResumeHistory().record(data, str(source))
+    if number is not None:
+        print(f"✓ Recorded {source} as history version {number}")
+
+
+def summarize(entry: dict) -> str:
+    """Which top-level fields a stored version changed."""
+    if "snapshot" in entry:
+        return "full snapshot"
+    change = entry["delta"]
+    keys = list(change.get("dict", {})) + list(change.get("remove", []))
+    return ", ".join(keys) if keys else "key order"
+
+
+def short(value, width: int = 60) -> str:
+    """One-line preview of a value."""
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+def render_version(history: ResumeHistory, number: int, out_dir: str | Path, force: bool = False):
+    """Render a version's HTML and PDFs into `out_dir` through the normal build pipeline."""
+    from batch_render import item_variants
+    from generate_resume import VARIANTS, build_variants_async
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for variant in VARIANTS:
+        # The HTML links its stylesheet relatively, so keep a copy beside it
+        shutil.copyfile(variant["css"], out_dir / Path(variant["css"]).name)
+    cache = BuildCache(out_dir / ".resume-cache" / "manifest.json", enabled=not force)
+    asyncio.run(build_variants_async(history.checkout(number), item_variants(out_dir), cache))
+    cache.save()
+    cache.report(verbose=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Resume version history")
+    commands = parser.add_subparsers(dest="command", required=True)
+    snapshot = commands.add_parser("snapshot", help="record a resume file as a new version")
+    snapshot.add_argument("file", nargs="?", help="resume file (default: resume.yaml/resume.json)")
+    snapshot.add_argument("-m", "--message", help="note stored with the version")
+    commands.add_parser("log", help="list versions")
+    checkout = commands.add_parser("checkout", help="print or write a version")
+    checkout.add_argument("version", type=int)
+    checkout.add_argument("-o", "--output", help="write to this .yaml/.json file instead of printing YAML")
+    diff = commands.add_parser("diff", help="structured diff between two versions")
+    diff.add_argument("old", type=int)
+    diff.add_argument("new", type=int, nargs="?", help="default: latest")
+    render = commands.add_parser("render", help="render a version's HTML and PDFs")
+    render.add_argument("version", type=int)
+    render.add_argument("--out", metavar="DIR", help="output directory (default: build/history/v<N>)")
+    render.add_argument("--force", action="store_true", help="ignore the build cache")
+    args = parser.parse_args()
+
+    history = ResumeHistory()
+    try:
+        if args.command == "snapshot":
+            source = args.file or find_resume_file()
+            number = history.record(read_source(source), str(source), args.message)
+            if number is None:
+                print(f"✓ {source} matches version {len(history)}; nothing recorded")
+            else:
+                print(f"✓ Recorded {source} as version {number}")
+
+        elif args.command == "log":
+            if not history.versions:
+                print("No versions recorded yet")
+            for entry in history.versions:
+                size = len(json.dumps(entry.get("delta", entry.get("snapshot")), ensure_ascii=False))
+                message = f"  {entry['message']}" if entry.get("message") else ""
+                print(
+                    f"  v{entry['version']:<4} {entry['time']}  {entry['source']:<32} "
+                    f"{size:>7} B  {summarize(entry)}{message}"
+                )
+
+        elif args.command == "checkout":
+            data = history.checkout(args.version)
+            if args.output is None:
+                sys.stdout.write(convert_to_yaml(data))
+            else:
+                with open(args.output, "w", encoding="utf-8") as f:
+                    if args.output.endswith(".json"):
+                        json.dump(data, f, indent=4, ensure_ascii=False)
+                    else:
+                        f.write(convert_to_yaml(data))
+                print(f"✓ Wrote version {args.version} -> {args.output}")
+
+        elif args.command == "diff":
+            found = history.diff(args.old, args.new)
+            print(f"v{args.old} -> v{len(history) if args.new is None else args.new}: {len(found)} change(s)")
+            for kind, path, before, after in found:
+                if kind == "changed":
+                    print(f"  ~ {path}: {short(before)!r} -> {short(after)!r}")
+                elif kind == "moved":
+                    print(f"  ↕ {path} (was [{before}])")
+                else:
+                    sign = "+" if kind == "added" else "-"
+                    print(f"  {sign} {path}: {short(after if kind == 'added' else before)!r}")
+
+        elif args.command == "render":
+            out_dir = args.out or f"build/history/v{args.version}"
+            render_version(history, args.version, out_dir, args.force)
+            print(f"✓ Rendered version {args.version} -> {out_dir}/")
+    except (ValueError, FileNotFoundError) as e:
+        print(f"✗ Error: {e}")
+        sys.exit(1)
@@ -0,0 +1,125 @@
+"""
+resume_loader.py
+
+Shared resume data loading for every script (generators, converters, watch
+mode, batch mode, tailoring).
+
+YAML is parsed with libyaml's CSafeLoader when PyYAML was built with it,
+falling back to the pure-Python SafeLoader. Parsed data is cached per file,
+keyed by mtime + size: in memory for the life of the process and, optionally,
+as a pickled sidecar in .resume-cache/data/ so a new process can skip parsing
+an unchanged file too. Every call returns a fresh copy, so callers may mutate
+the result freely.
+
+Usage:
+    from resume_loader import load_resume_data, load_resume_file
+
+    data = load_resume_data()                    # resume.yaml, else resume.json
+    data = load_resume_file("people/jane.yaml", sidecar=True)
+
+Set RESUME_DATA_SIDECAR=1 to enable the on-disk sidecar cache by default.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import yaml
+from pathlib import Path
+from build_cache import CACHE_DIR
+from profiling import span
+
+
+# libyaml-backed loader when available (several times faster than pure Python)
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+SIDECAR_DIR = CACHE_DIR / "data"
+
+# Absolute path -> (mtime_ns, size, pickled data)
+_memory_cache = {}
+
+
+def parse_yaml(text: str):
+    """Parse YAML text with the fastest available safe loader."""
+    return yaml.load(text, Loader=Loader)
+
+
+def parse_resume_text(text: str, suffix: str):
+    """Parse resume text as YAML (.yaml/.yml) or JSON (anything else)."""
+    if suffix in (".yaml", ".yml"):
+        return parse_yaml(text)
+    return json.loads(text)
+
+
+def sidecar_enabled() -> bool:
+    """Whether the on-disk sidecar cache is on by default (RESUME_DATA_SIDECAR)."""
+    return os.environ.get("RESUME_DATA_SIDECAR", "") not in ("", "0")
+
+
+def _sidecar_path(path: Path) -> Path:
+    """Return the sidecar cache file for a source path."""
+    name = hashlib.sha256(str(path).encode("utf-8")).hexdigest()[:32]
+    return SIDECAR_DIR / f"{name}.pickle"
+
+
+def _read_sidecar(path: Path, stamp: tuple) -> bytes | None:
+    """Return pickled data from a sidecar that matches `stamp`, if any."""
+    try:
+        cached_stamp, blob = pickle.loads(_sidecar_path(path).read_bytes())
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+        return None
+    return blob if cached_stamp == stamp else None
+
+
+def _write_sidecar(path: Path, stamp: tuple, blob: bytes):
+    """Store pickled data in the sidecar cache (best effort)."""
+    sidecar = _sidecar_path(path)
+    try:
+        sidecar.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = sidecar.with_suffix(".tmp")
+        tmp_path.write_bytes(pickle.dumps((stamp, blob), protocol=pickle.HIGHEST_PROTOCOL))
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        pass
+
+
+def load_resume_file(path: str | Path, sidecar: bool | None = None):
+    """Load resume data from a YAML (.yaml/.yml) or JSON file, using the parse cache."""
+    path = Path(path).resolve()
+    with span("load", path=path.name):
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if sidecar is None:
+            sidecar = sidecar_enabled()
+
+        cached = _memory_cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return pickle.loads(cached[1])
+
+        blob = _read_sidecar(path, stamp) if sidecar else None
+        if blob is None:
+            data = parse_resume_text(path.read_text(encoding='utf-8'), path.suffix)
+            blob = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+            if sidecar:
+                _write_sidecar(path, stamp, blob)
+
+        _memory_cache[path] = (stamp, blob)
+        return pickle.loads(blob)
+
+
+def find_resume_file() -> Path:
+    """Return resume.yaml, or resume.json if there is no YAML file."""
+    yaml_path = Path("resume.yaml")
+    json_path = Path("resume.json")
+
+    if yaml_path.exists():
+        return yaml_path
+    elif json_path.exists():
+        return json_path
+    else:
+        raise FileNotFoundError("Neither resume.yaml nor resume.json found")
+
+
+def load_resume_data() -> dict:
+    """Load resume data from YAML or JSON file."""
+    return load_resume_file(find_resume_file())
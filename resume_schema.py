@@ -0,0 +1,266 @@
+"""
+resume_schema.py
+
+Schema validation for resume data, run before any rendering.
+
+RESUME_SCHEMA describes every section the HTML templates and
+generate_markdown.generate_markdown() read. It is compiled once into a tree of
+small checker functions, so validating a resume is a single walk over the data.
+Problems are reported with their path (e.g. experience[2].bullets) and, when
+the source file is known, the line/column in resume.yaml (or resume.json).
+
+Unknown keys are allowed, so new sections can be added to resume.yaml before
+the schema knows about them.
+
+Usage:
+    from resume_schema import check_resume
+
+    check_resume(data, "resume.yaml")   # raises ResumeValidationError
+
+    python resume_schema.py [resume.yaml]
+"""
+
+import sys
+import yaml
+from datetime import date
+from pathlib import Path
+from profiling import span
+from resume_loader import Loader, find_resume_file, load_resume_file
+
+
+# Scalars that templates print as text (YAML may turn "2019" into an int)
+TEXT = (str, int, float, date)
+
+
+def text(required: bool = False) -> dict:
+    """Schema for a scalar printed as text."""
+    return {"type": TEXT, "required": required}
+
+
+def text_list(required: bool = False) -> dict:
+    """Schema for a list of text scalars."""
+    return {"type": list, "required": required, "items": text(required=True)}
+
+
+RESUME_SCHEMA = {
+    "type": dict,
+    "fields": {
+        "name": text(required=True),
+        "tagline": text(),
+        "summary": text(),
+        "contact": {
+            "type": dict,
+            "fields": {
+                "address": text(),
+                "phone": text(),
+                "email": text(),
+                "website": text(),
+                "linkedin": text(),
+                "github": text(),
+            },
+        },
+        "technical_skills": text_list(),
+        "soft_skills": text_list(),
+        "experience": {
+            "type": list,
+            "items": {
+                "type": dict,
+                "required": True,
+                "fields": {
+                    "role": text(required=True),
+                    "company": text(required=True),
+                    "location": text(),
+                    "start": text(),
+                    "end": text(),
+                    "bullets": text_list(),
+                },
+            },
+        },
+        "speaking_engagements": {
+            "type": list,
+            "items": {
+                "type": dict,
+                "required": True,
+                "fields": {
+                    "title": text(required=True),
+                    "event": text(),
+                },
+            },
+        },
+        "publications": {
+            "type": list,
+            "items": {
+                "type": dict,
+                "required": True,
+                "fields": {
+                    "title": text(required=True),
+                    "publication": text(),
+                    "description": text(),
+                    "url": text(),
+                },
+            },
+        },
+        "education": {
+            "type": list,
+            "items": {
+                "type": dict,
+                "required": True,
+                "fields": {
+                    "degree": text(required=True),
+                    "school": text(),
+                    "location": text(),
+                    "start": text(),
+                    "end": text(),
+                    "notes": text(),
+                },
+            },
+        },
+    },
+}
+
+
+class ResumeValidationError(ValueError):
+    """Raised when resume data doesn't match RESUME_SCHEMA."""
+
+    def __init__(self, issues: list[dict], source: str | Path | None = None):
+        self.issues = issues
+        self.source = source
+        super().__init__(
+            f"{len(issues)} problem(s) in {source or 'resume data'}:\n"
+            + "\n".join(format_issue(issue, source) for issue in issues)
+        )
+
+
+def format_path(path: tuple) -> str:
+    """Render a data path like ('experience', 2, 'role') as experience[2].role."""
+    out = ""
+    for part in path:
+        out += f"[{part}]" if isinstance(part, int) else (f".{part}" if out else part)
+    return out or "<root>"
+
+
+def format_issue(issue: dict, source: str | Path | None = None) -> str:
+    """Render one issue as 'file:line:col: path: message'."""
+    where = ""
+    if issue.get("line"):
+        where = f"{source or ''}:{issue['line']}:{issue['column']}: "
+    return f"  {where}{format_path(issue['path'])}: {issue['message']}"
+
+
+def _type_name(kind) -> str:
+    """Human-readable name for a schema type."""
+    if kind is TEXT:
+        return "text"
+    return {dict: "mapping", list: "list"}.get(kind, getattr(kind, "__name__", str(kind)))
+
+
+def compile_schema(spec: dict):
+    """Compile a schema spec into a checker `check(value, path, issues)`."""
+    kind = spec["type"]
+    expected = _type_name(kind)
+
+    if kind is dict:
+        fields = [
+            (key, field.get("required", False), compile_schema(field))
+            for key, field in spec.get("fields", {}).items()
+        ]
+
+        def check(value, path, issues):
+            if not isinstance(value, dict):
+                issues.append({"path": path, "message": f"expected a {expected}, got {type(value).__name__}"})
+                return
+            for key, required, check_field in fields:
+                field_value = value.get(key)
+                if field_value is None:
+                    if required:
+                        issues.append({"path": path + (key,), "message": "required field is missing"})
+                    continue
+                check_field(field_value, path + (key,), issues)
+        return check
+
+    if kind is list:
+        item_spec = spec.get("items")
+        check_item = compile_schema(item_spec) if item_spec else None
+        item_required = bool(item_spec and item_spec.get("required"))
+
+        def check(value, path, issues):
+            if not isinstance(value, list):
+                issues.append({"path": path, "message": f"expected a {expected}, got {type(value).__name__}"})
+                return
+            if check_item is None:
+                return
+            for index, item in enumerate(value):
+                if item is None:
+                    if item_required:
+                        issues.append({"path": path + (index,), "message": "empty list entry"})
+                    continue
+                check_item(item, path + (index,), issues)
+        return check
+
+    def check(value, path, issues):
+        if not isinstance(value, kind):
+            issues.append({"path": path, "message": f"expected {expected}, got {type(value).__name__}"})
+    return check
+
+
+# Compiled once at import time
+_check_resume = compile_schema(RESUME_SCHEMA)
+
+
+def validate(data) -> list[dict]:
+    """Return a list of schema issues ({"path", "message"}) for resume data."""
+    issues = []
+    _check_resume(data, (), issues)
+    return issues
+
+
+def locate_issues(issues: list[dict], source_text: str) -> list[dict]:
+    """Add 1-based line/column to each issue by walking the YAML/JSON node tree.
+
+    Missing fields point at their parent mapping. Only called when there are
+    issues, so valid resumes never pay for composing the node tree.
+    """
+    try:
+        root = yaml.compose(source_text, Loader=Loader)
+    except yaml.YAMLError:
+        return issues
+
+    for issue in issues:
+        node = root
+        for part in issue["path"]:
+            child = None
+            if isinstance(node, yaml.MappingNode):
+                child = next((v for k, v in node.value if k.value == part), None)
+            elif isinstance(node, yaml.SequenceNode) and isinstance(part, int) and part < len(node.value):
+                child = node.value[part]
+            if child is None:
+                break
+            node = child
+        if node is not None:
+            issue["line"] = node.start_mark.line + 1
+            issue["column"] = node.start_mark.column + 1
+    return issues
+
+
+def check_resume(data, source: str | Path | None = None):
+    """Raise ResumeValidationError if `data` (loaded from `source`) is malformed."""
+    with span("validate"):
+        issues = validate(data)
+    if not issues:
+        return
+    if source is not None:
+        try:
+            locate_issues(issues, Path(source).read_text(encoding='utf-8'))
+        except OSError:
+            pass
+    raise ResumeValidationError(issues, source)
+
+
+if __name__ == "__main__":
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else find_resume_file()
+    try:
+        check_resume(load_resume_file(path), path)
+        print(f"✓ {path} is valid")
+    except ResumeValidationError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
@@ -0,0 +1,227 @@
+"""
+tailor.py
+
+Tailor resume data to a job profile or a pasted job description.
+
+Experience bullets, technical skills and speaking engagements are scored
+against the job's terms (a profile's target_roles, strengths and industries,
+minus any exclude_terms) and reordered (most relevant first), optionally
+trimmed to a maximum count. Jobs themselves keep their chronological order.
+The result is an ordinary resume data dict, so it feeds the existing templates
+and generate_markdown.py unchanged.
+
+Scoring goes through a ResumeIndex: an inverted term index over every scorable
+item in the resume, built once. Scoring a job then only touches the postings
+of the job's own terms, so thousands of job descriptions can be scored against
+one resume cheaply.
+
+Usage:
+    pip install pyyaml
+
+    python tailor.py                                   # uses job-profile.json
+    python tailor.py --job-description job.txt --max-bullets 4
+    python tailor.py --profile job-profile.json --out resume_tailored.yaml
+
+This will read resume.yaml and write resume_tailored.yaml (render it with
+`python generate_resume.py --batch`, or point a script at it).
+"""
+
+import argparse
+import copy
+import json
+import math
+import re
+import yaml
+from collections import Counter, defaultdict
+from pathlib import Path
+from resume_loader import load_resume_file
+
+
+# Words too common in resumes/job posts to say anything about fit
+STOP_WORDS = frozenset("""
+    a an and are as at be by for from has have in into is it its of on or our
+    over the their this to through via with within we you your will across
+    including experience work working years team teams role roles
+""".split())
+
+# How much each job-profile field counts towards relevance
+PROFILE_WEIGHTS = {
+    "target_roles": 2.0,
+    "strengths": 1.5,
+    "industries": 1.0,
+}
+
+# Job-profile field listing terms that make an item less relevant (e.g.
+# ["consulting", "B2C"]). The prose "avoid" field isn't scored: its sentences
+# ("Pure sales roles without hands-on technical component") are full of words
+# the strongest bullets share.
+EXCLUDE_FIELD = "exclude_terms"
+EXCLUDE_WEIGHT = -1.0
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase, lightly stemmed terms without stop words."""
+    terms = []
+    for token in TOKEN_RE.findall(str(text).lower()):
+        if token in STOP_WORDS:
+            continue
+        # Cheap plural folding so "databases" matches "database"
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        terms.append(token)
+    return terms
+
+
+def profile_query(profile: dict) -> dict[str, float]:
+    """Turn a job-profile.json dict into weighted query terms."""
+    query = defaultdict(float)
+    for field, weight in PROFILE_WEIGHTS.items():
+        for entry in profile.get(field, []):
+            for term in tokenize(entry):
+                query[term] += weight
+    for entry in profile.get(EXCLUDE_FIELD, []):
+        for term in tokenize(entry):
+            # A term the profile also asks for stays positive
+            if term not in query:
+                query[term] = EXCLUDE_WEIGHT
+    return dict(query)
+
+
+def description_query(text: str) -> dict[str, float]:
+    """Turn a pasted job description into weighted query terms (by frequency)."""
+    return {term: float(count) for term, count in Counter(tokenize(text)).items()}
+
+
+class ResumeIndex:
+    """Inverted term index over the scorable items of one resume."""
+
+    def __init__(self, data: dict):
+        self.data = data
+        # Item id -> (section, position): ("experience", (job, bullet)), ("technical_skills", (i,)), ...
+        self.items = []
+        self.lengths = []
+        self.postings = defaultdict(list)  # term -> [(item id, term frequency)]
+
+        for job_index, job in enumerate(data.get("experience") or []):
+            for bullet_index, bullet in enumerate(job.get("bullets") or []):
+                self._add("experience", (job_index, bullet_index), bullet)
+        for index, skill in enumerate(data.get("technical_skills") or []):
+            self._add("technical_skills", (index,), skill)
+        for index, talk in enumerate(data.get("speaking_engagements") or []):
+            self._add("speaking_engagements", (index,), f"{talk.get('title', '')} {talk.get('event', '')}")
+
+        count = max(len(self.items), 1)
+        self.average_length = sum(self.lengths) / count if self.lengths else 1.0
+        self.idf = {
+            term: math.log(1 + count / len(postings)) for term, postings in self.postings.items()
+        }
+
+    def _add(self, section: str, position: tuple, text: str):
+        """Index one item's text."""
+        item_id = len(self.items)
+        terms = Counter(tokenize(text))
+        self.items.append((section, position))
+        self.lengths.append(sum(terms.values()))
+        for term, frequency in terms.items():
+            self.postings[term].append((item_id, frequency))
+
+    def score(self, query: dict[str, float]) -> list[float]:
+        """Return a relevance score for every item (TF-IDF with length normalisation)."""
+        scores = [0.0] * len(self.items)
+        for term, weight in query.items():
+            idf = self.idf.get(term)
+            if idf is None:
+                continue
+            for item_id, frequency in self.postings[term]:
+                norm = math.sqrt(self.lengths[item_id] / self.average_length)
+                scores[item_id] += weight * idf * frequency / norm
+        return scores
+
+    def tailor(
+        self,
+        query: dict[str, float],
+        max_bullets: int | None = None,
+        max_skills: int | None = None,
+        max_talks: int | None = None
+    ) -> dict:
+        """Return a copy of the resume data reordered (and optionally trimmed) for `query`."""
+        scores = self.score(query)
+        by_position = {item: scores[item_id] for item_id, item in enumerate(self.items)}
+        data = copy.deepcopy(self.data)
+
+        def ranked(values: list, section: str, prefix: tuple, limit: int | None) -> list:
+            # sorted() is stable, so equally relevant items keep their original order
+            order = sorted(
+                range(len(values)),
+                key=lambda i: -by_position.get((section, prefix + (i,)), 0.0)
+            )
+            return [values[i] for i in order[:limit]]
+
+        for job_index, job in enumerate(data.get("experience") or []):
+            if job.get("bullets"):
+                job["bullets"] = ranked(job["bullets"], "experience", (job_index,), max_bullets)
+        if data.get("technical_skills"):
+            data["technical_skills"] = ranked(data["technical_skills"], "technical_skills", (), max_skills)
+        if data.get("speaking_engagements"):
+            data["speaking_engagements"] = ranked(
+                data["speaking_engagements"], "speaking_engagements", (), max_talks
+            )
+        return data
+
+
+def tailor_resume(data: dict, profile: dict | None = None, description: str | None = None, **limits) -> dict:
+    """One-shot helper: tailor `data` to a job profile and/or job description."""
+    query = defaultdict(float)
+    if profile:
+        for term, weight in profile_query(profile).items():
+            query[term] += weight
+    if description:
+        for term, weight in description_query(description).items():
+            query[term] += weight
+    return ResumeIndex(data).tailor(dict(query), **limits)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tailor resume data to a job.")
+    parser.add_argument("--resume", default="resume.yaml", help="resume data (default: resume.yaml)")
+    parser.add_argument("--profile", help="job profile JSON (default: job-profile.json if present)")
+    parser.add_argument("--job-description", metavar="FILE", help="plain-text job description")
+    parser.add_argument("--out", default="resume_tailored.yaml", help="output .yaml or .json")
+    parser.add_argument("--max-bullets", type=int, help="keep at most N bullets per job")
+    parser.add_argument("--max-skills", type=int, help="keep at most N technical skills")
+    parser.add_argument("--max-talks", type=int, help="keep at most N speaking engagements")
+    args = parser.parse_args()
+
+    try:
+        resume_data = load_resume_file(args.resume)
+
+        profile_path = args.profile or ("job-profile.json" if Path("job-profile.json").exists() else None)
+        profile = json.loads(Path(profile_path).read_text(encoding='utf-8')) if profile_path else None
+        description = (
+            Path(args.job_description).read_text(encoding='utf-8') if args.job_description else None
+        )
+        if profile is None and description is None:
+            raise ValueError("Provide --profile or --job-description")
+
+        tailored = tailor_resume(
+            resume_data,
+            profile,
+            description,
+            max_bullets=args.max_bullets,
+            max_skills=args.max_skills,
+            max_talks=args.max_talks
+        )
+
+        out_path = Path(args.out)
+        if out_path.suffix == ".json":
+            out_path.write_text(json.dumps(tailored, indent=4, ensure_ascii=False), encoding='utf-8')
+        else:
+            out_path.write_text(
+                yaml.dump(tailored, default_flow_style=False, allow_unicode=True, sort_keys=False, indent=2),
+                encoding='utf-8'
+            )
+        print(f"✓ Tailored resume -> {out_path}")
+    except Exception as e:
+        print(f"Error: {e}")
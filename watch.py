@@ -4,41 +4,508 @@ watch.py
 Hot reload server for resume development.
 Watches for changes to resume.yaml and templates, regenerates HTML, and refreshes browser.
 
+Everything is regenerated in-process: the resume data, compiled templates and a
+warm Chromium instance stay resident between saves, and only the outputs
+affected by the changed file are rebuilt:
+    - resume.yaml / resume.json -> every variant's HTML at once, PDFs in the background
+                                   (nothing at all if the data didn't really change)
+    - a template                -> that variant's HTML, its PDF in the background
+    - a stylesheet              -> no HTML re-render (the browser just reloads),
+                                   that variant's PDF in the background
+
+File events are debounced and coalesced by a ChangeScheduler, so an editor that
+fires several events per save triggers a single build. Builds run off the
+livereload server thread, and a PDF render still in flight is cancelled as soon
+as newer input for the same variant arrives.
+
+Pages opened through the patch server (127.0.0.1:8001, which serves only the
+preview pages and their stylesheets) aren't reloaded for data edits: the old
+and new data are diffed (resume_diff.py), each change is mapped to the element
+of the page that shows it (the templates tag the header, every section and
+every job/talk/publication/school with data-fragment="..."), and just those
+elements of the re-rendered HTML are pushed to the browser as server-sent
+events and swapped in place. Editing one bullet replaces one job's
+<div>, however long the resume. Template changes, renames and anything that
+can't be patched reload the page; stylesheet changes re-fetch the CSS.
+
 Usage:
     python watch.py
+    python watch.py --profile   # per-stage timings on exit (see profiling.py)
 """
 
+import argparse
+import asyncio
+import json
+import profiling
+from collections import deque
+from functools import partial
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
 from livereload import Server
-import subprocess
+import threading
+import time
+from generate_resume import VARIANTS, load_template, write_output
+from pdf_renderer import AsyncPDFRenderer
+from resume_diff import diff, split_path
+from resume_loader import find_resume_file, load_resume_file
+from resume_schema import check_resume
+from profiling import span
+
+
+# Quiet period (seconds) after the last file event before a build starts
+DEBOUNCE_SECONDS = 0.1
+
+# Change kinds passed to ChangeScheduler.notify()
+DATA_CHANGED = ("data", None)
+
+PATCH_HOST = "127.0.0.1"
+PATCH_PORT = 8001
+EVENTS_PATH = "/__patches"
+
+# Messages kept for slow preview pages; one further behind just reloads
+MAX_QUEUED = 100
+
+# Seconds between keep-alive comments on an idle event stream
+KEEPALIVE_SECONDS = 15
+
+# Top-level keys shown in the header fragment ("name" also sets <title>, so it reloads)
+HEADER_KEYS = ("tagline", "contact")
+
+VOID_ELEMENTS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "source", "track", "wbr",
+}
+
+PATCH_CLIENT = """<script>
+(() => {
+    const variant = %s;
+    const events = new EventSource("%s");
+    events.onmessage = (event) => {
+        const message = JSON.parse(event.data);
+        if (message.variant !== variant) return;
+        if (message.reload) return location.reload();
+        if (message.css) {
+            for (const link of document.querySelectorAll('link[rel="stylesheet"]')) {
+                const url = new URL(link.href);
+                url.searchParams.set("v", Date.now());
+                link.href = url;
+            }
+            return;
+        }
+        for (const [id, html] of Object.entries(message.fragments)) {
+            const target = document.querySelector(`[data-fragment="${CSS.escape(id)}"]`);
+            if (!target) return location.reload();
+            target.outerHTML = html;
+        }
+    };
+})();
+</script>
+"""
+
+
+def patch_targets(changes: list[tuple]) -> set[str] | None:
+    """Map diff() changes to the data-fragment ids showing them (None: reload instead).
+
+    A change inside a list item patches that item; adding, removing or moving
+    items patches the whole section, since the later items' ids shift.
+    """
+    targets = set()
+    for _, path, _, _ in changes:
+        key, index, rest = split_path(path)
+        if key in HEADER_KEYS:
+            targets.add("header")
+        elif key == "name":
+            return None
+        elif index is not None and rest:
+            targets.add(f"{key}[{index}]")
+        else:
+            targets.add(key)
+    # An item inside a section that is replaced anyway needs no patch of its own
+    return {target for target in targets if split_path(target)[0] == target or split_path(target)[0] not in targets}
+
+
+class FragmentFinder(HTMLParser):
+    """Locate the source text of elements with wanted data-fragment ids."""
+
+    def __init__(self, html: str, wanted: set[str]):
+        super().__init__(convert_charrefs=False)
+        self.html = html
+        self.wanted = wanted
+        self.fragments = {}
+        self._open = []
+        # getpos() counts only "\n" as a line break, unlike str.splitlines()
+        self._line_starts = [0]
+        for line in html.split("\n"):
+            self._line_starts.append(self._line_starts[-1] + len(line) + 1)
+
+    def _offset(self) -> int:
+        line, column = self.getpos()
+        return self._line_starts[line - 1] + column
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_ELEMENTS:
+            return
+        fragment = dict(attrs).get("data-fragment")
+        self._open.append((tag, fragment if fragment in self.wanted else None, self._offset()))
+
+    def handle_startendtag(self, tag, attrs):
+        # Self-closing: never a fragment, and nothing to pop
+        pass
+
+    def handle_endtag(self, tag):
+        while self._open:
+            open_tag, fragment, start = self._open.pop()
+            if fragment is not None:
+                end = self.html.find(">", self._offset()) + 1
+                text = self.html[start:end]
+                # A slice that isn't exactly this element is left out, so the page reloads
+                if open_tag == tag and text.lower().startswith(f"<{tag}") and text.lower().endswith(f"</{tag}>"):
+                    self.fragments[fragment] = text
+            if open_tag == tag:
+                return
+
+
+def extract_fragments(html: str, wanted: set[str]) -> dict[str, str] | None:
+    """Return {id: outer HTML} for each wanted fragment, or None if any is missing."""
+    finder = FragmentFinder(html, wanted)
+    finder.feed(html)
+    finder.close()
+    return finder.fragments if finder.fragments.keys() == wanted else None
+
+
+def with_patch_client(html: str, variant_name: str) -> str:
+    """Add the script that applies pushed fragments to a served preview page."""
+    script = PATCH_CLIENT % (json.dumps(variant_name), EVENTS_PATH)
+    position = html.lower().rfind("</body>")
+    if position == -1:
+        return html + script
+    return html[:position] + script + html[position:]
+
+
+class PatchChannel:
+    """Fan-out of patch messages to the connected preview pages."""
+
+    def __init__(self):
+        self._messages = deque(maxlen=MAX_QUEUED)
+        self._count = 0
+        self._condition = threading.Condition()
+
+    @property
+    def count(self) -> int:
+        """Number of messages published so far."""
+        return self._count
+
+    def publish(self, message: dict):
+        """Queue a message for every listener."""
+        with self._condition:
+            self._messages.append(message)
+            self._count += 1
+            self._condition.notify_all()
+
+    def wait(self, seen: int, timeout: float) -> tuple[list[dict], int]:
+        """Return (messages after the first `seen`, new count), waiting up to `timeout` for one."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._count > seen, timeout)
+            missed = self._count - seen
+            if missed > len(self._messages):
+                # Too far behind to catch up fragment by fragment
+                return [{"variant": name, "reload": True} for name in {m["variant"] for m in self._messages}], self._count
+            return list(self._messages)[len(self._messages) - missed:], self._count
+
 
+class ResumeWatcher:
+    """Resident renderer that rebuilds only what a changed file affects."""
 
-def regenerate():
-    """Regenerate HTML files from resume data."""
-    print("🔄 Regenerating resumes...")
-    subprocess.run(["python", "generate_resume.py"], check=True)
-    print("✓ Done!")
+    def __init__(self, variants: list[dict] = VARIANTS):
+        self.variants = {variant["name"]: variant for variant in variants}
+        self.data = None
+        self.html = {}
+        self.patches = PatchChannel()
+
+        # PDFs render on a private event loop so an in-flight render can be cancelled
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._renderer = AsyncPDFRenderer()
+        self._pdf_jobs = {}
+
+    def start(self):
+        """Start the PDF event loop and render every variant."""
+        self._loop_thread.start()
+        self.reload_data()
+
+    def close(self):
+        """Cancel pending PDFs, close the browser and stop the PDF event loop."""
+        for job in self._pdf_jobs.values():
+            job.cancel()
+        asyncio.run_coroutine_threadsafe(self._renderer.close(), self._loop).result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._loop_thread.join(timeout=10)
+
+    def apply(self, changes: set[tuple]):
+        """Rebuild once for a coalesced set of (kind, variant name) changes."""
+        if DATA_CHANGED in changes:
+            # Re-renders every variant, which also covers template/CSS changes
+            self.reload_data()
+            return
+        for kind, name in sorted(changes):
+            if kind == "template":
+                self.reload_template(name)
+            elif kind == "css" and ("template", name) not in changes:
+                self.reload_css(name)
+
+    def reload_data(self):
+        """Re-read resume data and re-render every variant's HTML."""
+        print("🔄 Resume data changed, regenerating...")
+        try:
+            resume_path = find_resume_file()
+            data = load_resume_file(resume_path)
+            check_resume(data, resume_path)
+        except Exception as e:
+            # Keep serving the last good version until the file is fixed
+            print(f"✗ Could not load resume data: {e}")
+            return
+        previous, self.data = self.data, data
+        if previous is None:
+            targets = None
+        else:
+            with span("diff"):
+                changes = diff(previous, data)
+            if not changes:
+                print("✓ No content changes")
+            targets = patch_targets(changes)
+        for variant in self.variants.values():
+            if previous is None or changes or variant["name"] not in self.html:
+                self.render_html(variant, targets)
+
+    def reload_template(self, name: str):
+        """Re-render one variant after its template changed."""
+        print(f"🔄 {self.variants[name]['template']} changed, regenerating {name}...")
+        self.render_html(self.variants[name])
+
+    def reload_css(self, name: str):
+        """Refresh one variant's PDF after its stylesheet changed; the HTML is untouched."""
+        self.patches.publish({"variant": name, "css": True})
+        if name in self.html:
+            self.schedule_pdf(self.variants[name], self.html[name])
+
+    def render_html(self, variant: dict, targets: set[str] | None = None):
+        """Render and save a variant's HTML now, push it to preview pages, then queue its PDF.
+
+        `targets` are the fragments that changed (None: the whole page).
+        """
+        if self.data is None:
+            return
+        try:
+            with span("render_html", variant=variant["name"]):
+                html_content = load_template(variant["template"]).render(**self.data)
+        except Exception as e:
+            print(f"✗ Could not render {variant['template']}: {e}")
+            return
+        write_output(variant["html"], html_content)
+        self.html[variant["name"]] = html_content
+        print(f"✓ Saved HTML -> {variant['html']}")
+        self.push(variant, html_content, targets)
+        self.schedule_pdf(variant, html_content)
+
+    def push(self, variant: dict, html_content: str, targets: set[str] | None):
+        """Send preview pages the changed fragments of a variant, or tell them to reload."""
+        fragments = None
+        if targets is not None:
+            with span("extract_fragments", variant=variant["name"]):
+                fragments = extract_fragments(html_content, targets)
+        if fragments is None:
+            self.patches.publish({"variant": variant["name"], "reload": True})
+        elif fragments:
+            self.patches.publish({"variant": variant["name"], "fragments": fragments})
+            print(f"⚡ Patched {', '.join(sorted(fragments))} in {variant['html']}")
+
+    def schedule_pdf(self, variant: dict, html_content: str):
+        """Render a variant's PDF in the background, cancelling any stale render of it."""
+        previous = self._pdf_jobs.get(variant["name"])
+        if previous is not None and not previous.done():
+            previous.cancel()
+            print(f"⏹ Cancelled stale PDF render -> {variant['pdf']}")
+        self._pdf_jobs[variant["name"]] = asyncio.run_coroutine_threadsafe(
+            self._render_pdf(variant, html_content),
+            self._loop
+        )
+
+    async def _render_pdf(self, variant: dict, html_content: str):
+        """Render one PDF on the PDF event loop."""
+        try:
+            await self._renderer.render_pdf(
+                html_content,
+                {'path': variant["pdf"]},
+                base_dir=Path(variant["html"]).parent
+            )
+            print(f"✓ Saved PDF  -> {variant['pdf']}")
+        except Exception as e:
+            print(f"✗ Could not render {variant['pdf']}: {e}")
+
+
+class ChangeScheduler:
+    """Debounce file events and run one coalesced build per burst, off the server thread."""
+
+    def __init__(self, watcher: ResumeWatcher, debounce: float = DEBOUNCE_SECONDS):
+        self.watcher = watcher
+        self.debounce = debounce
+        self._changes = set()
+        self._deadline = 0.0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        """Start the build thread."""
+        self._thread.start()
+
+    def stop(self):
+        """Stop the build thread once the current build (if any) finishes."""
+        self._stopping = True
+        self._wakeup.set()
+        self._thread.join(timeout=10)
+
+    def notify(self, change: tuple):
+        """Record a change and (re)start the debounce window; returns immediately."""
+        with self._lock:
+            self._changes.add(change)
+            self._deadline = time.monotonic() + self.debounce
+            self._wakeup.set()
+
+    def _run(self):
+        """Build thread: wait for a quiet period, then build everything that changed."""
+        while True:
+            self._wakeup.wait()
+            if self._stopping:
+                return
+
+            # Keep waiting while events are still arriving
+            while True:
+                with self._lock:
+                    remaining = self._deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                time.sleep(remaining)
+
+            with self._lock:
+                changes, self._changes = self._changes, set()
+                self._wakeup.clear()
+
+            if changes:
+                started = time.perf_counter()
+                with span("rebuild", changes=sorted(map(str, changes))):
+                    self.watcher.apply(changes)
+                print(f"✓ Done in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+
+class PatchRequestHandler(BaseHTTPRequestHandler):
+    """Serve the live-patched preview pages, their stylesheets and the event stream; nothing else."""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        watcher = self.server.watcher
+        if path == EVENTS_PATH:
+            self.stream_events(watcher.patches)
+            return
+        for variant in watcher.variants.values():
+            if path == "/" + Path(variant["html"]).as_posix() and variant["name"] in watcher.html:
+                body = with_patch_client(watcher.html[variant["name"]], variant["name"]).encode("utf-8")
+                self.send_body(body, "text/html; charset=utf-8")
+                return
+            if path == "/" + Path(variant["css"]).as_posix():
+                try:
+                    body = Path(variant["css"]).read_bytes()
+                except OSError:
+                    break
+                self.send_body(body, "text/css; charset=utf-8")
+                return
+        self.send_error(404)
+
+    def send_body(self, body: bytes, content_type: str):
+        """Answer 200 with an uncached body."""
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_events(self, channel: PatchChannel):
+        """Send patch messages as server-sent events until the page goes away."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        seen = channel.count
+        try:
+            while True:
+                messages, seen = channel.wait(seen, KEEPALIVE_SECONDS)
+                if not messages:
+                    self.wfile.write(b": keep-alive\n\n")
+                for message in messages:
+                    self.wfile.write(f"data: {json.dumps(message, ensure_ascii=False)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class PatchServer(ThreadingHTTPServer):
+    """HTTP server for preview pages that are patched in place instead of reloaded."""
+
+    daemon_threads = True
+
+    def __init__(self, watcher: ResumeWatcher, port: int = PATCH_PORT, host: str = PATCH_HOST):
+        super().__init__((host, port), PatchRequestHandler)
+        self.watcher = watcher
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hot reload server for resume development.")
+    profiling.add_arguments(parser)
+    profiling.configure(parser.parse_args())
+
     server = Server()
+    watcher = ResumeWatcher()
+    scheduler = ChangeScheduler(watcher)
+    patch_server = PatchServer(watcher)
 
-    # Watch source files and regenerate on change
-    server.watch("resume.yaml", regenerate)
-    server.watch("resume.json", regenerate)
-    server.watch("resume_template.html", regenerate)
-    server.watch("resume_template_ats.html", regenerate)
-    server.watch("resume_style.css")
-    server.watch("resume_style_ats.css")
+    # Source files only notify the scheduler; delay='forever' suppresses the
+    # browser reload here because the build hasn't happened yet
+    server.watch("resume.yaml", partial(scheduler.notify, DATA_CHANGED), delay='forever')
+    server.watch("resume.json", partial(scheduler.notify, DATA_CHANGED), delay='forever')
+    for variant in VARIANTS:
+        server.watch(
+            variant["template"],
+            partial(scheduler.notify, ("template", variant["name"])),
+            delay='forever'
+        )
+        # CSS reloads the browser immediately; only the PDF needs rebuilding
+        server.watch(variant["css"], partial(scheduler.notify, ("css", variant["name"])))
+        # The browser refreshes as soon as the regenerated HTML lands on disk
+        server.watch(variant["html"])
 
     # Initial generation
-    regenerate()
+    watcher.start()
+    scheduler.start()
+    threading.Thread(target=patch_server.serve_forever, daemon=True).start()
 
     print("\n🚀 Hot reload server running!")
     print("   http://localhost:8000/            → Landing page")
     print("   http://localhost:8000/resume.html → Visual resume")
     print("   http://localhost:8000/resume_ats.html → ATS resume")
+    print(f"   http://localhost:{PATCH_PORT}/resume.html → Visual resume, edits patched in place")
     print("\n   Watching: resume.yaml, templates, CSS files")
     print("   Press Ctrl+C to stop\n")
 
     # Serve current directory
-    server.serve(root=".", port=8000)
+    try:
+        server.serve(root=".", port=8000)
+    finally:
+        patch_server.shutdown()
+        scheduler.stop()
+        watcher.close()
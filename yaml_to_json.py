@@ -9,28 +9,30 @@ Usage:
     python yaml_to_json.py
 
 This will read resume.yaml and produce resume.json
+
+Set RESUME_PROFILE=1 to print per-stage timings (see profiling.py).
 """
 
 import json
-import yaml
-from pathlib import Path
+import profiling
+from profiling import span
+from resume_loader import load_resume_file
 
 
 def parse_yaml_resume(yaml_path: str = "resume.yaml") -> dict:
     """Parse a YAML resume file."""
-    content = Path(yaml_path).read_text(encoding='utf-8')
-    resume_data = yaml.safe_load(content)
-    return resume_data
+    return load_resume_file(yaml_path)
 
 
 def save_json(data: dict, json_path: str = "resume.json"):
     """Save resume data as JSON."""
-    with open(json_path, 'w', encoding='utf-8') as f:
+    with span("write", path=json_path), open(json_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=4, ensure_ascii=False)
     print(f"✓ Converted to JSON -> {json_path}")
 
 
 if __name__ == "__main__":
+    profiling.configure()
     try:
         resume_data = parse_yaml_resume()
         save_json(resume_data)